@@ -0,0 +1,124 @@
+"""
+kroft benchmark suite.
+
+Usage:
+    python -m benchmarks --suites generate memory
+    python -m benchmarks --dsn "dbname=kroft_test user=postgres" \
+        --output results.json --baseline benchmarks/baseline.json
+
+Database suites (insert, update, delete, ddl) need a throwaway Postgres;
+they create and drop a public.kroft_bench table. Exits with status 1 when
+any result is slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import sys
+
+from benchmarks import suites
+from benchmarks.harness import compare, write_results
+
+DB_SUITES = ("insert", "update", "delete", "ddl")
+ALL_SUITES = ("generate", "memory") + DB_SUITES
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="kroft benchmark suite"
+    )
+    parser.add_argument("--dsn", default=os.environ.get("KROFT_BENCH_DSN"))
+    parser.add_argument("--suites", nargs="+", choices=ALL_SUITES, default=ALL_SUITES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[100, 1_000, 10_000]
+    )
+    parser.add_argument("--widths", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--ddl-rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    width = args.widths[0]
+
+    needs_db = [s for s in args.suites if s in DB_SUITES]
+    if needs_db and not args.dsn:
+        print(f"--dsn or KROFT_BENCH_DSN is required for: {', '.join(needs_db)}")
+        return 2
+
+    results = []
+    if "generate" in args.suites:
+        results += suites.bench_generate(
+            args.repeat, max(args.batch_sizes), args.widths
+        )
+
+    memory = []
+    if "memory" in args.suites:
+        memory = suites.bench_memory(max(args.batch_sizes), args.widths)
+
+    if needs_db:
+        import psycopg2
+
+        conn = psycopg2.connect(args.dsn)
+        try:
+            if "insert" in args.suites:
+                results += suites.bench_insert(
+                    conn, args.repeat, args.batch_sizes, width
+                )
+            if "update" in args.suites:
+                results += suites.bench_update(
+                    conn, args.repeat, args.batch_sizes, width
+                )
+            if "delete" in args.suites:
+                results += suites.bench_delete(
+                    conn, args.repeat, args.batch_sizes, width
+                )
+            if "ddl" in args.suites:
+                results += suites.bench_ddl(conn, args.repeat, args.ddl_rows, width)
+        finally:
+            conn.close()
+
+    if results:
+        print(f"{'benchmark':<60} {'median ms':>10} {'rows/s':>12}")
+    for result in results:
+        summary = result.to_dict()
+        print(
+            f"{result.key:<60} {summary['median_s'] * 1000:>10.2f} "
+            f"{summary['rows_per_sec']:>12,.0f}"
+        )
+
+    if memory:
+        print(f"\n{'memory path':<40} {'peak MiB':>10} {'bytes/row':>12}")
+        for entry in memory:
+            name = f"{entry['path']}[width={entry['width']}]"
+            print(
+                f"{name:<40} {entry['peak_bytes'] / 2 ** 20:>10.2f} "
+                f"{entry['bytes_per_row']:>12,.0f}"
+            )
+
+    if args.output:
+        write_results(results, args.output, memory)
+        print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        current = {"results": [r.to_dict() for r in results]}
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for reg in regressions:
+            print(
+                f"REGRESSION {reg['key']}: {reg['baseline_s'] * 1000:.2f} ms -> "
+                f"{reg['current_s'] * 1000:.2f} ms ({reg['change']:+.0%})"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
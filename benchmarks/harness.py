@@ -0,0 +1,110 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+
+class BenchmarkResult:
+    def __init__(
+        self,
+        suite: str,
+        name: str,
+        params: Dict,
+        samples: List[float],
+        rows: int = 0
+    ):
+        self.suite = suite
+        self.name = name
+        self.params = params
+        self.samples = samples
+        self.rows = rows
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.suite}/{self.name}[{params}]"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> Dict:
+        return {
+            "key": self.key,
+            "suite": self.suite,
+            "name": self.name,
+            "params": self.params,
+            "median_s": self.median,
+            "min_s": min(self.samples),
+            "max_s": max(self.samples),
+            "rows_per_sec": self.rows / self.median if self.median else 0.0,
+            "samples": self.samples,
+        }
+
+
+def measure(
+    fn: Callable[[], None],
+    repeat: int = 5,
+    setup: Optional[Callable[[], None]] = None
+) -> List[float]:
+    """Run fn `repeat` times, calling setup (untimed) before each run."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    """Peak bytes allocated by Python objects while fn runs, via tracemalloc."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def write_results(
+    results: List[BenchmarkResult], path: str, memory: Optional[List[Dict]] = None
+):
+    payload = {
+        "meta": {
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": [r.to_dict() for r in results],
+    }
+    if memory:
+        payload["memory"] = memory
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.15) -> List[Dict]:
+    """
+    Compare two result payloads by key and return the regressions: results
+    whose median is more than `tolerance` slower than the baseline's.
+    """
+    previous = {r["key"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        before = previous.get(result["key"])
+        if before is None or not before["median_s"]:
+            continue
+        change = result["median_s"] / before["median_s"] - 1
+        if change > tolerance:
+            regressions.append({
+                "key": result["key"],
+                "baseline_s": before["median_s"],
+                "current_s": result["median_s"],
+                "change": change,
+            })
+    return regressions
@@ -0,0 +1,231 @@
+import itertools
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks.harness import BenchmarkResult, measure, peak_memory
+from kroft import BatchGenerator, ColumnDefinition, MutationEngine, SchemaManager
+from kroft.core.mutator import INSERT_STRATEGIES
+
+SCHEMA = "public"
+TABLE = "kroft_bench"
+WORDS = ["shoes", "shirt", "hat", "bag", "jacket", "cap", "scarf", "belt"]
+
+COLUMN_TYPES = {
+    "uuid": ("UUID", lambda: str(uuid.uuid4())),
+    "text": ("TEXT", lambda: random.choice(WORDS)),
+    "int": ("INT", lambda: random.randint(0, 1_000_000)),
+    "float": ("FLOAT", lambda: random.uniform(0, 1000)),
+    "boolean": ("BOOLEAN", lambda: random.random() < 0.5),
+    "timestamp": ("TIMESTAMP", datetime.now),
+}
+
+
+def table_columns(
+    width: int, types: List[str] = None, keys: bool = True
+) -> Dict[str, ColumnDefinition]:
+    """A uuid primary key, an updated_at column and `width` payload columns."""
+    columns = {}
+    if keys:
+        columns["id"] = ColumnDefinition(
+            "id", "UUID", lambda: str(uuid.uuid4()),
+            constraints="PRIMARY KEY", protected=True
+        )
+        columns["updated_at"] = ColumnDefinition(
+            "updated_at", "TIMESTAMP", datetime.now, protected=True
+        )
+    cycle = itertools.cycle(types or list(COLUMN_TYPES))
+    for i in range(width):
+        type_name = next(cycle)
+        sql_type, generator = COLUMN_TYPES[type_name]
+        columns[f"c{i}_{type_name}"] = ColumnDefinition(
+            f"c{i}_{type_name}", sql_type, generator
+        )
+    return columns
+
+
+def bench_generate(repeat: int, batch_size: int, widths: List[int]):
+    """BatchGenerator.generate_batch per column type and per table width."""
+    results = []
+    for type_name in COLUMN_TYPES:
+        generator = BatchGenerator(table_columns(1, [type_name], keys=False))
+        samples = measure(lambda: generator.generate_batch(batch_size), repeat)
+        results.append(BenchmarkResult(
+            "generate", "by_type",
+            {"type": type_name, "batch_size": batch_size}, samples, batch_size
+        ))
+
+    for width in widths:
+        generator = BatchGenerator(table_columns(width))
+        samples = measure(lambda: generator.generate_batch(batch_size), repeat)
+        results.append(BenchmarkResult(
+            "generate", "by_width",
+            {"width": width, "batch_size": batch_size}, samples, batch_size
+        ))
+    return results
+
+
+# How a batch reaches the writer: generated, then turned into the column
+# list and per-row values that execute_values/COPY consume
+MEMORY_PATHS = {
+    "row_dicts": lambda gen, n: MutationEngine._batch_values(gen.generate_batch(n)),
+    "columnar": lambda gen, n: MutationEngine._batch_values(gen.generate_columns(n)),
+    "row_batch": lambda gen, n: MutationEngine._batch_values(gen.generate_rows(n)),
+}
+
+
+def bench_memory(batch_size: int, widths: List[int]) -> List[Dict]:
+    """
+    tracemalloc peak for generating a batch and preparing it for the
+    writer, per batch representation and table width, plus the footprint
+    of 1,000 ColumnDefinitions.
+    """
+    results = []
+    for width in widths:
+        generator = BatchGenerator(table_columns(width))
+        for path, prepare in MEMORY_PATHS.items():
+            peak = peak_memory(lambda: prepare(generator, batch_size))
+            results.append({
+                "path": path,
+                "width": width,
+                "batch_size": batch_size,
+                "peak_bytes": peak,
+                "bytes_per_row": peak / batch_size,
+            })
+
+    peak = peak_memory(lambda: table_columns(1_000, keys=False))
+    results.append({
+        "path": "column_definitions",
+        "width": 1_000,
+        "batch_size": 0,
+        "peak_bytes": peak,
+        "bytes_per_row": 0.0,
+    })
+    return results
+
+
+class BenchTable:
+    """A throwaway table plus the kroft objects bound to it."""
+
+    def __init__(self, conn, columns: Dict[str, ColumnDefinition]):
+        self.conn = conn
+        self.manager = SchemaManager(conn, SCHEMA, TABLE, columns)
+        self.generator = BatchGenerator(self.manager.get_active_columns())
+
+    def reset(self):
+        self.manager.drop_table()
+        self.manager.create_table()
+
+    def engine(self, **kwargs) -> MutationEngine:
+        return MutationEngine(
+            self.conn, SCHEMA, TABLE,
+            update_column="updated_at", generator=self.generator, **kwargs
+        )
+
+    def load(self, rows: int, chunk: int = 50_000) -> List[str]:
+        engine = self.engine(insert_strategy="copy")
+        ids = []
+        while len(ids) < rows:
+            size = min(chunk, rows - len(ids))
+            ids.extend(engine.insert_batch(self.generator.generate_columns(size)))
+        return ids
+
+    def drop(self):
+        self.manager.drop_table()
+
+
+def bench_insert(conn, repeat: int, batch_sizes: List[int], width: int):
+    table = BenchTable(conn, table_columns(width))
+    results = []
+    for batch_size in batch_sizes:
+        rows = table.generator.generate_batch(batch_size)
+        for strategy in INSERT_STRATEGIES:
+            engine = table.engine(insert_strategy=strategy)
+            samples = measure(lambda: engine.insert_batch(rows), repeat, table.reset)
+            results.append(BenchmarkResult(
+                "insert", strategy, {"batch_size": batch_size, "width": width},
+                samples, batch_size
+            ))
+    table.drop()
+    return results
+
+
+UPDATE_VARIANTS = {
+    "per_row": {},
+    "per_row_prepared": {"use_prepared_statements": True},
+    "batched": {"update_mode": "batched"},
+}
+
+
+def bench_update(conn, repeat: int, batch_sizes: List[int], width: int):
+    table = BenchTable(conn, table_columns(width))
+    table.reset()
+    ids = table.load(max(batch_sizes) * 2)
+
+    results = []
+    for batch_size in batch_sizes:
+        for variant, options in UPDATE_VARIANTS.items():
+            engine = table.engine(**options)
+            samples = measure(
+                lambda: engine._update_records(random.sample(ids, batch_size)),
+                repeat
+            )
+            results.append(BenchmarkResult(
+                "update", variant, {"batch_size": batch_size, "width": width},
+                samples, batch_size
+            ))
+    table.drop()
+    return results
+
+
+def bench_delete(conn, repeat: int, batch_sizes: List[int], width: int):
+    table = BenchTable(conn, table_columns(width))
+    table.reset()
+    results = []
+    for batch_size in batch_sizes:
+        for variant in ("plain", "prepared"):
+            engine = table.engine(use_prepared_statements=variant == "prepared")
+            pending: List[str] = []
+
+            def setup():
+                pending[:] = table.load(batch_size)
+
+            samples = measure(lambda: engine._delete_records(pending), repeat, setup)
+            results.append(BenchmarkResult(
+                "delete", variant, {"batch_size": batch_size, "width": width},
+                samples, batch_size
+            ))
+    table.drop()
+    return results
+
+
+def bench_ddl(conn, repeat: int, table_rows: List[int], width: int):
+    """add_column/drop_column latency on a table of each size."""
+    columns = table_columns(width)
+    for col in columns.values():
+        col.protected = True
+    columns["extra"] = ColumnDefinition("extra", "INT", lambda: 0, reserved=True)
+
+    results = []
+    for rows in table_rows:
+        table = BenchTable(conn, columns)
+        table.reset()
+        table.load(rows)
+
+        add_samples, drop_samples = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            table.manager.add_column()
+            add_samples.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            table.manager.drop_column()
+            drop_samples.append(time.perf_counter() - start)
+
+        params = {"table_rows": rows, "width": width}
+        results.append(BenchmarkResult("ddl", "add_column", params, add_samples))
+        results.append(BenchmarkResult("ddl", "drop_column", params, drop_samples))
+        table.drop()
+    return results
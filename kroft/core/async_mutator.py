@@ -0,0 +1,189 @@
+import random
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from kroft.core.batch import BatchGenerator, RowBatch
+from kroft.core.schema import SchemaManager
+
+ASYNC_INSERT_STRATEGIES = ("values", "copy")
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def create_pool(dsn: str, min_size: int = 2, max_size: int = 20, **kwargs):
+    """
+    Create an asyncpg connection pool for AsyncMutationEngine.
+
+    asyncpg is an optional dependency; any object exposing an asyncpg-style
+    `acquire()` can be passed to the engine instead.
+    """
+    try:
+        import asyncpg
+    except ImportError as exc:
+        raise ImportError(
+            "AsyncMutationEngine needs asyncpg: pip install asyncpg"
+        ) from exc
+    return await asyncpg.create_pool(
+        dsn, min_size=min_size, max_size=max_size, **kwargs
+    )
+
+
+class AsyncMutationEngine:
+    """
+    Coroutine counterpart of MutationEngine on an asyncpg-style pool.
+
+    Every operation checks a connection out of the pool and runs in its own
+    transaction, so many batches can be in flight at once.
+    """
+
+    def __init__(
+        self,
+        pool,
+        schema: str,
+        table_name: str,
+        primary_key: str = "id",
+        update_column: Optional[str] = None,
+        generator: Optional[BatchGenerator] = None,
+        insert_strategy: str = "values"
+    ):
+        if insert_strategy not in ASYNC_INSERT_STRATEGIES:
+            raise ValueError(
+                f"Unknown insert strategy '{insert_strategy}', "
+                f"expected one of {ASYNC_INSERT_STRATEGIES}"
+            )
+
+        self.pool = pool
+        self.schema = schema
+        self.table_name = table_name
+        self.primary_key = primary_key
+        self.update_column = update_column
+        self.generator = generator
+        self.insert_strategy = insert_strategy
+
+        self.total_inserts = 0
+        self.total_updates = 0
+        self.total_deletes = 0
+
+    @property
+    def qualified_table(self) -> str:
+        return f"{_quote_ident(self.schema)}.{_quote_ident(self.table_name)}"
+
+    async def insert_batch(
+        self, rows: Union[List[Dict], Dict[str, Sequence], RowBatch]
+    ) -> List[str]:
+        if isinstance(rows, dict):
+            rows = RowBatch.from_columns(rows)
+        if isinstance(rows, RowBatch):
+            columns = list(rows.columns)
+            values = rows.rows
+        else:
+            columns = list(rows[0].keys()) if rows else []
+            values = [tuple(row[col] for col in columns) for row in rows]
+
+        if not values:
+            return []
+
+        pk_index = columns.index(self.primary_key)
+        inserted_ids = [row[pk_index] for row in values]
+
+        async with self.pool.acquire() as conn:
+            if self.insert_strategy == "copy":
+                await conn.copy_records_to_table(
+                    self.table_name,
+                    records=values,
+                    columns=columns,
+                    schema_name=self.schema
+                )
+            else:
+                placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+                query = (
+                    f"INSERT INTO {self.qualified_table} "
+                    f"({', '.join(map(_quote_ident, columns))}) "
+                    f"VALUES ({placeholders})"
+                )
+                async with conn.transaction():
+                    await conn.executemany(query, values)
+
+        self.total_inserts += len(values)
+        return inserted_ids
+
+    async def maybe_mutate_batch(self, inserted_ids: List[str]) -> Tuple[int, int]:
+        if not inserted_ids or random.random() > 0.5:
+            return 0, 0
+
+        operation = random.choice(["update", "delete"])
+        subset = random.sample(inserted_ids, max(1, len(inserted_ids) // 4))
+
+        if operation == "update":
+            updated_count = await self._update_records(subset)
+            self.total_updates += updated_count
+            return updated_count, 0
+        else:
+            deleted_count = await self._delete_records(subset)
+            self.total_deletes += deleted_count
+            return 0, deleted_count
+
+    async def _update_records(self, ids: List[str]) -> int:
+        if not ids or not self.generator:
+            return 0
+
+        modifiable_columns = self.generator.get_modifiable_columns(
+            exclude=[self.primary_key]
+        )
+        if not modifiable_columns:
+            return 0
+
+        # Random column per row, pipelined per column with executemany
+        groups: Dict[str, List[Tuple]] = {}
+        for row_id in ids:
+            col = random.choice(modifiable_columns)
+            val = self.generator.generate_value(col)
+            groups.setdefault(col, []).append((val, row_id))
+
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                for col, params in groups.items():
+                    await conn.executemany(self._update_query(col), params)
+
+        return len(ids)
+
+    def _update_query(self, col: str) -> str:
+        assignments = [f"{_quote_ident(col)} = $1"]
+        if self.update_column:
+            assignments.append(f"{_quote_ident(self.update_column)} = now()")
+        return (
+            f"UPDATE {self.qualified_table} SET {', '.join(assignments)} "
+            f"WHERE {_quote_ident(self.primary_key)} = $2"
+        )
+
+    async def _delete_records(self, ids: List[str]) -> int:
+        if not ids:
+            return 0
+
+        schema = self.generator.schema if self.generator else {}
+        pk_col_def = schema.get(self.primary_key)
+        pk_type = pk_col_def.sql_type.upper() if pk_col_def else "TEXT"
+
+        cast = "::uuid[]" if pk_type == "UUID" else ""
+        query = (
+            f"DELETE FROM {self.qualified_table} "
+            f"WHERE {_quote_ident(self.primary_key)} = ANY($1{cast})"
+        )
+        async with self.pool.acquire() as conn:
+            await conn.execute(query, ids)
+
+        return len(ids)
+
+    def track_schema(self, manager: SchemaManager):
+        """Have the generator follow a SchemaManager, so inserts and updates
+        only ever use the columns the table currently has."""
+        if hasattr(self.generator, "track_schema"):
+            self.generator.track_schema(manager)
+
+    def get_counters(self) -> Dict[str, int]:
+        return {
+            "total_inserts": self.total_inserts,
+            "total_updates": self.total_updates,
+            "total_deletes": self.total_deletes,
+        }
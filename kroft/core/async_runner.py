@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from kroft.core.async_mutator import AsyncMutationEngine
+from kroft.core.concurrency import AsyncSchemaGate
+from kroft.core.evolution import EvolutionController
+from kroft.core.schema import SchemaManager
+
+
+class AsyncSimulationRunner:
+    """
+    Drive an AsyncMutationEngine with many batches in flight.
+
+    At most `concurrency` batches run at once; the producer waits for a free
+    slot before generating the next one, which is the backpressure. Schema
+    evolution reuses EvolutionController/SchemaManager and runs in a thread
+    once all in-flight batches have committed.
+    """
+
+    def __init__(
+        self,
+        schema_mgr: SchemaManager,
+        mutator: AsyncMutationEngine,
+        total_records: int = 10_000,
+        batch_size: int = 500,
+        concurrency: int = 16,
+        evolution: Optional[EvolutionController] = None
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.schema_mgr = schema_mgr
+        self.mutator = mutator
+        self.total_records = total_records
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.evolution = evolution
+        self.total_batches = total_records // batch_size
+        self.evolution_messages: List[str] = []
+
+    async def run(self):
+        if hasattr(self.schema_mgr, "subscribe"):
+            self.mutator.track_schema(self.schema_mgr)
+
+        gate = AsyncSchemaGate()
+        slots = asyncio.Semaphore(self.concurrency)
+        in_flight: Set[asyncio.Task] = set()
+        failures: List[BaseException] = []
+
+        def on_done(task: asyncio.Task):
+            in_flight.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                failures.append(task.exception())
+
+        for batch_num in range(1, self.total_batches + 1):
+            await slots.acquire()
+            if failures:
+                slots.release()
+                break
+
+            task = asyncio.create_task(self._run_batch(gate, slots))
+            in_flight.add(task)
+            task.add_done_callback(on_done)
+
+            if (
+                self.evolution
+                and batch_num % self.evolution.evolution_interval == 0
+            ):
+                async with gate.ddl():
+                    message = await asyncio.to_thread(
+                        self.evolution.evolve, batch_num
+                    )
+                if message:
+                    self.evolution_messages.append(message)
+
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        if failures:
+            raise failures[0]
+
+    async def _run_batch(self, gate: AsyncSchemaGate, slots: asyncio.Semaphore):
+        try:
+            async with gate.dml():
+                inserted_ids = await self.mutator.insert_batch(self._generate_columns())
+                await self.mutator.maybe_mutate_batch(inserted_ids)
+        finally:
+            slots.release()
+
+    def _generate_columns(self) -> Dict[str, Sequence[Any]]:
+        return {
+            col: col_def.generate_many(self.batch_size)
+            for col, col_def in self.schema_mgr.get_active_columns().items()
+        }
+
+    def get_counters(self) -> Dict[str, int]:
+        return self.mutator.get_counters()
+
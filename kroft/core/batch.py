@@ -1,13 +1,50 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 from kroft.core.column import ColumnDefinition
+from kroft.core.rng import RandomStreams
+
+
+class RowBatch:
+    """
+    A batch as tuples in one fixed column order.
+
+    Writers take `rows` as-is, so a batch built by
+    BatchGenerator.generate_rows() reaches execute_values/COPY without
+    the per-row dicts and rebuilt value lists of the row-dict path.
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns: Sequence[str], rows: List[Tuple[Any, ...]]):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.rows = rows
+
+    @classmethod
+    def from_columns(cls, batch: Dict[str, Sequence[Any]]) -> "RowBatch":
+        # NumPy arrays hand back numpy scalars psycopg2 can't adapt
+        arrays = [
+            array.tolist() if hasattr(array, "tolist") else array
+            for array in batch.values()
+        ]
+        return cls(batch.keys(), list(zip(*arrays)))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, name: str) -> List[Any]:
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
 
 
 class BatchGenerator:
     def __init__(
         self,
         schema: Optional[Dict[str, ColumnDefinition]] = None,
-        use_registry: bool = False
+        use_registry: bool = False,
+        streams: Optional[RandomStreams] = None
     ):
         """
         Initialize a batch generator.
@@ -15,7 +52,15 @@ class BatchGenerator:
         Args:
             schema: A dictionary of column name -> ColumnDefinition.
             use_registry: If True, loads schema from the registered column registry.
+            streams: Optional seeded RandomStreams; each column then draws from
+                its own ("column", name) stream.
         """
+        self.streams = streams
+        # Set by track_schema(): the manager's view of the current version
+        self.schema_version: Optional[int] = None
+        self._manager = None
+        self._modifiable: Optional[Tuple[str, ...]] = None
+        self._modifiable_cache: Dict[FrozenSet[str], List[str]] = {}
         if schema is not None:
             self.schema = schema
         elif use_registry:
@@ -31,28 +76,79 @@ class BatchGenerator:
             if not isinstance(col, ColumnDefinition):
                 raise TypeError(f"Schema entry '{name}' is not a ColumnDefinition.")
 
-    def _generate_value(self, column: str) -> Any:
+    def _generate_value(self, column: str, rng=None) -> Any:
         """Generate a single value for the given column name."""
         col_def = self.schema.get(column)
         if not col_def:
             raise ValueError(f"No column definition found for column '{column}'")
-        return col_def.generate()
+        if rng is None and self.streams is not None:
+            rng = self.streams.stream("column", column)
+        return col_def.generate(rng)
     
-    def generate_value(self, column: str) -> Any:
-        return self._generate_value(column)
+    def generate_value(self, column: str, rng=None) -> Any:
+        return self._generate_value(column, rng)
 
     def generate_batch(self, batch_size: int = 1) -> List[Dict[str, Any]]:
-        rows = []
-        for _ in range(batch_size):
-            row = {
-                name: self._generate_value(name)
-                for name in self.schema
-            }
-            rows.append(row)
-        return rows
+        if not self.schema:
+            return [{} for _ in range(batch_size)]
+
+        return RowBatch.from_columns(self.generate_columns(batch_size)).to_dicts()
+
+    def generate_rows(
+        self, batch_size: int = 1, streams: Optional[RandomStreams] = None
+    ) -> RowBatch:
+        """
+        Generate a RowBatch: columns are generated as arrays (so batch
+        generators still apply) and zipped into tuples once.
+        """
+        return RowBatch.from_columns(self.generate_columns(batch_size, streams))
+
+    def generate_columns(
+        self, batch_size: int = 1, streams: Optional[RandomStreams] = None
+    ) -> Dict[str, Sequence[Any]]:
+        """
+        Generate a columnar batch: column name -> sequence of batch_size values.
+
+        Columns with a batch_generator fill their whole array in one call;
+        scalar-only columns fall back to per-value generation. `streams`
+        overrides the generator's own RandomStreams for this batch.
+        """
+        streams = streams or self.streams
+        return {
+            name: col.generate_many(
+                batch_size, streams.stream("column", name) if streams else None
+            )
+            for name, col in self.schema.items()
+        }
     
+    def track_schema(self, manager):
+        """
+        Generate exactly a SchemaManager's active columns, in its order for
+        the current version, following every schema change from then on.
+        """
+        if self._manager is manager:
+            return
+        self._manager = manager
+        self.on_schema_change(manager)
+        manager.subscribe(self.on_schema_change)
+
+    def on_schema_change(self, manager):
+        view = manager.view
+        self.schema = view.active
+        self._modifiable = view.modifiable
+        self._modifiable_cache = {}
+        self.schema_version = view.version
+
     def get_modifiable_columns(self, exclude: Optional[List[str]] = None) -> List[str]:
-        exclude = set(exclude or [])
+        exclude = frozenset(exclude or ())
+        if self._modifiable is not None:
+            # Precomputed per schema version; callers may not mutate the list
+            columns = self._modifiable_cache.get(exclude)
+            if columns is None:
+                columns = self._modifiable_cache[exclude] = [
+                    name for name in self._modifiable if name not in exclude
+                ]
+            return columns
         return [
             name for name, col in self.schema.items()
             if not col.reserved and not col.protected and name not in exclude
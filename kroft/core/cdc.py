@@ -0,0 +1,290 @@
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from kroft.core.sinks import ChangeSink
+
+DEBEZIUM_OPS = {"insert": "c", "update": "u", "delete": "d"}
+
+
+class RowStore:
+    """
+    Last-known state of every row, for before images.
+
+    Rows are held as value tuples next to a shared column-name tuple, in
+    LRU order. Once the estimated size passes `max_bytes`, the least
+    recently used rows are spilled in one batch to a SQLite file (in
+    `spill_dir`, or the system temp dir) and read back when needed.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20, spill_dir: Optional[str] = None):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.memory_bytes = 0
+        self.spilled = 0
+        self._rows: "OrderedDict[str, Tuple[Tuple[str, ...], tuple, int]]" = (
+            OrderedDict()
+        )
+        self._columns: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows) + self.spilled
+
+    def put(self, key: Any, row: Dict[str, Any]):
+        columns = tuple(row)
+        columns = self._columns.setdefault(columns, columns)
+        values = tuple(row.values())
+        size = _estimate_size(values)
+        key = str(key)
+        with self._lock:
+            previous = self._rows.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= previous[2]
+            elif self._disk is not None:
+                self._delete_spilled(key)
+            self._rows[key] = (columns, values, size)
+            self.memory_bytes += size
+            if self.memory_bytes > self.max_bytes:
+                self._spill()
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        key = str(key)
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is not None:
+                self._rows.move_to_end(key)
+                return dict(zip(entry[0], entry[1]))
+            return self._read_spilled(key, remove=False)
+
+    def pop(self, key: Any) -> Optional[Dict[str, Any]]:
+        key = str(key)
+        with self._lock:
+            entry = self._rows.pop(key, None)
+            if entry is not None:
+                self.memory_bytes -= entry[2]
+                return dict(zip(entry[0], entry[1]))
+            return self._read_spilled(key, remove=True)
+
+    def _spill(self):
+        # Spill down to 90% so every put past the cap doesn't hit the disk
+        target = self.max_bytes * 0.9
+        batch = []
+        while self._rows and self.memory_bytes > target:
+            key, (columns, values, size) = self._rows.popitem(last=False)
+            self.memory_bytes -= size
+            batch.append((key, pickle.dumps((columns, values), protocol=5)))
+        disk = self._open_disk()
+        disk.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?)", batch)
+        disk.commit()
+        self.spilled += len(batch)
+
+    def _read_spilled(self, key: str, remove: bool) -> Optional[Dict[str, Any]]:
+        if self._disk is None:
+            return None
+        found = self._disk.execute(
+            "SELECT row FROM rows WHERE key = ?", (key,)
+        ).fetchone()
+        if found is None:
+            return None
+        if remove:
+            self._delete_spilled(key)
+        columns, values = pickle.loads(found[0])
+        return dict(zip(columns, values))
+
+    def _delete_spilled(self, key: str):
+        if self._disk.execute("DELETE FROM rows WHERE key = ?", (key,)).rowcount:
+            self.spilled -= 1
+
+    def _open_disk(self) -> sqlite3.Connection:
+        if self._disk is None:
+            fd, self._disk_path = tempfile.mkstemp(
+                prefix="kroft-rows-", suffix=".sqlite", dir=self.spill_dir
+            )
+            os.close(fd)
+            self._disk = sqlite3.connect(self._disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode = OFF")
+            self._disk.execute("PRAGMA synchronous = OFF")
+            self._disk.execute("CREATE TABLE rows (key TEXT PRIMARY KEY, row BLOB)")
+        return self._disk
+
+    def close(self):
+        """Drop the spill file, if one was created."""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                os.unlink(self._disk_path)
+                self._disk = None
+            self._rows.clear()
+            self.memory_bytes = self.spilled = 0
+
+
+class DebeziumEmitter(ChangeSink):
+    """
+    Change events in Debezium's Postgres envelope (JSON, schemas disabled),
+    one per line: before/after images, op c/u/d, source metadata and ts_ms.
+
+    Before images come from a RowStore of the rows seen so far, the way
+    REPLICA IDENTITY FULL would give them. Updates to rows the emitter
+    never saw inserted have a null before and a partial after; after images
+    only carry the columns of the current schema version. With
+    track_schema() it also writes a schema change event (DDL plus the new
+    column list) on every schema version. Each batch is serialised and
+    written to `stream` in a single write.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        schema: str,
+        table: str,
+        primary_key: str = "id",
+        topic_prefix: str = "kroft",
+        database: str = "kroft",
+        row_store: Optional[RowStore] = None,
+        close_stream: bool = True
+    ):
+        super().__init__()
+        self.stream = stream
+        self.schema = schema
+        self.table = table
+        self.primary_key = primary_key
+        self.topic_prefix = topic_prefix
+        self.database = database
+        self.rows = row_store or RowStore()
+        self.close_stream = close_stream
+        # Active columns as of the last schema change, when tracking a manager
+        self._active: Optional[frozenset] = None
+
+    @classmethod
+    def to_file(
+        cls, path: str, *args, buffer_size: int = 1 << 20, **kwargs
+    ) -> "DebeziumEmitter":
+        return cls(open(path, "ab", buffering=buffer_size), *args, **kwargs)
+
+    @classmethod
+    def to_socket(cls, host: str, port: int, *args, **kwargs) -> "DebeziumEmitter":
+        """Stream newline-delimited events to a TCP listener."""
+        conn = socket.create_connection((host, port))
+        return cls(conn.makefile("wb", buffering=1 << 20), *args, **kwargs)
+
+    def _write(self, op, columns, rows, schema_version, table_schema, first_seq):
+        pk_index = columns.index(self.primary_key)
+        ts_ms = int(time.time() * 1000)
+        lines = []
+        for seq, row in enumerate(rows, first_seq):
+            key = row[pk_index]
+            if op == "insert":
+                before = None
+                after = dict(zip(columns, row))
+                self.rows.put(key, after)
+            elif op == "update":
+                before = self.rows.get(key)
+                after = self._current_columns(before or {}, table_schema)
+                after.update(zip(columns, row))
+                self.rows.put(key, after)
+            else:
+                before = self.rows.pop(key)
+                after = None
+            lines.append(json.dumps(
+                {
+                    "before": before,
+                    "after": after,
+                    "source": self._source(seq, ts_ms, schema_version),
+                    "op": DEBEZIUM_OPS[op],
+                    "ts_ms": ts_ms,
+                    "transaction": None,
+                },
+                default=str,
+            ))
+        lines.append("")
+        self.stream.write("\n".join(lines).encode("utf-8"))
+
+    def _current_columns(
+        self, row: Dict[str, Any], table_schema: Optional[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        """A stored row image without the columns the table no longer has."""
+        live = table_schema or self._active
+        if live is None:
+            return dict(row)
+        return {name: value for name, value in row.items() if name in live}
+
+    def _source(self, seq: int, ts_ms: int, schema_version: int) -> Dict[str, Any]:
+        return {
+            "version": "kroft",
+            "connector": "postgresql",
+            "name": self.topic_prefix,
+            "ts_ms": ts_ms,
+            "snapshot": "false",
+            "db": self.database,
+            "schema": self.schema,
+            "table": self.table,
+            "txId": None,
+            "lsn": seq,
+            "schema_version": schema_version,
+        }
+
+    def track_schema(self, manager):
+        """Emit a schema change event whenever the manager's version changes."""
+        manager.subscribe(self.on_schema_change)
+
+    def on_schema_change(self, manager):
+        view = manager.view
+        self._active = frozenset(view.active)
+        ddl_log = getattr(manager, "ddl_log", None)
+        ts_ms = int(time.time() * 1000)
+        columns: List[Dict[str, Any]] = [
+            {
+                "name": name,
+                "typeName": col.sql_type,
+                "position": position,
+                "optional": "NOT NULL" not in col.constraints.upper()
+                and "PRIMARY KEY" not in col.constraints.upper(),
+            }
+            for position, (name, col) in enumerate(view.active.items(), 1)
+        ]
+        with self._lock:
+            self.sequence += 1
+            event = {
+                "source": self._source(self.sequence, ts_ms, view.version),
+                "ts_ms": ts_ms,
+                "databaseName": self.database,
+                "schemaName": self.schema,
+                "ddl": ddl_log[-1]["ddl"] if ddl_log else None,
+                "tableChanges": [{
+                    "type": "ALTER",
+                    "id": f'"{self.database}"."{self.schema}"."{self.table}"',
+                    "table": {
+                        "primaryKeyColumnNames": [self.primary_key],
+                        "columns": columns,
+                    },
+                }],
+            }
+            self.stream.write((json.dumps(event) + "\n").encode("utf-8"))
+
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+
+    def close(self):
+        with self._lock:
+            self.stream.flush()
+            if self.close_stream:
+                self.stream.close()
+        self.rows.close()
+
+
+def _estimate_size(values: tuple) -> int:
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
@@ -0,0 +1,68 @@
+import os
+import pickle
+import tempfile
+from typing import Any, Dict
+
+# Bumped whenever the layout of a checkpoint changes incompatibly
+CHECKPOINT_FORMAT = 1
+
+
+def write_checkpoint(path: str, state: Dict[str, Any]) -> int:
+    """
+    Atomically replace the checkpoint at `path` with `state`; returns its size.
+
+    The state is pickled to a temporary file in the same directory, fsynced
+    and renamed over `path`, so a crash at any point leaves either the old
+    checkpoint or the new one, never a torn file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".kroft-checkpoint-", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(
+                {"format": CHECKPOINT_FORMAT, **state},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+    return size
+
+
+def read_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Load a checkpoint written by write_checkpoint(). Checkpoints are pickles,
+    so only read files this process (or one you trust) wrote.
+    """
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    if not isinstance(state, dict) or state.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(
+            f"'{path}' is not a kroft checkpoint (format {CHECKPOINT_FORMAT})"
+        )
+    return state
+
+
+def _fsync_directory(directory: str):
+    """Persist the rename itself; not every platform can open a directory."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
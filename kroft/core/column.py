@@ -1,7 +1,25 @@
-from typing import Any, Callable, Optional
+import random
+from typing import Any, Callable, Optional, Sequence
+
+from kroft.core.rng import required_positional_args
+from kroft.core.valuepool import ValuePool
 
 
 class ColumnDefinition:
+    # No per-instance __dict__; wide registries hold thousands of these
+    __slots__ = (
+        "name",
+        "sql_type",
+        "generator",
+        "constraints",
+        "reserved",
+        "protected",
+        "batch_generator",
+        "pool",
+        "_generator_takes_rng",
+        "_batch_takes_rng",
+    )
+
     def __init__(
         self,
         name: str,
@@ -10,17 +28,98 @@ class ColumnDefinition:
         constraints: Optional[str] = None,
         reserved: bool = False,
         protected: bool = False,
+        batch_generator: Optional[Callable[[int], Sequence[Any]]] = None,
+        pooled: bool = False,
+        pool_size: int = 10_000,
+        pool_mode: Optional[str] = None,
+        pool_background: bool = False,
+        pool_refill_after: Optional[int] = None,
     ):
+        """
+        Args:
+            pooled: Serve values from a pre-generated ValuePool instead of
+                calling the generator for every cell.
+            pool_size: Distinct values in a ring/sample pool, or the buffer
+                depth of a unique pool.
+            pool_mode: "ring", "sample" or "unique". Defaults to "unique" for
+                PRIMARY KEY/UNIQUE columns, which may not use the others,
+                and to "ring" otherwise.
+            pool_background: Fill the pool on a background thread.
+            pool_refill_after: Regenerate a ring/sample pool after it has
+                served this many values; unset keeps the same values.
+        """
         self.name = name
         self.sql_type = sql_type
         self.generator = generator
         self.constraints = constraints or ""
         self.reserved = reserved
         self.protected = protected
+        self.batch_generator = batch_generator
+
+        # Generators may opt in to a dedicated RNG stream by taking it as an
+        # argument: generator(rng) and batch_generator(n, rng).
+        self._generator_takes_rng = required_positional_args(generator) >= 1
+        self._batch_takes_rng = (
+            batch_generator is not None
+            and required_positional_args(batch_generator) >= 2
+        )
+
+        self.pool: Optional[ValuePool] = None
+        if pooled:
+            unique = self.is_unique()
+            pool_mode = pool_mode or ("unique" if unique else "ring")
+            if unique and pool_mode != "unique":
+                raise ValueError(
+                    f"Column '{name}' is unique; pool_mode must be 'unique', "
+                    f"not '{pool_mode}'"
+                )
+            self.pool = ValuePool(
+                self._generate_fresh,
+                size=pool_size,
+                mode=pool_mode,
+                background=pool_background,
+                refill_after=pool_refill_after
+            )
+
+    def is_unique(self) -> bool:
+        constraints = self.constraints.upper()
+        return "PRIMARY KEY" in constraints or "UNIQUE" in constraints
 
-    def generate(self) -> Any:
+    def generate(self, rng: Optional[random.Random] = None) -> Any:
+        if self.pool is not None:
+            return self.pool.draw(1, rng)[0]
+        if self._generator_takes_rng:
+            return self.generator(rng or random)
         return self.generator()
 
+    def generate_many(
+        self, n: int, rng: Optional[random.Random] = None
+    ) -> Sequence[Any]:
+        """
+        Generate n values at once.
+
+        Uses the column's batch_generator (e.g. a NumPy or random.choices
+        based function) when one is set, otherwise falls back to calling
+        the scalar generator n times. Pooled columns draw from their pool.
+        """
+        if self.pool is not None:
+            return self.pool.draw(n, rng)
+        return self._generate_fresh(n, rng)
+
+    def _generate_fresh(
+        self, n: int, rng: Optional[random.Random]
+    ) -> Sequence[Any]:
+        if self.batch_generator is not None:
+            if self._batch_takes_rng:
+                return self.batch_generator(n, rng or random)
+            return self.batch_generator(n)
+
+        generator = self.generator
+        if self._generator_takes_rng:
+            rng = rng or random
+            return [generator(rng) for _ in range(n)]
+        return [generator() for _ in range(n)]
+
     def ddl(self) -> str:
         parts = [self.name, self.sql_type, self.constraints.strip()]
         return " ".join(p for p in parts if p)
\ No newline at end of file
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+
+class SchemaGate:
+    """
+    Readers-writer lock that keeps schema evolution away from in-flight DML.
+
+    Workers hold the gate in shared mode for the duration of a batch, while
+    DDL takes it exclusively. Waiting DDL blocks new batches from starting so
+    evolution is never starved by a busy pool of writers.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._active_dml = 0
+        self._ddl_running = False
+        self._ddl_waiting = 0
+
+    @contextmanager
+    def dml(self):
+        with self._cond:
+            while self._ddl_running or self._ddl_waiting:
+                self._cond.wait()
+            self._active_dml += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active_dml -= 1
+                if not self._active_dml:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def ddl(self):
+        with self._cond:
+            self._ddl_waiting += 1
+            while self._ddl_running or self._active_dml:
+                self._cond.wait()
+            self._ddl_waiting -= 1
+            self._ddl_running = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._ddl_running = False
+                self._cond.notify_all()
+
+
+class AsyncSchemaGate:
+    """asyncio counterpart of SchemaGate for coroutine-based runners."""
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._active_dml = 0
+        self._ddl_running = False
+        self._ddl_waiting = 0
+
+    @asynccontextmanager
+    async def dml(self):
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: not (self._ddl_running or self._ddl_waiting)
+            )
+            self._active_dml += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._active_dml -= 1
+                if not self._active_dml:
+                    self._cond.notify_all()
+
+    @asynccontextmanager
+    async def ddl(self):
+        async with self._cond:
+            self._ddl_waiting += 1
+            await self._cond.wait_for(
+                lambda: not (self._ddl_running or self._active_dml)
+            )
+            self._ddl_waiting -= 1
+            self._ddl_running = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._ddl_running = False
+                self._cond.notify_all()
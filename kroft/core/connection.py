@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from psycopg2.pool import AbstractConnectionPool, ThreadedConnectionPool
+
+# Pool key under which SchemaManager keeps its dedicated DDL connection
+DDL_CONNECTION_KEY = "kroft-ddl"
+
+
+def create_pool(
+    dsn: str, minconn: int = 1, maxconn: int = 10, **kwargs
+) -> ThreadedConnectionPool:
+    """
+    Create a thread-safe psycopg2 pool usable wherever kroft takes a `conn`.
+    """
+    return ThreadedConnectionPool(minconn, maxconn, dsn, **kwargs)
+
+
+def is_pool(conn) -> bool:
+    return isinstance(conn, AbstractConnectionPool)
+
+
+@contextmanager
+def checkout(conn, key: Optional[str] = None) -> Iterator:
+    """
+    Yield a usable connection from either a raw connection or a pool.
+
+    Pooled connections are returned after the block, rolled back first if
+    it raised. Keyed checkouts (e.g. DDL_CONNECTION_KEY) stay reserved for
+    that key until release() is called.
+    """
+    if not is_pool(conn):
+        yield conn
+        return
+
+    pooled = conn.getconn(key)
+    try:
+        yield pooled
+    except Exception:
+        pooled.rollback()
+        raise
+    finally:
+        if key is None:
+            conn.putconn(pooled)
+
+
+def release(conn, key: str):
+    """Hand a keyed connection back to its pool; a no-op for raw connections."""
+    if is_pool(conn):
+        conn.putconn(conn.getconn(key), key=key)
+
+
+def acquire(conn):
+    """
+    Take a connection for longer than one block, e.g. a transaction spanning
+    several batches. Pair with putback(); raw connections pass through.
+    """
+    return conn.getconn() if is_pool(conn) else conn
+
+
+def putback(conn, pooled):
+    if is_pool(conn):
+        conn.putconn(pooled)
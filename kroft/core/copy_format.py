@@ -0,0 +1,229 @@
+import io
+import json
+import struct
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+PG_EPOCH = datetime(2000, 1, 1)
+PG_EPOCH_UTC = datetime(2000, 1, 1, tzinfo=timezone.utc)
+PG_EPOCH_DATE = date(2000, 1, 1)
+
+BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+BINARY_TRAILER = struct.pack(">h", -1)
+
+_TEXT_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+# Client-side spellings of "current time" that COPY cannot evaluate.
+_NOW_LITERALS = {"now()", "now", "current_timestamp"}
+
+
+def base_type(sql_type: str) -> str:
+    """Normalise a column's SQL type, e.g. 'varchar(32)' -> 'VARCHAR'."""
+    return sql_type.upper().split("(")[0].strip()
+
+
+def _is_timestamp(pg_type: str) -> bool:
+    return pg_type.startswith("TIMESTAMP")
+
+
+def _resolve_now(value: Any, pg_type: str) -> Any:
+    if isinstance(value, str) and value.strip().lower() in _NOW_LITERALS:
+        if pg_type in ("TIMESTAMPTZ", "TIMESTAMP WITH TIME ZONE"):
+            return datetime.now(timezone.utc)
+        return datetime.now()
+    return value
+
+
+def to_text(value: Any, sql_type: str) -> str:
+    """Serialize one value into a COPY text-format field."""
+    if value is None:
+        return "\\N"
+
+    pg_type = base_type(sql_type)
+    if isinstance(value, bool):
+        text = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        text = value.isoformat(sep=" ") if isinstance(value, datetime) else str(value)
+    elif isinstance(value, (dict, list)):
+        text = json.dumps(value)
+    elif _is_timestamp(pg_type) and str(value).strip().lower() in _NOW_LITERALS:
+        # 'now' is a special input value Postgres resolves at COPY time
+        text = "now"
+    else:
+        text = str(value)
+    return text.translate(_TEXT_ESCAPES)
+
+
+def encode_text(rows: Iterable[Sequence[Any]], sql_types: List[str]) -> io.StringIO:
+    """Build a COPY ... FROM STDIN text-format payload."""
+    buf = io.StringIO()
+    write = buf.write
+    for row in rows:
+        write("\t".join(to_text(v, t) for v, t in zip(row, sql_types)))
+        write("\n")
+    buf.seek(0)
+    return buf
+
+
+def _encode_bool(value: Any) -> bytes:
+    return b"\x01" if value else b"\x00"
+
+
+def _encode_text(value: Any) -> bytes:
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value).encode("utf-8")
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    return b"\x01" + _encode_text(value)
+
+
+def _encode_uuid(value: Any) -> bytes:
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    return uuid.UUID(str(value)).bytes
+
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _encode_timestamp(value: Any) -> bytes:
+    ts = _as_datetime(value)
+    if ts.tzinfo is not None:
+        delta = ts - PG_EPOCH_UTC
+    else:
+        delta = ts - PG_EPOCH
+    micros = (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack(">q", micros)
+
+
+def _encode_date(value: Any) -> bytes:
+    if isinstance(value, datetime):
+        value = value.date()
+    elif not isinstance(value, date):
+        value = date.fromisoformat(str(value))
+    return struct.pack(">i", (value - PG_EPOCH_DATE).days)
+
+
+def _encode_numeric(value: Any) -> bytes:
+    """
+    NUMERIC's wire format: digit count, weight, sign and display scale,
+    then base-10000 digits, the first worth 10000 ** weight.
+    """
+    number = value if isinstance(value, Decimal) else Decimal(str(value))
+    if number.is_nan():
+        return struct.pack(">hhHh", 0, 0, 0xC000, 0)
+    if number.is_infinite():
+        return struct.pack(">hhHh", 0, 0, 0xF000 if number < 0 else 0xD000, 0)
+
+    sign, digits, exponent = number.as_tuple()
+    text = "".join(map(str, digits))
+    if exponent >= 0:
+        whole, fraction = text + "0" * exponent, ""
+    elif len(text) > -exponent:
+        whole, fraction = text[:exponent], text[exponent:]
+    else:
+        whole, fraction = "0", text.zfill(-exponent)
+    whole = whole.zfill(-(-len(whole) // 4) * 4)
+    fraction = fraction.ljust(-(-len(fraction) // 4) * 4, "0")
+    groups = [int(whole[i:i + 4]) for i in range(0, len(whole), 4)]
+    weight = len(groups) - 1
+    groups += [int(fraction[i:i + 4]) for i in range(0, len(fraction), 4)]
+
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+    header = struct.pack(
+        ">hhHh", len(groups), weight, 0x4000 if sign else 0, max(-exponent, 0)
+    )
+    return header + struct.pack(f">{len(groups)}h", *groups)
+
+
+def _packer(fmt: str, cast: Callable[[Any], Any]) -> Callable[[Any], bytes]:
+    packer = struct.Struct(fmt).pack
+    return lambda value: packer(cast(value))
+
+
+_BINARY_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "BOOLEAN": _encode_bool,
+    "BOOL": _encode_bool,
+    "SMALLINT": _packer(">h", int),
+    "INT2": _packer(">h", int),
+    "INT": _packer(">i", int),
+    "INTEGER": _packer(">i", int),
+    "INT4": _packer(">i", int),
+    "SERIAL": _packer(">i", int),
+    "BIGINT": _packer(">q", int),
+    "INT8": _packer(">q", int),
+    "BIGSERIAL": _packer(">q", int),
+    "REAL": _packer(">f", float),
+    "FLOAT4": _packer(">f", float),
+    "FLOAT": _packer(">d", float),
+    "FLOAT8": _packer(">d", float),
+    "DOUBLE PRECISION": _packer(">d", float),
+    "NUMERIC": _encode_numeric,
+    "DECIMAL": _encode_numeric,
+    "TEXT": _encode_text,
+    "VARCHAR": _encode_text,
+    "CHAR": _encode_text,
+    "CHARACTER VARYING": _encode_text,
+    "JSON": _encode_text,
+    "JSONB": _encode_jsonb,
+    "UUID": _encode_uuid,
+    "TIMESTAMP": _encode_timestamp,
+    "TIMESTAMPTZ": _encode_timestamp,
+    "TIMESTAMP WITH TIME ZONE": _encode_timestamp,
+    "TIMESTAMP WITHOUT TIME ZONE": _encode_timestamp,
+    "DATE": _encode_date,
+}
+
+
+def binary_encoder(sql_type: str) -> Callable[[Any], bytes]:
+    pg_type = base_type(sql_type)
+    encoder = _BINARY_ENCODERS.get(pg_type)
+    if encoder is None:
+        raise ValueError(f"No binary COPY encoder for SQL type '{sql_type}'")
+    if _is_timestamp(pg_type):
+        return lambda value: encoder(_resolve_now(value, pg_type))
+    return encoder
+
+
+def encode_binary(rows: Iterable[Sequence[Any]], sql_types: List[str]) -> io.BytesIO:
+    """Build a COPY ... FROM STDIN (FORMAT binary) payload."""
+    encoders = [binary_encoder(t) for t in sql_types]
+    field_count = struct.pack(">h", len(encoders))
+    null_field = struct.pack(">i", -1)
+    length = struct.Struct(">i").pack
+
+    buf = io.BytesIO()
+    write = buf.write
+    write(BINARY_HEADER)
+    for row in rows:
+        write(field_count)
+        for value, encode in zip(row, encoders):
+            if value is None:
+                write(null_field)
+                continue
+            data = encode(value)
+            write(length(len(data)))
+            write(data)
+    write(BINARY_TRAILER)
+    buf.seek(0)
+    return buf
@@ -0,0 +1,111 @@
+import random
+import re
+from typing import Optional
+
+
+class DDLPolicy:
+    """
+    How SchemaManager runs ALTER TABLE against a busy table.
+
+    With lock_timeout set, each attempt gives up waiting for the ACCESS
+    EXCLUSIVE lock after that many seconds instead of queueing (and stalling
+    every writer queued behind it), then retries up to max_retries times
+    with exponential, jittered backoff between `backoff` and `max_backoff`.
+    """
+
+    def __init__(
+        self,
+        lock_timeout: Optional[float] = None,
+        max_retries: int = 0,
+        backoff: float = 0.1,
+        max_backoff: float = 5.0
+    ):
+        if lock_timeout is not None and lock_timeout <= 0:
+            raise ValueError("lock_timeout must be positive")
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+
+        self.lock_timeout = lock_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the attempt-th (1-based) lock timeout."""
+        ceiling = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(ceiling / 2, ceiling)
+
+
+# Widening type changes the evolution controllers pick from. Generators
+# keep producing valid values for the new type, and these are the changes
+# CDC connectors most often have to absorb.
+TYPE_CHANGES = {
+    "SMALLINT": ("INT", "BIGINT"),
+    "INT": ("BIGINT", "NUMERIC"),
+    "INTEGER": ("BIGINT", "NUMERIC"),
+    "BIGINT": ("NUMERIC",),
+    "REAL": ("DOUBLE PRECISION",),
+    "FLOAT": ("NUMERIC",),
+    "DOUBLE PRECISION": ("NUMERIC",),
+    "VARCHAR": ("TEXT",),
+    "CHAR": ("TEXT",),
+    "JSON": ("JSONB",),
+    "TIMESTAMP": ("TIMESTAMPTZ",),
+    "DATE": ("TIMESTAMP",),
+}
+
+# Type changes Postgres makes without rewriting the table (binary-coercible)
+_NO_REWRITE_CHANGES = {
+    ("VARCHAR", "TEXT"),
+    ("TEXT", "VARCHAR"),
+    ("CHAR", "TEXT"),
+    ("CIDR", "INET"),
+}
+
+_VOLATILE_FUNCTIONS = (
+    "random(", "clock_timestamp(", "gen_random_uuid(", "uuid_generate_v4(",
+    "nextval(", "timeofday(", "statement_timestamp(",
+)
+
+
+_TYPE_MODIFIER = re.compile(r"\(\s*(\d+(?:\s*,\s*\d+)*)\s*\)")
+
+
+def base_type(sql_type: str) -> str:
+    return sql_type.split("(")[0].strip().upper()
+
+
+def type_change_rewrites(old_type: str, new_type: str) -> bool:
+    """
+    Whether ALTER COLUMN ... TYPE from old_type to new_type rewrites the
+    table. Widening a varchar/numeric length limit doesn't; neither do the
+    binary-coercible pairs above; everything else does.
+    """
+    old, new = base_type(old_type), base_type(new_type)
+    if old == new:
+        old_limit, new_limit = _limit(old_type), _limit(new_type)
+        if new_limit is None:
+            return False
+        if old_limit is None:
+            return True
+        # Growing the length/precision is free; shrinking it or changing a
+        # numeric's scale is not
+        return new_limit[0] < old_limit[0] or new_limit[1:] != old_limit[1:]
+    return (old, new) not in _NO_REWRITE_CHANGES
+
+
+def default_is_volatile(expression: str) -> bool:
+    """
+    Whether a DEFAULT expression is volatile. ADD COLUMN with a volatile
+    default rewrites the table; a constant default (PG 11+) does not.
+    """
+    expression = expression.lower().replace(" ", "")
+    return any(function in expression for function in _VOLATILE_FUNCTIONS)
+
+
+def _limit(sql_type: str):
+    # Only the modifier itself; suffixes like WITH TIME ZONE follow it
+    match = _TYPE_MODIFIER.search(sql_type)
+    if match is None:
+        return None
+    return tuple(int(part) for part in match.group(1).split(","))
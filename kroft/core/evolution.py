@@ -1,7 +1,17 @@
 import random
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from kroft.core.schema import SchemaManager
+from kroft.core.schema import EVOLUTION_ACTIONS, SchemaManager
+
+ACTION_LABELS = {
+    "add": "Added column",
+    "add_with_default": "Added column with default",
+    "add_with_volatile_default": "Added column with volatile default",
+    "drop": "Dropped column",
+    "alter_type": "Changed column type",
+    "rename": "Renamed column",
+    "set_default": "Set column default",
+}
 
 
 class EvolutionController:
@@ -12,7 +22,10 @@ class EvolutionController:
         evolution_probability: float = 0.2,
         add_probability: float = 0.7,
         max_additions: int = 7,
-        max_drops: int = 3
+        max_drops: int = 3,
+        rng: Optional[random.Random] = None,
+        actions_per_evolution: int = 1,
+        action_weights: Optional[Dict[str, float]] = None
     ):
         self.manager = manager
         self.evolution_interval = evolution_interval
@@ -20,6 +33,21 @@ class EvolutionController:
         self.add_probability = add_probability
         self.max_additions = max_additions
         self.max_drops = max_drops
+        # Drives both the evolve/add-vs-drop decisions and the manager's
+        # column choice; the global random module when unset
+        self.rng = rng
+        # More than one action per evolution combines them into a single
+        # ALTER TABLE, so a busy table is locked once
+        self.actions_per_evolution = actions_per_evolution
+        # Relative weights over SchemaManager EVOLUTION_ACTIONS (type changes,
+        # renames, defaults...); unset keeps the add_probability add/drop mix
+        for action in action_weights or {}:
+            if action not in EVOLUTION_ACTIONS:
+                raise ValueError(
+                    f"Unknown evolution action '{action}', "
+                    f"expected one of {EVOLUTION_ACTIONS}"
+                )
+        self.action_weights = action_weights
 
         self.num_additions = 0
         self.num_drops = 0
@@ -28,10 +56,13 @@ class EvolutionController:
     def should_evolve(self, batch_number: int) -> bool:
         return (
             batch_number % self.evolution_interval == 0 and
-            random.random() < self.evolution_probability
+            self._random().random() < self.evolution_probability
         )
 
     def choose_action(self) -> str:
+        if self.action_weights:
+            return self._choose_weighted_action()
+
         can_add = (
             self.num_additions < self.max_additions and self.has_reserved_columns()
         )
@@ -46,31 +77,134 @@ class EvolutionController:
         if not can_add and can_drop:
             return "drop"
 
-        return "add" if random.random() <= self.add_probability else "drop"
+        return "add" if self._random().random() <= self.add_probability else "drop"
 
     def evolve(self, batch_number: int) -> Optional[str]:
         if not self.should_evolve(batch_number):
             return None
+        return self.evolve_now()
+
+    def evolve_now(self) -> Optional[str]:
+        """Evolve once, without the should_evolve() draw."""
+        if self.actions_per_evolution > 1:
+            return self._evolve_combined()
 
         action = self.choose_action()
         if action == "none":
             return "No evolution possible"
 
         if action == "add":
-            added = self.manager.add_column()
-            if added:
-                self.num_additions += 1
-                self._log_evolution("add", added)
-                return f"[v{self.manager.schema_version}] Added column: {added}"
+            added = self.manager.add_column(rng=self.rng)
+            if not added:
+                return None
+            self.num_additions += 1
+            self._log_evolution("add", added)
+            return f"[v{self.manager.schema_version}] Added column: {added}"
 
         if action == "drop":
-            dropped = self.manager.drop_column()
-            if dropped:
-                self.num_drops += 1
-                self._log_evolution("drop", dropped)
-                return f"[v{self.manager.schema_version}] Dropped column: {dropped}"
+            dropped = self.manager.drop_column(rng=self.rng)
+            if not dropped:
+                return None
+            self.num_drops += 1
+            self._log_evolution("drop", dropped)
+            return f"[v{self.manager.schema_version}] Dropped column: {dropped}"
+
+        change = self._apply(action)
+        if change is None:
+            return None
+        return f"[v{self.manager.schema_version}] {change}"
+
+    def _choose_weighted_action(self, adds: int = 0, drops: int = 0) -> str:
+        """A feasible action by weight, counting `adds`/`drops` already planned."""
+        feasible, weights = [], []
+        for action, weight in self.action_weights.items():
+            if weight <= 0:
+                continue
+            planned = 0
+            if action.startswith("add"):
+                if self.num_additions + adds >= self.max_additions:
+                    continue
+                planned = adds
+            if action == "drop":
+                if self.num_drops + drops >= self.max_drops:
+                    continue
+                planned = drops
+            if len(self.manager.action_candidates(action)) > planned:
+                feasible.append(action)
+                weights.append(weight)
+        if not feasible:
+            return "none"
+        return self._random().choices(feasible, weights)[0]
+
+    def _evolve_combined(self) -> str:
+        """
+        Plan actions_per_evolution actions and run the plain adds and drops
+        as one ALTER TABLE. Other weighted actions (type changes, renames,
+        defaults) can't join it and run as their own statements first.
+        """
+        rng = self._random()
+        view = self.manager.view
+        reserved = len(view.reserved_available)
+        droppable = len(view.droppable)
+
+        adds = drops = 0
+        others: List[str] = []
+        for _ in range(self.actions_per_evolution):
+            if self.action_weights:
+                planned_adds = adds + sum(a.startswith("add") for a in others)
+                action = self._choose_weighted_action(planned_adds, drops)
+                if action == "none":
+                    break
+                if action == "add":
+                    adds += 1
+                elif action == "drop":
+                    drops += 1
+                else:
+                    others.append(action)
+                continue
 
-        return None
+            can_add = (
+                self.num_additions + adds < self.max_additions and adds < reserved
+            )
+            can_drop = self.num_drops + drops < self.max_drops and drops < droppable
+            if not can_add and not can_drop:
+                break
+            if can_add and (not can_drop or rng.random() <= self.add_probability):
+                adds += 1
+            else:
+                drops += 1
+
+        if not adds and not drops and not others:
+            return "No evolution possible"
+
+        changes = [self._apply(action) for action in others]
+        changes = [change for change in changes if change is not None]
+        if adds or drops:
+            added, dropped = self.manager.alter_columns(
+                add=adds, drop=drops, rng=self.rng
+            )
+            self.num_additions += len(added)
+            self.num_drops += len(dropped)
+            for column in added:
+                self._log_evolution("add", column)
+            for column in dropped:
+                self._log_evolution("drop", column)
+            changes += [f"Added column: {column}" for column in added]
+            changes += [f"Dropped column: {column}" for column in dropped]
+        if not changes:
+            return "No evolution possible"
+        return f"[v{self.manager.schema_version}] " + "; ".join(changes)
+
+    def _apply(self, action: str) -> Optional[str]:
+        """Run one apply_action() action, returning its change description."""
+        column = self.manager.apply_action(action, rng=self.rng)
+        if not column:
+            return None
+        self.record(action, column)
+        return f"{ACTION_LABELS[action]}: {column}"
+
+    def _random(self):
+        return self.rng or random
 
     def summary(self) -> Dict:
         return {
@@ -82,17 +216,41 @@ class EvolutionController:
             "evolution_log": self.evolution_log
         }
 
+    def getstate(self) -> Dict[str, Any]:
+        """
+        Counters, log and rng state for a checkpoint. The manager's schema
+        is checkpointed separately (SchemaManager.getstate).
+        """
+        return {
+            "num_additions": self.num_additions,
+            "num_drops": self.num_drops,
+            "evolution_log": [dict(entry) for entry in self.evolution_log],
+            "rng": self.rng.getstate() if self.rng is not None else None,
+        }
+
+    def setstate(self, state: Dict[str, Any]):
+        self.num_additions = state["num_additions"]
+        self.num_drops = state["num_drops"]
+        self.evolution_log = [dict(entry) for entry in state["evolution_log"]]
+        if self.rng is not None and state["rng"] is not None:
+            self.rng.setstate(state["rng"])
+
     def has_reserved_columns(self) -> bool:
-        return any(
-            col.reserved and name not in self.manager.get_active_columns()
-            for name, col in self.manager.columns.items()
-        )
+        return bool(self.manager.view.reserved_available)
 
     def has_droppable_columns(self) -> bool:
-        return any(
-            not col.protected
-            for col in self.manager.get_active_columns().values()
-        )
+        return bool(self.manager.view.droppable)
+
+    def record(self, action: str, column: str):
+        """
+        Count and log a step applied outside evolve(), e.g. one whose ALTER
+        TABLE a resumed run found already committed.
+        """
+        if action.startswith("add"):
+            self.num_additions += 1
+        elif action == "drop":
+            self.num_drops += 1
+        self._log_evolution(action, column)
 
     def _log_evolution(self, action: str, column: str):
         self.evolution_log.append({
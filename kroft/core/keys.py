@@ -0,0 +1,227 @@
+import math
+import random
+import threading
+import uuid
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+KEY_TYPES = ("uuid", "int", "text")
+
+# Skewed sampling makes at most this many Zipf draws per requested key
+ZIPF_DRAWS_PER_KEY = 4
+
+_INT_TYPES = {
+    "SMALLINT", "INT", "INT2", "INT4", "INT8", "INTEGER", "BIGINT", "SERIAL",
+    "BIGSERIAL",
+}
+
+
+def key_type_for(sql_type: str) -> str:
+    """The LiveKeyIndex key_type matching a primary key's SQL type."""
+    base = sql_type.split("(")[0].strip().upper()
+    if base == "UUID":
+        return "uuid"
+    if base in _INT_TYPES:
+        return "int"
+    return "text"
+
+
+class LiveKeyIndex:
+    """
+    The primary keys of every live row, for mutating rows from any point in
+    the table's history without querying the database.
+
+    Keys are stored packed: 16 bytes per UUID in one bytearray, 8 bytes per
+    integer in an array('q'), or a plain list for text keys. That is about
+    1.6 GB (UUID) or 0.8 GB (int) at 100M keys. Sampling is O(1) per key
+    and removal is a swap-remove, O(1), so key positions are not stable.
+
+    `skew` > 0 makes sampling Zipf-like with that exponent over recency:
+    the most recently inserted keys are the hottest. Removing arbitrary
+    keys with discard() needs track_positions=True. That adds a key ->
+    position dict and gives up most of the compactness. take() needs no
+    position map.
+    """
+
+    def __init__(
+        self,
+        key_type: str = "uuid",
+        skew: float = 0.0,
+        track_positions: bool = False
+    ):
+        if key_type not in KEY_TYPES:
+            raise ValueError(
+                f"Unknown key type '{key_type}', expected one of {KEY_TYPES}"
+            )
+        if skew < 0:
+            raise ValueError("skew must be >= 0")
+
+        self.key_type = key_type
+        self.skew = skew
+        self.track_positions = track_positions
+        self._keys: Any = (
+            bytearray() if key_type == "uuid"
+            else array("q") if key_type == "int"
+            else []
+        )
+        self._positions: Optional[Dict[Any, int]] = {} if track_positions else None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        if self.key_type == "uuid":
+            return len(self._keys) // 16
+        return len(self._keys)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the packed key storage."""
+        if self.key_type == "uuid":
+            return len(self._keys)
+        if self.key_type == "int":
+            return len(self._keys) * self._keys.itemsize
+        return sum(len(str(key)) for key in self._keys) + 8 * len(self._keys)
+
+    def add(self, keys: Iterable):
+        with self._lock:
+            for key in keys:
+                if self._positions is not None:
+                    self._positions[self._normalize(key)] = len(self)
+                if self.key_type == "uuid":
+                    self._keys += _uuid_bytes(key)
+                else:
+                    self._keys.append(key)
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List:
+        """Up to k distinct live keys, leaving them in the index."""
+        with self._lock:
+            return [self._key_at(p) for p in self._sample_positions(k, rng)]
+
+    def choices(self, k: int, rng: Optional[random.Random] = None) -> List:
+        """k live keys drawn with replacement, e.g. foreign keys for child rows."""
+        rng = rng or random
+        with self._lock:
+            n = len(self)
+            if not n:
+                return []
+            if self.skew:
+                positions = [n - self._zipf_rank(n, rng) for _ in range(k)]
+            else:
+                positions = [rng.randrange(n) for _ in range(k)]
+            return [self._key_at(p) for p in positions]
+
+    def take(self, k: int, rng: Optional[random.Random] = None) -> List:
+        """Up to k distinct live keys, removed from the index (e.g. to delete)."""
+        with self._lock:
+            positions = self._sample_positions(k, rng)
+            keys = [self._key_at(p) for p in positions]
+            # Highest first, so a swap never moves a key that is still to go
+            for position in sorted(positions, reverse=True):
+                self._swap_remove(position)
+            return keys
+
+    def discard(self, keys: Iterable):
+        """Remove specific keys; requires track_positions=True."""
+        if self._positions is None:
+            raise ValueError("discard() requires track_positions=True")
+        with self._lock:
+            for key in keys:
+                position = self._positions.get(self._normalize(key))
+                if position is not None:
+                    self._swap_remove(position)
+
+    def getstate(self) -> Dict[str, Any]:
+        """
+        The keys in their packed form (raw bytes for UUID and int keys), in
+        index order so seeded sampling continues identically after setstate.
+        """
+        with self._lock:
+            if self.key_type == "uuid":
+                keys: Any = bytes(self._keys)
+            elif self.key_type == "int":
+                keys = self._keys.tobytes()
+            else:
+                keys = list(self._keys)
+        return {"key_type": self.key_type, "keys": keys}
+
+    def setstate(self, state: Dict[str, Any]):
+        if state["key_type"] != self.key_type:
+            raise ValueError(
+                f"Checkpointed keys are '{state['key_type']}', "
+                f"this index holds '{self.key_type}'"
+            )
+        with self._lock:
+            if self.key_type == "uuid":
+                self._keys = bytearray(state["keys"])
+            elif self.key_type == "int":
+                self._keys = array("q")
+                self._keys.frombytes(state["keys"])
+            else:
+                self._keys = list(state["keys"])
+            if self._positions is not None:
+                self._positions = {
+                    self._normalize(self._key_at(position)): position
+                    for position in range(len(self))
+                }
+
+    def _sample_positions(self, k: int, rng: Optional[random.Random]) -> List[int]:
+        rng = rng or random
+        n = len(self)
+        k = min(k, n)
+        if k <= 0:
+            return []
+        # Rejection gets slow once most keys are wanted; skew matters little then
+        if not self.skew or k * 2 > n:
+            return rng.sample(range(n), k)
+
+        # Steep skew keeps hitting the same few ranks, so Zipf draws are
+        # capped and any shortfall is topped up uniformly. With k <= n / 2 a
+        # uniform draw is new at least half the time.
+        chosen: Dict[int, None] = {}
+        for _ in range(ZIPF_DRAWS_PER_KEY * k):
+            chosen[n - self._zipf_rank(n, rng)] = None
+            if len(chosen) == k:
+                return list(chosen)
+        while len(chosen) < k:
+            chosen[rng.randrange(n)] = None
+        return list(chosen)
+
+    def _zipf_rank(self, n: int, rng: random.Random) -> int:
+        """A rank in 1..n with P(r) roughly proportional to r ** -skew."""
+        u = rng.random()
+        s = self.skew
+        if s == 1.0:
+            x = n ** u
+        else:
+            x = ((n ** (1 - s) - 1) * u + 1) ** (1 / (1 - s))
+        return min(max(int(math.floor(x)), 1), n)
+
+    def _key_at(self, position: int):
+        if self.key_type == "uuid":
+            start = position * 16
+            return str(uuid.UUID(bytes=bytes(self._keys[start:start + 16])))
+        return self._keys[position]
+
+    def _swap_remove(self, position: int):
+        last = len(self) - 1
+        if self._positions is not None:
+            self._positions.pop(self._normalize(self._key_at(position)), None)
+            if position != last:
+                self._positions[self._normalize(self._key_at(last))] = position
+
+        if self.key_type == "uuid":
+            start = position * 16
+            if position != last:
+                self._keys[start:start + 16] = self._keys[-16:]
+            del self._keys[-16:]
+        else:
+            if position != last:
+                self._keys[position] = self._keys[last]
+            self._keys.pop()
+
+    def _normalize(self, key):
+        return _uuid_bytes(key) if self.key_type == "uuid" else key
+
+
+def _uuid_bytes(key) -> bytes:
+    if isinstance(key, uuid.UUID):
+        return key.bytes
+    return uuid.UUID(str(key)).bytes
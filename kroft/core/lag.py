@@ -0,0 +1,240 @@
+import itertools
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from kroft.core.column import ColumnDefinition
+from kroft.core.metrics import Metrics, OperationStats
+
+DEFAULT_STAMP_COLUMN = "kroft_lag_stamp"
+
+
+class LagTracker:
+    """
+    End-to-end lag between a MutationEngine writing a change and a consumer
+    seeing it.
+
+    The engine stamps every inserted and updated row with "<seq>:<emit_ns>"
+    (a sequence number and time.time_ns() at write time) in `column`, which
+    the table must have: add column_definition() to the schema. Consumers
+    pass each stamp they read to observe(); lag is arrival minus emit time,
+    so any consumer on the same host can report it. Deletes carry no stamp.
+    """
+
+    def __init__(
+        self,
+        column: str = DEFAULT_STAMP_COLUMN,
+        window: float = 1.0,
+        metrics: Optional[Metrics] = None
+    ):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.column = column
+        self.window = window
+        self.metrics = metrics
+        self.issued = 0
+        self.overall = OperationStats()
+        self.started_ns = time.time_ns()
+        # Window index (seconds since start // window) -> lag histogram
+        self.windows: Dict[int, OperationStats] = {}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def column_definition(self) -> ColumnDefinition:
+        """The stamp column; protected so it is never updated or dropped."""
+        return ColumnDefinition(self.column, "TEXT", lambda: None, protected=True)
+
+    def stamp(self, n: int) -> List[str]:
+        """n stamps for rows about to be written together."""
+        now = time.time_ns()
+        with self._lock:
+            self.issued += n
+            return [f"{next(self._sequence)}:{now}" for _ in range(n)]
+
+    def observe(self, stamp: str, arrived_ns: Optional[int] = None) -> Optional[float]:
+        """Record one stamp seen downstream; returns its lag in seconds."""
+        try:
+            _, emitted = stamp.split(":")
+            emitted_ns = int(emitted)
+        except (AttributeError, ValueError):
+            return None
+        arrived_ns = arrived_ns if arrived_ns is not None else time.time_ns()
+        lag = max(arrived_ns - emitted_ns, 0) / 1e9
+        window = int((arrived_ns - self.started_ns) / 1e9 // self.window)
+        with self._lock:
+            self.overall.record(lag, 1, 0, 0)
+            stats = self.windows.get(window)
+            if stats is None:
+                stats = self.windows[window] = OperationStats()
+            stats.record(lag, 1, 0, 0)
+        if self.metrics is not None:
+            self.metrics.record("replication_lag", lag, rows=1)
+        return lag
+
+    def report(self) -> Dict[str, Any]:
+        """p50/p99 lag overall and per window, plus matched throughput."""
+        with self._lock:
+            elapsed = max((time.time_ns() - self.started_ns) / 1e9, 1e-9)
+            windows = [
+                {
+                    "start_s": index * self.window,
+                    "matched": stats.count,
+                    "rows_per_sec": stats.count / self.window,
+                    "p50_ms": stats.percentile(0.50) * 1000,
+                    "p99_ms": stats.percentile(0.99) * 1000,
+                }
+                for index, stats in sorted(self.windows.items())
+            ]
+            return {
+                "issued": self.issued,
+                "matched": self.overall.count,
+                "pending": max(self.issued - self.overall.count, 0),
+                "rows_per_sec": self.overall.count / elapsed,
+                "p50_ms": self.overall.percentile(0.50) * 1000,
+                "p99_ms": self.overall.percentile(0.99) * 1000,
+                "max_ms": self.overall.max_seconds * 1000,
+                "windows": windows,
+            }
+
+
+class LagConsumer(ABC):
+    """
+    Reads changes from downstream and feeds their stamps to a LagTracker.
+    Subclasses implement poll(), returning the number of stamps matched.
+    """
+
+    def __init__(self, tracker: LagTracker, interval: float = 0.05):
+        self.tracker = tracker
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def poll(self) -> int:
+        """Read what has arrived downstream; returns the stamps matched."""
+
+    def start(self) -> "LagConsumer":
+        """Poll on a background thread until stop()."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, drain: bool = True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if drain:
+            while self.poll():
+                pass
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Poll again at once while changes keep arriving
+            if not self.poll():
+                self._stop.wait(self.interval)
+
+
+class SlotConsumer(LagConsumer):
+    """
+    Consume a logical replication slot with the test_decoding plugin via
+    pg_logical_slot_get_changes (needs wal_level = logical). The slot is
+    created if missing; drop() removes it. Arrival is when a poll returns,
+    so reported lag includes up to one poll interval.
+    """
+
+    def __init__(
+        self,
+        conn,
+        tracker: LagTracker,
+        slot_name: str = "kroft_lag",
+        interval: float = 0.05,
+        max_changes: int = 10_000
+    ):
+        super().__init__(tracker, interval)
+        self.conn = conn
+        self.slot_name = slot_name
+        self.max_changes = max_changes
+        # test_decoding renders a text column as name[text]:'value'
+        self._pattern = re.compile(
+            re.escape(tracker.column) + r"\[[^\]]*\]:'(\d+:\d+)'"
+        )
+        self._ensure_slot()
+
+    def _ensure_slot(self):
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT 1 FROM pg_replication_slots WHERE slot_name = %s",
+                (self.slot_name,)
+            )
+            if cur.fetchone() is None:
+                cur.execute(
+                    "SELECT pg_create_logical_replication_slot(%s, 'test_decoding')",
+                    (self.slot_name,)
+                )
+        self.conn.commit()
+
+    def poll(self) -> int:
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT data FROM pg_logical_slot_get_changes(%s, NULL, %s)",
+                (self.slot_name, self.max_changes)
+            )
+            changes = cur.fetchall()
+        self.conn.commit()
+        arrived_ns = time.time_ns()
+
+        matched = 0
+        for (data,) in changes:
+            if ": INSERT:" not in data and ": UPDATE:" not in data:
+                continue
+            # With REPLICA IDENTITY FULL the old row comes first; skip it
+            found = self._pattern.search(data.rpartition("new-tuple:")[2])
+            if found and self.tracker.observe(found.group(1), arrived_ns) is not None:
+                matched += 1
+        return matched
+
+    def drop(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_drop_replication_slot(%s)", (self.slot_name,))
+        self.conn.commit()
+
+
+class FileTailConsumer(LagConsumer):
+    """
+    Tail a newline-delimited JSON file written by JsonLinesSink or
+    DebeziumEmitter, reading stamps from "row" or "after".
+    """
+
+    def __init__(self, path: str, tracker: LagTracker, interval: float = 0.05):
+        super().__init__(tracker, interval)
+        self.path = path
+        self._offset = 0
+        self._partial = b""
+
+    def poll(self) -> int:
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return 0
+        arrived_ns = time.time_ns()
+        self._offset += len(chunk)
+
+        # Keep a trailing half-written line for the next poll
+        *lines, self._partial = (self._partial + chunk).split(b"\n")
+        matched = 0
+        for line in lines:
+            if not line:
+                continue
+            event = json.loads(line)
+            row = event.get("row") or event.get("after") or {}
+            stamp = row.get(self.tracker.column)
+            if stamp and self.tracker.observe(stamp, arrived_ns) is not None:
+                matched += 1
+        return matched
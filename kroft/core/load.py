@@ -0,0 +1,237 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+class LoadProfile(ABC):
+    """A target rate in rows/sec as a function of seconds since the start."""
+
+    @abstractmethod
+    def rate(self, elapsed: float) -> float:
+        """Rows/sec to aim for `elapsed` seconds into the run."""
+
+
+class ConstantProfile(LoadProfile):
+    def __init__(self, rate: float):
+        self.target = rate
+
+    def rate(self, elapsed: float) -> float:
+        return self.target
+
+
+class RampProfile(LoadProfile):
+    """Linear ramp from start_rate to end_rate over duration, then hold."""
+
+    def __init__(self, start_rate: float, end_rate: float, duration: float):
+        self.start_rate = start_rate
+        self.end_rate = end_rate
+        self.duration = duration
+
+    def rate(self, elapsed: float) -> float:
+        progress = min(max(elapsed / self.duration, 0.0), 1.0)
+        return self.start_rate + (self.end_rate - self.start_rate) * progress
+
+
+class StepProfile(LoadProfile):
+    """Piecewise-constant rates given as (duration, rate) steps; the last holds."""
+
+    def __init__(self, steps: Sequence[Tuple[float, float]]):
+        if not steps:
+            raise ValueError("StepProfile needs at least one step")
+        self.steps = list(steps)
+
+    def rate(self, elapsed: float) -> float:
+        for duration, rate in self.steps:
+            if elapsed < duration:
+                return rate
+            elapsed -= duration
+        return self.steps[-1][1]
+
+
+class SineProfile(LoadProfile):
+    def __init__(self, mean: float, amplitude: float, period: float):
+        self.mean = mean
+        self.amplitude = amplitude
+        self.period = period
+
+    def rate(self, elapsed: float) -> float:
+        wave = math.sin(2 * math.pi * elapsed / self.period)
+        return max(self.mean + self.amplitude * wave, 0.0)
+
+
+class BurstProfile(LoadProfile):
+    """base_rate, except for burst_duration seconds at the start of every interval."""
+
+    def __init__(
+        self,
+        base_rate: float,
+        burst_rate: float,
+        interval: float,
+        burst_duration: float
+    ):
+        self.base_rate = base_rate
+        self.burst_rate = burst_rate
+        self.interval = interval
+        self.burst_duration = burst_duration
+
+    def rate(self, elapsed: float) -> float:
+        in_burst = elapsed % self.interval < self.burst_duration
+        return self.burst_rate if in_burst else self.base_rate
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at a profile's rate.
+
+    Callers reserve tokens up front and sleep until their reservation is
+    covered, so concurrent workers are spaced out instead of racing for
+    tokens. Unused tokens accumulate up to `burst_seconds` worth of rate.
+    """
+
+    def __init__(
+        self,
+        profile: LoadProfile,
+        burst_seconds: float = 0.1,
+        clock=time.perf_counter
+    ):
+        self.profile = profile
+        self.burst_seconds = burst_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Restart the profile clock with an empty bucket."""
+        self.started = self._updated = self.clock()
+        self.tokens = 0.0
+        self.granted = 0
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def current_rate(self) -> float:
+        return self.profile.rate(self.elapsed())
+
+    def _refill(self, now: float) -> float:
+        rate = self.profile.rate(now - self.started)
+        self.tokens = min(
+            self.tokens + rate * (now - self._updated),
+            max(rate * self.burst_seconds, 1.0)
+        )
+        self._updated = now
+        return rate
+
+    def reserve(self, n: int) -> Optional[float]:
+        """
+        Reserve n tokens and return how many seconds to wait before using
+        them, or None (reserving nothing) while the profile's rate is zero.
+        """
+        with self._lock:
+            rate = self._refill(self.clock())
+            if self.tokens - n >= 0:
+                self.tokens -= n
+                self.granted += n
+                return 0.0
+            if rate <= 0:
+                return None
+            self.tokens -= n
+            self.granted += n
+            return -self.tokens / rate
+
+    def take(self, max_n: int) -> int:
+        """Take up to max_n tokens that are available right now, without waiting."""
+        with self._lock:
+            self._refill(self.clock())
+            n = max(min(int(self.tokens), max_n), 0)
+            self.tokens -= n
+            self.granted += n
+            return n
+
+
+def precise_sleep(seconds: float, spin: float = 0.0005):
+    """Sleep, then spin for the last fraction of a millisecond to cut jitter."""
+    if seconds <= 0:
+        return
+    deadline = time.perf_counter() + seconds
+    if seconds > spin:
+        time.sleep(seconds - spin)
+    while time.perf_counter() < deadline:
+        pass
+
+
+class LoadScheduler:
+    """
+    Paces batches to follow a LoadProfile.
+
+    Batch size adapts to the current target rate so each batch covers about
+    `batch_interval` seconds of load, bounded by min/max_batch_size. Before
+    a batch is written, wait() blocks until the bucket has covered it.
+    `clock` and `sleep` are injectable so pacing can run on a fake clock.
+    """
+
+    def __init__(
+        self,
+        profile: LoadProfile,
+        batch_interval: float = 0.1,
+        min_batch_size: int = 1,
+        max_batch_size: int = 10_000,
+        clock=time.perf_counter,
+        sleep: Callable[[float], None] = precise_sleep
+    ):
+        self.bucket = TokenBucket(profile, clock=clock)
+        self.sleep = sleep
+        self.batch_interval = batch_interval
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.achieved = 0
+        self._requested = 0.0
+        self._last_sample = (0.0, profile.rate(0.0))
+        self._lock = threading.Lock()
+
+    def next_batch_size(self) -> int:
+        target = self.bucket.current_rate() * self.batch_interval
+        return int(min(max(round(target), self.min_batch_size), self.max_batch_size))
+
+    def start(self):
+        with self._lock:
+            self.bucket.reset()
+            self.achieved = 0
+            self._requested = 0.0
+            self._last_sample = (0.0, self.bucket.profile.rate(0.0))
+
+    def wait(self, rows: int):
+        delay = self.bucket.reserve(rows)
+        while delay is None:
+            self.sleep(self.batch_interval)
+            delay = self.bucket.reserve(rows)
+        self.sleep(delay)
+
+    def record(self, rows: int):
+        """Record rows actually written, for achieved-vs-requested reporting."""
+        with self._lock:
+            self.achieved += rows
+            self._integrate_requested(self.bucket.elapsed())
+
+    def _integrate_requested(self, elapsed: float):
+        # Trapezoid rule over the profile between successive samples
+        last_elapsed, last_rate = self._last_sample
+        rate = self.bucket.profile.rate(elapsed)
+        self._requested += (last_rate + rate) / 2 * (elapsed - last_elapsed)
+        self._last_sample = (elapsed, rate)
+
+    def report(self) -> Dict[str, float]:
+        with self._lock:
+            elapsed = max(self.bucket.elapsed(), 1e-9)
+            self._integrate_requested(elapsed)
+            return {
+                "elapsed_s": elapsed,
+                "requested_rows": self._requested,
+                "achieved_rows": self.achieved,
+                "requested_rate": self._requested / elapsed,
+                "achieved_rate": self.achieved / elapsed,
+                "current_target_rate": self.bucket.current_rate(),
+                "ratio": self.achieved / self._requested if self._requested else 0.0,
+            }
+
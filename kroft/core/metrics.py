@@ -0,0 +1,267 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+# Log-spaced latency buckets from 10µs to ~2 minutes, ~10% apart, so
+# percentiles are accurate to one bucket width and recording stays O(log n).
+_BUCKET_BOUNDS: List[float] = [1e-5 * 1.1 ** i for i in range(172)]
+
+# Coarser, conventional buckets used for the Prometheus exposition
+PROMETHEUS_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0,
+)
+
+
+class Sample:
+    """Per-call measurements filled in inside a Metrics.timer() block."""
+
+    __slots__ = ("rows", "bytes_sent", "statements")
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes_sent = 0
+        self.statements = 0
+
+
+class OperationStats:
+    def __init__(self):
+        self.count = 0
+        self.rows = 0
+        self.bytes_sent = 0
+        self.statements = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+
+    def record(self, seconds: float, rows: int, bytes_sent: int, statements: int):
+        self.count += 1
+        self.rows += rows
+        self.bytes_sent += bytes_sent
+        self.statements += statements
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= target:
+                bound = (
+                    _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS)
+                    else self.max_seconds
+                )
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def cumulative_count(self, le: float) -> int:
+        return sum(self.buckets[:bisect.bisect_right(_BUCKET_BOUNDS, le)])
+
+
+class GaugeStats:
+    """Running last/mean/max of a sampled level, e.g. a queue's occupancy."""
+
+    def __init__(self):
+        self.last = 0.0
+        self.total = 0.0
+        self.samples = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.last = value
+        self.total += value
+        self.samples += 1
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+
+
+class Metrics:
+    """
+    Thread-safe per-operation instrumentation for the simulation loop.
+
+    Operations are free-form names; kroft records "generate", "insert",
+    "update", "delete" and "ddl". Share one instance between the runner,
+    schema manager and mutation engines to get a single view.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.operations: Dict[str, OperationStats] = {}
+        self.gauges: Dict[str, GaugeStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        operation: str,
+        seconds: float,
+        rows: int = 0,
+        bytes_sent: int = 0,
+        statements: int = 0
+    ):
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats()
+            stats.record(seconds, rows, bytes_sent, statements)
+
+    def observe(self, gauge: str, value: float):
+        """Record a sample of a level such as queue depth."""
+        with self._lock:
+            stats = self.gauges.get(gauge)
+            if stats is None:
+                stats = self.gauges[gauge] = GaugeStats()
+            stats.observe(value)
+
+    @contextmanager
+    def timer(self, operation: str) -> Iterator[Sample]:
+        sample = Sample()
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            self.record(
+                operation,
+                time.perf_counter() - start,
+                sample.rows,
+                sample.bytes_sent,
+                sample.statements
+            )
+
+    def snapshot(self) -> Dict:
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            operations = {
+                name: {
+                    "count": stats.count,
+                    "rows": stats.rows,
+                    "bytes_sent": stats.bytes_sent,
+                    "statements": stats.statements,
+                    "statements_per_batch": stats.statements / stats.count,
+                    "seconds": stats.seconds,
+                    "rows_per_sec": stats.rows / elapsed,
+                    "p50_ms": stats.percentile(0.50) * 1000,
+                    "p95_ms": stats.percentile(0.95) * 1000,
+                    "p99_ms": stats.percentile(0.99) * 1000,
+                    "max_ms": stats.max_seconds * 1000,
+                }
+                for name, stats in self.operations.items()
+            }
+            gauges = {
+                name: {"last": stats.last, "mean": stats.mean, "max": stats.max}
+                for name, stats in self.gauges.items()
+            }
+        return {"elapsed_s": elapsed, "operations": operations, "gauges": gauges}
+
+    def to_prometheus(self) -> str:
+        """Render all operations in the Prometheus text exposition format."""
+        lines = [
+            "# TYPE kroft_operation_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self.operations.items())
+            for name, stats in items:
+                for le in PROMETHEUS_BUCKETS:
+                    lines.append(
+                        f'kroft_operation_seconds_bucket{{op="{name}",le="{le}"}} '
+                        f"{stats.cumulative_count(le)}"
+                    )
+                lines.append(
+                    f'kroft_operation_seconds_bucket{{op="{name}",le="+Inf"}} '
+                    f"{stats.count}"
+                )
+                labels = f'{{op="{name}"}}'
+                lines.append(f"kroft_operation_seconds_sum{labels} {stats.seconds}")
+                lines.append(f"kroft_operation_seconds_count{labels} {stats.count}")
+
+            for metric, attr in (
+                ("kroft_rows_total", "rows"),
+                ("kroft_bytes_sent_total", "bytes_sent"),
+                ("kroft_statements_total", "statements"),
+            ):
+                lines.append(f"# TYPE {metric} counter")
+                for name, stats in items:
+                    lines.append(f'{metric}{{op="{name}"}} {getattr(stats, attr)}')
+
+            if self.gauges:
+                lines.append("# TYPE kroft_gauge gauge")
+                for name, stats in sorted(self.gauges.items()):
+                    lines.append(f'kroft_gauge{{name="{name}"}} {stats.last}')
+        return "\n".join(lines) + "\n"
+
+
+class JsonLinesExporter:
+    """Append a Metrics snapshot to a JSON-lines file every `interval` seconds."""
+
+    def __init__(self, metrics: Metrics, path: str, interval: float = 10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write_snapshot(self):
+        line = json.dumps({"ts": time.time(), **self.metrics.snapshot()})
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def start(self) -> "JsonLinesExporter":
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write_snapshot()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.write_snapshot()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def serve_prometheus(
+    metrics: Metrics, port: int = 9464, addr: str = ""
+) -> ThreadingHTTPServer:
+    """
+    Serve metrics.to_prometheus() on http://addr:port/metrics from a daemon
+    thread. Call .shutdown() on the returned server to stop it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
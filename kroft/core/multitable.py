@@ -0,0 +1,234 @@
+import bisect
+import itertools
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+
+from kroft.core.concurrency import SchemaGate
+from kroft.core.evolution import EvolutionController
+from kroft.core.mutator import MutationEngine
+from kroft.core.rng import RandomStreams
+from kroft.core.schema import SchemaManager
+
+
+class TableSpec:
+    """
+    One table of a MultiTableSimulation.
+
+    Args:
+        weight: Relative share of batches written to this table.
+        foreign_keys: Column name -> parent TableSpec. Those columns are
+            filled from the parent's live-key index (so the parent's
+            MutationEngine needs track_keys=True) instead of their generator.
+            Mark them protected so evolution never drops them.
+        update_fraction / delete_fraction: Rows updated/deleted per batch, as
+            a fraction of the batch size. Deleting from a parent needs
+            ON DELETE CASCADE (or no FK constraint) on its children.
+        evolution: Optional EvolutionController for this table's schema.
+
+    Tables linked by foreign keys commit every batch, even under a
+    batches_per_commit TransactionPolicy: a child's insert before releasing
+    its parents' key_gate, a parent's deletes before releasing its own. An
+    open transaction on either side would leave the other waiting on its
+    row locks while holding the gate.
+    """
+
+    def __init__(
+        self,
+        schema_mgr: SchemaManager,
+        mutator: MutationEngine,
+        weight: float = 1.0,
+        foreign_keys: Optional[Dict[str, "TableSpec"]] = None,
+        update_fraction: float = 0.2,
+        delete_fraction: float = 0.1,
+        evolution: Optional[EvolutionController] = None
+    ):
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        if update_fraction + delete_fraction > 1:
+            raise ValueError("update_fraction + delete_fraction must be <= 1")
+
+        self.schema_mgr = schema_mgr
+        self.mutator = mutator
+        self.name = f"{schema_mgr.schema}.{schema_mgr.table_name}"
+        self.weight = weight
+        self.foreign_keys = dict(foreign_keys or {})
+        self.update_fraction = update_fraction
+        self.delete_fraction = delete_fraction
+        self.evolution = evolution
+        self.batches = 0
+        # A table's engine is used by one worker at a time
+        self.lock = threading.Lock()
+        # Readers-writer lock over this table's live keys: children hold it
+        # shared from picking keys until their insert commits, deletes hold
+        # it exclusively, so a child never references a key being deleted
+        self.key_gate = SchemaGate()
+
+    def missing_parent(self) -> Optional["TableSpec"]:
+        """A parent with no live keys yet, which must be written first."""
+        for parent in self.foreign_keys.values():
+            if not len(parent.mutator.live_keys):
+                return parent
+        return None
+
+
+class MultiTableSimulation:
+    """
+    Drive many SchemaManager/MutationEngine pairs from one pool of workers.
+
+    Each of `total_batches` batches goes to a table picked by weight (an
+    O(log n) bisect, so hundreds of tables are fine); a child whose parent
+    has no rows yet writes the parent instead. Workers only contend on the
+    table they are writing, never on a global lock around the database.
+    """
+
+    def __init__(
+        self,
+        tables: List[TableSpec],
+        total_batches: int,
+        batch_size: int = 500,
+        workers: int = 1,
+        seed: Optional[int] = None
+    ):
+        if not tables:
+            raise ValueError("MultiTableSimulation needs at least one table")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        for table in tables:
+            for column, parent in table.foreign_keys.items():
+                if parent not in tables:
+                    raise ValueError(
+                        f"{table.name}.{column} references {parent.name}, "
+                        "which is not part of the simulation"
+                    )
+                if parent.mutator.live_keys is None:
+                    raise ValueError(
+                        f"{parent.name} is referenced by {table.name}.{column}; "
+                        "its MutationEngine needs track_keys=True"
+                    )
+
+        self.tables = tables
+        self.total_batches = total_batches
+        self.batch_size = batch_size
+        self.workers = workers
+        self.streams = RandomStreams(seed) if seed is not None else None
+        self._cumulative_weights = list(
+            itertools.accumulate(table.weight for table in tables)
+        )
+        self._claimed = 0
+        self._claim_lock = threading.Lock()
+        self._parents = {
+            parent for table in tables for parent in table.foreign_keys.values()
+        }
+        self.evolution_messages: List[str] = []
+
+    def run(self):
+        self._claimed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._work) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+        for table in self.tables:
+            table.mutator.commit()
+
+    def _work(self):
+        while (batch_num := self._claim()) is not None:
+            streams = (
+                self.streams.spawn("batch", batch_num) if self.streams else None
+            )
+            rng = streams.stream("table") if streams else random
+            table = self.pick_table(rng)
+            while (parent := table.missing_parent()) is not None:
+                table = parent
+            with table.lock:
+                self._write_batch(table, streams)
+
+    def _claim(self) -> Optional[int]:
+        with self._claim_lock:
+            if self._claimed >= self.total_batches:
+                return None
+            self._claimed += 1
+            return self._claimed
+
+    def pick_table(self, rng=random) -> TableSpec:
+        point = rng.random() * self._cumulative_weights[-1]
+        index = bisect.bisect_right(self._cumulative_weights, point)
+        return self.tables[min(index, len(self.tables) - 1)]
+
+    def _write_batch(self, table: TableSpec, streams: Optional[RandomStreams]):
+        rng = streams.stream("mutation") if streams else None
+        with ExitStack() as stack:
+            # One fixed order over parents, whichever column comes first
+            for parent in sorted(set(table.foreign_keys.values()), key=id):
+                stack.enter_context(parent.key_gate.dml())
+            columns = {}
+            for name, col in table.schema_mgr.get_active_columns().items():
+                parent = table.foreign_keys.get(name)
+                if parent is not None:
+                    values = parent.mutator.live_keys.choices(self.batch_size, rng)
+                    if len(values) < self.batch_size:
+                        # The parent was emptied since we checked; skip it
+                        return
+                else:
+                    values = col.generate_many(
+                        self.batch_size,
+                        streams.stream("column", name) if streams else None
+                    )
+                columns[name] = values
+
+            ids = table.mutator.insert_batch(columns)
+            if table.foreign_keys:
+                table.mutator.commit()
+        table.batches += 1
+        self._mutate(table, ids, rng)
+        if table.foreign_keys:
+            # Cascaded parent deletes would otherwise wait on these row locks
+            table.mutator.commit()
+
+        evolution = table.evolution
+        if evolution is not None:
+            # The table lock keeps this table's DML out while DDL runs
+            table.mutator.commit()
+            message = evolution.evolve(table.batches)
+            if message:
+                self.evolution_messages.append(f"{table.name}: {message}")
+
+    def _mutate(self, table: TableSpec, ids: List, rng: Optional[random.Random]):
+        update_count = int(len(ids) * table.update_fraction)
+        delete_count = int(len(ids) * table.delete_fraction)
+        mutator = table.mutator
+        if table not in self._parents:
+            self._update_and_delete(table, ids, update_count, delete_count, rng)
+            return
+        with table.key_gate.ddl():
+            self._update_and_delete(table, ids, update_count, delete_count, rng)
+            mutator.commit()
+
+    def _update_and_delete(
+        self,
+        table: TableSpec,
+        ids: List,
+        update_count: int,
+        delete_count: int,
+        rng: Optional[random.Random]
+    ):
+        mutator = table.mutator
+        if mutator.live_keys is not None:
+            delete_ids = mutator.live_keys.take(delete_count, rng)
+            update_ids = mutator.live_keys.sample(update_count, rng)
+        else:
+            picked = (rng or random).sample(ids, k=update_count + delete_count)
+            update_ids = picked[:update_count]
+            delete_ids = picked[update_count:]
+
+        mutator.total_updates += mutator._update_records(update_ids, rng)
+        mutator.total_deletes += mutator._delete_records(delete_ids)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Per-table batch count and MutationEngine counters."""
+        return {
+            table.name: {"batches": table.batches, **table.mutator.get_counters()}
+            for table in self.tables
+        }
@@ -1,10 +1,53 @@
+import itertools
 import random
-from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from psycopg2 import sql
 from psycopg2.extras import execute_values
 
-from kroft.core.batch import BatchGenerator
+from kroft.core.batch import BatchGenerator, RowBatch
+from kroft.core.connection import acquire, putback
+from kroft.core.copy_format import encode_binary, encode_text
+from kroft.core.keys import LiveKeyIndex, key_type_for
+from kroft.core.lag import LagTracker
+from kroft.core.metrics import Metrics
+from kroft.core.schema import SchemaManager
+from kroft.core.sinks import ChangeSink
+from kroft.core.transactions import TransactionPolicy
+from kroft.core.wal import current_lsn, wal_bytes
+from kroft.core.workload import WorkloadShape
+
+INSERT_STRATEGIES = ("values", "copy", "copy_binary")
+UPDATE_MODES = ("per_row", "batched")
+
+# Rows per INSERT statement on the execute_values path (psycopg2's default)
+VALUES_PAGE_SIZE = 100
+
+# Statement names must be unique per session, even across engines
+_STATEMENT_IDS = itertools.count(1)
+
+# SERIAL types only exist in DDL; casts need the integer type underneath
+_SERIAL_CASTS = {
+    "SMALLSERIAL": "SMALLINT", "SERIAL2": "SMALLINT",
+    "SERIAL": "INTEGER", "SERIAL4": "INTEGER",
+    "BIGSERIAL": "BIGINT", "SERIAL8": "BIGINT",
+}
+
+
+def _last_query_bytes(cur) -> int:
+    query = getattr(cur, "query", None)
+    return len(query) if isinstance(query, (bytes, str)) else 0
 
 
 class MutationEngine:
@@ -15,51 +58,268 @@ class MutationEngine:
         table_name: str,
         primary_key: str = "id",
         update_column: Optional[str] = None,
-        generator: Optional[BatchGenerator] = None
+        generator: Optional[BatchGenerator] = None,
+        insert_strategy: str = "values",
+        update_mode: str = "per_row",
+        use_prepared_statements: bool = False,
+        metrics: Optional[Metrics] = None,
+        rng: Optional[random.Random] = None,
+        track_keys: bool = False,
+        key_skew: float = 0.0,
+        transaction_policy: Optional[TransactionPolicy] = None,
+        sinks: Optional[List[ChangeSink]] = None,
+        emit_sql: bool = True,
+        workload: Optional[WorkloadShape] = None,
+        lag_tracker: Optional[LagTracker] = None
     ):
+        """
+        Args:
+            track_keys: Keep a LiveKeyIndex of every inserted key so updates
+                and deletes can target rows from the whole table history.
+            key_skew: Zipf exponent for picking keys from that index; 0 is
+                uniform, higher values concentrate on recent rows.
+            transaction_policy: How statements are grouped into commits; by
+                default every operation commits on its own. While a
+                transaction is open the engine holds its connection, so call
+                commit() when done.
+            sinks: ChangeSinks (JSONL/CSV/Parquet files...) that receive every
+                insert, update and delete as change events. Close them when done.
+            emit_sql: Write to Postgres. False generates the change stream
+                into the sinks only, with no database at all (conn may be None).
+            workload: Which columns updates may touch (e.g. only unindexed
+                ones, for HOT updates) and WAL-per-operation sampling.
+            lag_tracker: Stamp every inserted/updated row with a sequence
+                number and emit time in the tracker's column, for measuring
+                end-to-end lag downstream (see kroft.core.lag).
+        """
+        if insert_strategy not in INSERT_STRATEGIES:
+            raise ValueError(
+                f"Unknown insert strategy '{insert_strategy}', "
+                f"expected one of {INSERT_STRATEGIES}"
+            )
+        if update_mode not in UPDATE_MODES:
+            raise ValueError(
+                f"Unknown update mode '{update_mode}', expected one of {UPDATE_MODES}"
+            )
+
+        if not emit_sql and not sinks:
+            raise ValueError("emit_sql=False needs at least one sink")
+
         self.conn = conn
         self.schema = schema
         self.table_name = table_name
         self.primary_key = primary_key
         self.update_column = update_column
         self.generator = generator
+        self.insert_strategy = insert_strategy
+        self.update_mode = update_mode
+        self.use_prepared_statements = use_prepared_statements
+        self.metrics = metrics or Metrics()
+        self.transaction_policy = transaction_policy or TransactionPolicy()
+        self.sinks: List[ChangeSink] = list(sinks or [])
+        self.emit_sql = emit_sql
+        self.workload = workload or WorkloadShape()
+        self.lag_tracker = lag_tracker
+        # op -> sampled WAL bytes/rows/samples, see wal_report()
+        self.wal_stats: Dict[str, Dict[str, int]] = {}
+        self._wal_operations = 0
+        self._indexed: Optional[Tuple[int, Set[str]]] = None
+        # Source of mutation decisions and update values; the global random
+        # module when unset
+        self.rng = rng
+        self.live_keys: Optional[LiveKeyIndex] = None
+        if track_keys:
+            self.live_keys = LiveKeyIndex(
+                key_type_for(self._sql_type(primary_key)), skew=key_skew
+            )
+
+        # Prepared statements live per session, so the cache is keyed by
+        # connection first: conn id -> (operation, column, schema_version) -> name
+        self.schema_version = 1
+        self._prepared: Dict[int, Dict[Tuple[str, str, int], str]] = {}
+        self._stale_statements: Dict[int, List[str]] = {}
+        self.prepared_hits = 0
+        self.prepared_misses = 0
 
         self.total_inserts = 0
         self.total_updates = 0
         self.total_deletes = 0
+        self.total_update_statements = 0
+        self.last_update_statements = 0
+        self.total_transactions = 0
 
-    def insert_batch(self, rows: List[Dict]) -> List[str]:
-        if not rows:
-            return []
+        self._txn_conn = None
+        self._txn_batches = 0
+        # Keys inserted in the open transaction, not yet in live_keys
+        self._pending_keys: List = []
+        # Set by a checkpointing SimulationRunner: the transaction then stays
+        # open until commit(), which the runner pairs with a checkpoint
+        self.defer_commits = False
 
-        inserted_ids = [row[self.primary_key] for row in rows]
-        self.total_inserts += len(rows)
+    def clone(self, conn) -> "MutationEngine":
+        """
+        Return an engine with the same configuration bound to another
+        connection, with its own counters and prepared-statement cache. The
+        Metrics instance and live-key index are shared so clones report into
+        one view and mutate from one history.
+        """
+        engine = MutationEngine(
+            conn,
+            schema=self.schema,
+            table_name=self.table_name,
+            primary_key=self.primary_key,
+            update_column=self.update_column,
+            generator=self.generator,
+            insert_strategy=self.insert_strategy,
+            update_mode=self.update_mode,
+            use_prepared_statements=self.use_prepared_statements,
+            metrics=self.metrics,
+            rng=self.rng,
+            transaction_policy=self.transaction_policy,
+            sinks=self.sinks,
+            emit_sql=self.emit_sql,
+            workload=self.workload,
+            lag_tracker=self.lag_tracker
+        )
+        engine.live_keys = self.live_keys
+        engine.defer_commits = self.defer_commits
+        engine.schema_version = self.schema_version
+        return engine
 
-        with self.conn.cursor() as cur:
-            columns = rows[0].keys()
-            query = sql.SQL("INSERT INTO {}.{} ({}) VALUES %s").format(
-                sql.Identifier(self.schema),
-                sql.Identifier(self.table_name),
-                sql.SQL(", ").join(map(sql.Identifier, columns))
-            )
-            values = [[row[col] for col in columns] for row in rows]
-            execute_values(cur, query, values)
+    def insert_batch(
+        self, rows: Union[List[Dict], Dict[str, Sequence], RowBatch]
+    ) -> List[str]:
+        """
+        Insert a batch given as row dicts, as a columnar batch (column name
+        -> sequence of values, see BatchGenerator.generate_columns) or as a
+        RowBatch, whose rows are written without being copied.
+        """
+        columns, values = self._batch_values(rows)
+        if not values:
+            return []
+
+        pk_index = columns.index(self.primary_key)
+        inserted_ids = [row[pk_index] for row in values]
+        self.total_inserts += len(values)
 
-            self.conn.commit()
+        if self.lag_tracker is not None:
+            columns, values = self._stamp_rows(columns, values)
+        if self.emit_sql:
+            self._insert_values(columns, values)
+        self._emit("insert", columns, values)
 
+        if self.live_keys is not None:
+            if self._txn_conn is not None:
+                # Published on commit, so nothing picks a key (e.g. as a
+                # foreign key on another connection) that may be rolled back
+                self._pending_keys.extend(inserted_ids)
+            else:
+                self.live_keys.add(inserted_ids)
         return inserted_ids
 
-    def maybe_mutate_batch(self, inserted_ids: List[str]) -> Tuple[int, int]:
-        if not inserted_ids or random.random() > 0.5:
+    def _stamp_rows(
+        self, columns: List[str], values: List[Sequence]
+    ) -> Tuple[List[str], List[Sequence]]:
+        stamps = self.lag_tracker.stamp(len(values))
+        column = self.lag_tracker.column
+        if column not in columns:
+            return columns + [column], [
+                (*row, stamp) for row, stamp in zip(values, stamps)
+            ]
+        i = columns.index(column)
+        return columns, [
+            (*row[:i], stamp, *row[i + 1:]) for row, stamp in zip(values, stamps)
+        ]
+
+    def _insert_values(self, columns: List[str], values: List[Sequence]):
+        with (
+            self.metrics.timer("insert") as sample,
+            self._transaction("insert") as conn,
+            conn.cursor() as cur,
+        ):
+            sample.rows = len(values)
+            wal_start = self._wal_start(cur)
+            if self.insert_strategy == "values":
+                query = sql.SQL("INSERT INTO {}.{} ({}) VALUES %s").format(
+                    sql.Identifier(self.schema),
+                    sql.Identifier(self.table_name),
+                    sql.SQL(", ").join(map(sql.Identifier, columns))
+                )
+                execute_values(cur, query, values, page_size=VALUES_PAGE_SIZE)
+                # execute_values sends one statement per page; cur.query only
+                # holds the last one, so bytes are extrapolated from it
+                sample.statements = -(-len(values) // VALUES_PAGE_SIZE)
+                sample.bytes_sent = _last_query_bytes(cur) * sample.statements
+            else:
+                sample.bytes_sent = self._copy_rows(cur, columns, values)
+                sample.statements = 1
+            self._wal_end(cur, wal_start, "insert", len(values))
+
+    @staticmethod
+    def _batch_values(
+        rows: Union[List[Dict], Dict[str, Sequence], RowBatch]
+    ) -> Tuple[List[str], List[Sequence]]:
+        """Column names and per-row value sequences in that column order."""
+        if isinstance(rows, dict):
+            rows = RowBatch.from_columns(rows)
+        if isinstance(rows, RowBatch):
+            return list(rows.columns), rows.rows
+        columns = list(rows[0].keys()) if rows else []
+        return columns, [[row[col] for col in columns] for row in rows]
+
+    def _copy_rows(self, cur, columns: List[str], values: List[Sequence]) -> int:
+        """Stream rows to Postgres with COPY ... FROM STDIN; returns bytes sent."""
+        sql_types = self._column_types(columns)
+        binary = self.insert_strategy == "copy_binary"
+
+        query = sql.SQL("COPY {}.{} ({}) FROM STDIN{}").format(
+            sql.Identifier(self.schema),
+            sql.Identifier(self.table_name),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            sql.SQL(" WITH (FORMAT binary)" if binary else "")
+        )
+        payload = (
+            encode_binary(values, sql_types) if binary
+            else encode_text(values, sql_types)
+        )
+        cur.copy_expert(query, payload)
+        return len(payload.getvalue())
+
+    def _column_types(self, columns: List[str]) -> List[str]:
+        return [self._sql_type(col) for col in columns]
+
+    def _sql_type(self, column: str) -> str:
+        schema = self.generator.schema if self.generator else {}
+        col_def = schema.get(column)
+        return col_def.sql_type if col_def else "TEXT"
+
+    def _cast_type(self, column: str) -> str:
+        """The column's SQL type as usable in a ::cast."""
+        sql_type = self._sql_type(column)
+        return _SERIAL_CASTS.get(sql_type.strip().upper(), sql_type)
+
+    def _random(self, rng: Optional[random.Random] = None):
+        return rng or self.rng or random
+
+    def maybe_mutate_batch(
+        self, inserted_ids: List[str], rng: Optional[random.Random] = None
+    ) -> Tuple[int, int]:
+        rng = self._random(rng)
+        if not inserted_ids or rng.random() > 0.5:
             return 0, 0
 
-        operation = random.choice(["update", "delete"])
-        subset = random.sample(inserted_ids, max(1, len(inserted_ids) // 4))
-        print(f"Picking operation next - {operation}")
+        operation = rng.choice(["update", "delete"])
+        count = max(1, len(inserted_ids) // 4)
+        if self.live_keys is None:
+            subset = rng.sample(inserted_ids, count)
+        elif operation == "update":
+            subset = self.live_keys.sample(count, rng)
+        else:
+            # Taken keys leave the index, so deleted rows are never picked again
+            subset = self.live_keys.take(count, rng)
 
         if operation == "update":
-            print(f"Updating {len(subset)} records: {subset}")
-            updated_count = self._update_records(subset)
+            updated_count = self._update_records(subset, rng)
             self.total_updates += updated_count
             return updated_count, 0
         else:
@@ -67,50 +327,275 @@ class MutationEngine:
             self.total_deletes += deleted_count
             return 0, deleted_count
 
-    def _update_records(self, ids: List[str]) -> int:
+    def _update_records(
+        self, ids: List[str], rng: Optional[random.Random] = None
+    ) -> int:
         if not ids or not self.generator:
             return 0
 
         modifiable_columns = self.generator.get_modifiable_columns(
             exclude=[self.primary_key]
             )
-        
+        if self.workload.update_columns is not None or self.workload.hot_updates:
+            modifiable_columns = self.workload.update_targets(
+                modifiable_columns,
+                self._indexed_columns() if self.workload.hot_updates else None
+            )
+
         if not modifiable_columns:
             return 0
 
-        with self.conn.cursor() as cur:
-            for row_id in ids:
-                col = random.choice(modifiable_columns)
-                val = self.generator.generate_value(col)
+        if self.update_mode == "batched":
+            return self._update_records_batched(ids, modifiable_columns, rng)
 
-                if self.update_column:
-                    query = sql.SQL(
-                        "UPDATE {}.{} SET {} = %s, {} = now() WHERE {} = %s"
-                    ).format(
-                        sql.Identifier(self.schema),
-                        sql.Identifier(self.table_name),
-                        sql.Identifier(col),
-                        sql.Identifier(self.update_column),
-                        sql.Identifier(self.primary_key)
+        changes = self._plan_updates(ids, modifiable_columns, rng)
+        if not self.emit_sql:
+            self._emit_updates(changes, self._stamps(len(changes)))
+            return len(ids)
+
+        with (
+            self.metrics.timer("update") as sample,
+            self._transaction("update") as conn,
+            conn.cursor() as cur,
+        ):
+            sample.rows = sample.statements = len(ids)
+            wal_start = self._wal_start(cur)
+            stamps = self._stamps(len(changes))
+            for i, (row_id, col, val) in enumerate(changes):
+                if self.use_prepared_statements:
+                    name = self._prepared_statement(
+                        cur,
+                        "update",
+                        col,
+                        lambda: self._update_query(
+                            col, sql.SQL("$1"), sql.SQL("$2"), sql.SQL("$3")
+                        )
+                    )
+                    params = (val, row_id) + ((stamps[i],) if stamps else ())
+                    cur.execute(
+                        sql.SQL("EXECUTE {} ({})").format(
+                            sql.Identifier(name),
+                            sql.SQL(", ").join(sql.Placeholder() * len(params))
+                        ),
+                        params
                     )
-                    cur.execute(query, (val, row_id))
                 else:
-                    query = sql.SQL("UPDATE {}.{} SET {} = %s WHERE {} = %s").format(
-                        sql.Identifier(self.schema),
-                        sql.Identifier(self.table_name),
-                        sql.Identifier(col),
-                        sql.Identifier(self.primary_key)
+                    params = (val, stamps[i], row_id) if stamps else (val, row_id)
+                    cur.execute(self._update_query(col), params)
+                sample.bytes_sent += _last_query_bytes(cur)
+            self._wal_end(cur, wal_start, "update", len(ids))
+
+        self._record_update_statements(len(ids))
+        self._emit_updates(changes, stamps)
+        return len(ids)
+
+    def _plan_updates(
+        self,
+        ids: List[str],
+        modifiable_columns: List[str],
+        rng: Optional[random.Random] = None
+    ) -> List[Tuple[str, str, object]]:
+        """A random column and fresh value for every row: (id, column, value)."""
+        value_rng = rng or self.rng
+        rng = self._random(rng)
+        changes = []
+        for row_id in ids:
+            col = rng.choice(modifiable_columns)
+            changes.append(
+                (row_id, col, self.generator.generate_value(col, value_rng))
+            )
+        return changes
+
+    @staticmethod
+    def _group_updates(
+        changes: List[Tuple[str, str, object]],
+        stamps: Optional[List[str]] = None
+    ) -> Dict[str, List[Tuple]]:
+        """Column -> (id, value) pairs, or (id, value, stamp) with stamps."""
+        groups: Dict[str, List[Tuple]] = {}
+        if stamps:
+            for (row_id, col, val), stamp in zip(changes, stamps):
+                groups.setdefault(col, []).append((row_id, val, stamp))
+            return groups
+        for row_id, col, val in changes:
+            groups.setdefault(col, []).append((row_id, val))
+        return groups
+
+    def _stamps(self, n: int) -> Optional[List[str]]:
+        return self.lag_tracker.stamp(n) if self.lag_tracker is not None else None
+
+    def _update_records_batched(
+        self,
+        ids: List[str],
+        modifiable_columns: List[str],
+        rng: Optional[random.Random] = None
+    ) -> int:
+        """
+        Apply updates as one set-based UPDATE per chosen column.
+
+        Every row still gets its own random column and value, so the change
+        stream stays heterogeneous; rows that picked the same column are
+        joined against a VALUES list in a single statement.
+        """
+        changes = self._plan_updates(ids, modifiable_columns, rng)
+        groups = self._group_updates(changes, self._stamps(len(changes)))
+        if not self.emit_sql:
+            self._emit_groups(groups)
+            return len(ids)
+
+        with (
+            self.metrics.timer("update") as sample,
+            self._transaction("update") as conn,
+            conn.cursor() as cur,
+        ):
+            sample.rows = len(ids)
+            sample.statements = len(groups)
+            wal_start = self._wal_start(cur)
+            for col, pairs in groups.items():
+                assignments = [
+                    sql.SQL("{} = v.val::{}").format(
+                        sql.Identifier(col), sql.SQL(self._cast_type(col))
+                    )
+                ]
+                if self.update_column:
+                    assignments.append(
+                        sql.SQL("{} = now()").format(
+                            sql.Identifier(self.update_column)
+                        )
+                    )
+                if self.lag_tracker is not None:
+                    assignments.append(
+                        sql.SQL("{} = v.stamp").format(
+                            sql.Identifier(self.lag_tracker.column)
+                        )
                     )
-                    cur.execute(query, (val, row_id))
 
-            self.conn.commit()
+                alias = "v(pk, val, stamp)" if self.lag_tracker else "v(pk, val)"
+                query = sql.SQL(
+                    "UPDATE {}.{} AS t SET {} FROM (VALUES %s) AS " + alias + " "
+                    "WHERE t.{} = v.pk::{}"
+                ).format(
+                    sql.Identifier(self.schema),
+                    sql.Identifier(self.table_name),
+                    sql.SQL(", ").join(assignments),
+                    sql.Identifier(self.primary_key),
+                    sql.SQL(self._cast_type(self.primary_key))
+                )
+                # One page per group keeps it to a single statement
+                execute_values(cur, query, pairs, page_size=len(pairs))
+                sample.bytes_sent += _last_query_bytes(cur)
+            self._wal_end(cur, wal_start, "update", len(ids))
 
+        self._record_update_statements(len(groups))
+        self._emit_groups(groups)
         return len(ids)
 
+    def _update_query(
+        self,
+        col: str,
+        value_param: sql.Composable = sql.Placeholder(),
+        key_param: sql.Composable = sql.Placeholder(),
+        stamp_param: sql.Composable = sql.Placeholder()
+    ) -> sql.Composed:
+        assignments = [sql.SQL("{} = {}").format(sql.Identifier(col), value_param)]
+        if self.update_column:
+            assignments.append(
+                sql.SQL("{} = now()").format(sql.Identifier(self.update_column))
+            )
+        if self.lag_tracker is not None:
+            assignments.append(
+                sql.SQL("{} = {}").format(
+                    sql.Identifier(self.lag_tracker.column), stamp_param
+                )
+            )
+        return sql.SQL("UPDATE {}.{} SET {} WHERE {} = {}").format(
+            sql.Identifier(self.schema),
+            sql.Identifier(self.table_name),
+            sql.SQL(", ").join(assignments),
+            sql.Identifier(self.primary_key),
+            key_param
+        )
+
+    def _emit_updates(
+        self,
+        changes: List[Tuple[str, str, object]],
+        stamps: Optional[List[str]] = None
+    ):
+        if self.sinks:
+            self._emit_groups(self._group_updates(changes, stamps))
+
+    def _emit_groups(self, groups: Dict[str, List[Tuple]]):
+        stamp = [self.lag_tracker.column] if self.lag_tracker is not None else []
+        for col, pairs in groups.items():
+            self._emit("update", [self.primary_key, col] + stamp, pairs)
+
+    def _emit(self, op: str, columns: List[str], rows: Sequence[Sequence]):
+        if not self.sinks:
+            return
+        table_schema = self._table_schema()
+        for sink in self.sinks:
+            sink.write(op, columns, rows, self.schema_version, table_schema)
+
+    def _table_schema(self) -> Optional[Dict[str, str]]:
+        if self.generator is None:
+            return None
+        return {name: col.sql_type for name, col in self.generator.schema.items()}
+
+    def _indexed_columns(self) -> Set[str]:
+        """Columns covered by any index, looked up once per schema version."""
+        if self.workload.indexed_columns is not None:
+            return self.workload.indexed_columns
+        if not self.emit_sql:
+            return set()
+        if self._indexed is None or self._indexed[0] != self.schema_version:
+            with self._transaction("catalog") as conn, conn.cursor() as cur:
+                cur.execute(
+                    "SELECT DISTINCT a.attname FROM pg_index i "
+                    "JOIN pg_attribute a ON a.attrelid = i.indrelid "
+                    "AND a.attnum = ANY(i.indkey) "
+                    "WHERE i.indrelid = %s::regclass",
+                    (f'"{self.schema}"."{self.table_name}"',)
+                )
+                indexed = {row[0] for row in cur.fetchall()}
+            self._indexed = (self.schema_version, indexed)
+        return self._indexed[1]
+
+    def _wal_start(self, cur) -> Optional[int]:
+        every = self.workload.wal_sample_every
+        if not every:
+            return None
+        self._wal_operations += 1
+        if self._wal_operations % every:
+            return None
+        return current_lsn(cur)
+
+    def _wal_end(self, cur, start: Optional[int], op: str, rows: int):
+        if start is None:
+            return
+        written = wal_bytes(start, current_lsn(cur))
+        stats = self.wal_stats.setdefault(op, {"bytes": 0, "rows": 0, "samples": 0})
+        stats["bytes"] += written
+        stats["rows"] += rows
+        stats["samples"] += 1
+        self.metrics.observe(f"wal_bytes_per_row:{op}", written / max(rows, 1))
+
+    def wal_report(self) -> Dict[str, Dict[str, float]]:
+        """Sampled WAL bytes per operation type and per row."""
+        return {
+            op: {**stats, "bytes_per_row": stats["bytes"] / max(stats["rows"], 1)}
+            for op, stats in self.wal_stats.items()
+        }
+
+    def _record_update_statements(self, count: int):
+        self.last_update_statements = count
+        self.total_update_statements += count
+
     def _delete_records(self, ids: List[str]) -> int:
         if not ids:
             return 0
-        
+        if not self.emit_sql:
+            self._emit("delete", [self.primary_key], [(key,) for key in ids])
+            return len(ids)
 
         # Fetch column type from the generator's schema
         pk_col_def = self.generator.schema.get(self.primary_key)
@@ -118,17 +603,151 @@ class MutationEngine:
 
         # Add cast only if UUID
         cast = "::uuid[]" if pk_type == "UUID" else ""
-        query = f'DELETE FROM "{self.schema}"."{self.table_name}" WHERE "{self.primary_key}" = ANY(%s{cast});'  # noqa: E501
-        with self.conn.cursor() as cur:
+        with (
+            self.metrics.timer("delete") as sample,
+            self._transaction("delete") as conn,
+            conn.cursor() as cur,
+        ):
+            if self.use_prepared_statements:
+                name = self._prepared_statement(
+                    cur,
+                    "delete",
+                    self.primary_key,
+                    lambda: sql.SQL("DELETE FROM {}.{} WHERE {} = ANY($1)").format(
+                        sql.Identifier(self.schema),
+                        sql.Identifier(self.table_name),
+                        sql.Identifier(self.primary_key)
+                    )
+                )
+                query = f'EXECUTE "{name}" (%s{cast});'
+            else:
+                query = f'DELETE FROM "{self.schema}"."{self.table_name}" WHERE "{self.primary_key}" = ANY(%s{cast});'  # noqa: E501
 
+            wal_start = self._wal_start(cur)
             cur.execute(query, (ids,))
-            self.conn.commit()
+            self._wal_end(cur, wal_start, "delete", len(ids))
+            sample.rows = len(ids)
+            sample.statements = 1
+            sample.bytes_sent = _last_query_bytes(cur)
 
+        self._emit("delete", [self.primary_key], [(key,) for key in ids])
         return len(ids)
 
+    @contextmanager
+    def _transaction(self, operation: str) -> Iterator:
+        """
+        The connection to run one operation on, inside the open transaction
+        (or a new one), committed afterwards as the policy says.
+        """
+        if self._txn_conn is None:
+            self._txn_conn = acquire(self.conn)
+            if not self.transaction_policy.synchronous_commit:
+                with self._txn_conn.cursor() as cur:
+                    cur.execute("SET LOCAL synchronous_commit = off")
+
+        try:
+            yield self._txn_conn
+        except Exception:
+            self.rollback()
+            raise
+
+        if operation == "insert":
+            self._txn_batches += 1
+        if self.defer_commits:
+            return
+        limit = self.transaction_policy.batches_for(self.total_transactions + 1)
+        if limit is None or self._txn_batches >= limit:
+            self.commit()
+
+    def commit(self):
+        """Commit the open transaction, if any, and release its connection."""
+        conn, self._txn_conn = self._txn_conn, None
+        if conn is None:
+            return
+        self._txn_batches = 0
+        try:
+            conn.commit()
+            self.total_transactions += 1
+        finally:
+            putback(self.conn, conn)
+        if self._pending_keys:
+            self.live_keys.add(self._pending_keys)
+            self._pending_keys = []
+
+    def rollback(self):
+        """Abandon the open transaction; every statement in it is lost."""
+        conn, self._txn_conn = self._txn_conn, None
+        if conn is None:
+            return
+        self._txn_batches = 0
+        self._pending_keys = []
+        try:
+            conn.rollback()
+        finally:
+            putback(self.conn, conn)
+
+    def track_schema(self, manager: SchemaManager):
+        """Follow a SchemaManager's version so prepared statements are
+        invalidated whenever a column is added or dropped. A BatchGenerator
+        is subscribed too, so it generates and updates the current columns."""
+        self.schema_version = manager.schema_version
+        manager.subscribe(self.on_schema_change)
+        if hasattr(self.generator, "track_schema"):
+            self.generator.track_schema(manager)
+
+    def untrack_schema(self, manager: SchemaManager):
+        """Stop following a manager, e.g. when a worker's clone is done."""
+        manager.unsubscribe(self.on_schema_change)
+
+    def on_schema_change(self, manager: SchemaManager):
+        self.schema_version = manager.schema_version
+        self.invalidate_prepared_statements()
+
+    def invalidate_prepared_statements(self):
+        # Deallocated lazily, the next time each connection is used
+        for conn_id, statements in self._prepared.items():
+            self._stale_statements.setdefault(conn_id, []).extend(
+                statements.values()
+            )
+        self._prepared.clear()
+
+    def _prepared_statement(
+        self,
+        cur,
+        operation: str,
+        column: str,
+        build: Callable[[], sql.Composable]
+    ) -> str:
+        """
+        Return the name of a PREPAREd statement for (operation, column,
+        schema_version), preparing it on a cache miss.
+        """
+        conn_id = id(cur.connection)
+        for stale in self._stale_statements.pop(conn_id, []):
+            cur.execute(sql.SQL("DEALLOCATE {}").format(sql.Identifier(stale)))
+
+        cache = self._prepared.setdefault(conn_id, {})
+        key = (operation, column, self.schema_version)
+        name = cache.get(key)
+        if name is not None:
+            self.prepared_hits += 1
+            return name
+
+        self.prepared_misses += 1
+        name = f"kroft_{operation}_{next(_STATEMENT_IDS)}"
+        cur.execute(
+            sql.SQL("PREPARE {} AS {}").format(sql.Identifier(name), build())
+        )
+        cache[key] = name
+        return name
+
     def get_counters(self) -> Dict[str, int]:
         return {
             "total_inserts": self.total_inserts,
             "total_updates": self.total_updates,
             "total_deletes": self.total_deletes,
+            "update_statements": self.total_update_statements,
+            "prepared_hits": self.prepared_hits,
+            "prepared_misses": self.prepared_misses,
+            "transactions": self.total_transactions,
         }
\ No newline at end of file
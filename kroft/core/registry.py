@@ -1,4 +1,4 @@
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Sequence
 
 from kroft.core.column import ColumnDefinition
 
@@ -9,7 +9,13 @@ def register_column(
     sql_type: str,
     constraints: Optional[str] = None,
     reserved: bool = False,
-    protected: bool = False
+    protected: bool = False,
+    batch_generator: Optional[Callable[[int], Sequence[Any]]] = None,
+    pooled: bool = False,
+    pool_size: int = 10_000,
+    pool_mode: Optional[str] = None,
+    pool_background: bool = False,
+    pool_refill_after: Optional[int] = None
 ):
     def decorator(func: Callable[[], object]):
         _COLUMN_REGISTRY[name] = ColumnDefinition(
@@ -18,7 +24,13 @@ def register_column(
             generator=func,
             constraints=constraints,
             reserved=reserved,
-            protected=protected
+            protected=protected,
+            batch_generator=batch_generator,
+            pooled=pooled,
+            pool_size=pool_size,
+            pool_mode=pool_mode,
+            pool_background=pool_background,
+            pool_refill_after=pool_refill_after
         )
         return func
     return decorator
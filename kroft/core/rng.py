@@ -0,0 +1,56 @@
+import hashlib
+import inspect
+import random
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class RandomStreams:
+    """
+    A tree of independent, reproducible random.Random streams.
+
+    Like numpy's SeedSequence, every stream's seed is derived by hashing the
+    root seed together with the stream's path (e.g. ("batch", 42, "column",
+    "price")), so a stream never depends on which other streams were created
+    or in what order. spawn() returns a child tree for a sub-path, which is
+    how workers, batches, columns and the mutation/evolution decisions each
+    get their own state without sharing the global `random` module.
+    """
+
+    def __init__(self, seed: int, path: Tuple[Hashable, ...] = ()):
+        self.seed = seed
+        self.path = path
+        self._streams: Dict[Tuple[Hashable, ...], random.Random] = {}
+
+    def spawn(self, *key: Hashable) -> "RandomStreams":
+        return RandomStreams(self.seed, self.path + key)
+
+    def stream(self, *key: Hashable) -> random.Random:
+        """The stream at path + key, created on first use and then reused."""
+        rng = self._streams.get(key)
+        if rng is None:
+            rng = self._streams[key] = random.Random(self.derive_seed(*key))
+        return rng
+
+    def derive_seed(self, *key: Hashable) -> int:
+        material = repr((self.seed, self.path + key)).encode("utf-8")
+        return int.from_bytes(hashlib.blake2b(material, digest_size=16).digest(), "big")
+
+    def getstate(self) -> Dict[Tuple[Hashable, ...], tuple]:
+        return {key: rng.getstate() for key, rng in self._streams.items()}
+
+    def setstate(self, state: Dict[Tuple[Hashable, ...], tuple]):
+        for key, rng_state in state.items():
+            self.stream(*key).setstate(rng_state)
+
+
+def required_positional_args(fn: Callable) -> int:
+    """Number of required positional parameters, 0 if it can't be inspected."""
+    try:
+        params = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return 0
+    return sum(
+        1 for p in params
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+        and p.default is p.empty
+    )
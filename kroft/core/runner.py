@@ -1,11 +1,36 @@
 # kroft/core/runner.py
 
+import queue
 import random
-from typing import Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+from kroft.core.batch import RowBatch
+from kroft.core.checkpoint import read_checkpoint, write_checkpoint
 from kroft.core.column import ColumnDefinition
+from kroft.core.concurrency import SchemaGate
+from kroft.core.connection import is_pool
+from kroft.core.evolution import EvolutionController
+from kroft.core.load import LoadProfile, LoadScheduler, TokenBucket
+from kroft.core.metrics import Metrics
 from kroft.core.mutator import MutationEngine
+from kroft.core.rng import RandomStreams
 from kroft.core.schema import SchemaManager
+from kroft.core.transactions import TransactionPolicy
 
 
 class SimulationRunner:
@@ -20,8 +45,82 @@ class SimulationRunner:
         evolution_interval: int = 5,
         evolution_probability: float = 0.2,
         add_probability: float = 0.7,
-        protected_columns: set = None
+        protected_columns: set = None,
+        columnar: bool = False,
+        workers: int = 1,
+        connection_factory: Optional[Callable[[], Any]] = None,
+        metrics: Optional[Metrics] = None,
+        report_interval: float = 5.0,
+        load_profile: Optional[LoadProfile] = None,
+        update_profile: Optional[LoadProfile] = None,
+        delete_profile: Optional[LoadProfile] = None,
+        seed: Optional[int] = None,
+        pipeline_depth: int = 0,
+        generator_threads: int = 1,
+        mutation_scope: str = "batch",
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 100,
+        checkpoint_overhead: float = 0.05,
+        evolution: Optional[EvolutionController] = None
     ):
+        """
+        Args:
+            pipeline_depth: When > 0, generate batches ahead on
+                `generator_threads` threads into a queue of this many ready
+                batches that the writers drain, so generating batch N+1
+                overlaps writing batch N. A full queue blocks the generators.
+            mutation_scope: "batch" updates/deletes rows of the batch just
+                inserted; "history" picks them from the mutator's live-key
+                index (MutationEngine(track_keys=True)) across the whole table.
+            checkpoint_path: Checkpoint progress, counters, schema, live-key
+                and rng state to this file so resume() can continue after a
+                crash. The runner then owns commits: engines keep one open
+                transaction between checkpoints (and schema changes), so a
+                crash rolls back exactly the batches the last checkpoint
+                does not cover. Change sinks are not rewound.
+            checkpoint_every: Batches between checkpoints, at least.
+            checkpoint_overhead: Postpone a checkpoint until the time since
+                the last one is at least its cost divided by this, so
+                checkpointing (e.g. a large live-key index) takes at most
+                this fraction of the run.
+            evolution: An EvolutionController to evolve the schema with
+                (at its own evolution_interval) instead of the built-in
+                add/drop; its counters, log and rng are checkpointed.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if mutation_scope not in ("batch", "history"):
+            raise ValueError(
+                f"Unknown mutation scope '{mutation_scope}', "
+                "expected 'batch' or 'history'"
+            )
+        if mutation_scope == "history" and mutator.live_keys is None:
+            raise ValueError(
+                "mutation_scope='history' requires MutationEngine(track_keys=True)"
+            )
+        if pipeline_depth < 0 or generator_threads < 1:
+            raise ValueError(
+                "pipeline_depth must be >= 0 and generator_threads >= 1"
+            )
+        if workers > 1 and connection_factory is None and not is_pool(mutator.conn):
+            raise ValueError(
+                "workers > 1 requires a connection_factory or a pooled mutator"
+            )
+        if checkpoint_every < 1 or not 0 < checkpoint_overhead <= 1:
+            raise ValueError(
+                "checkpoint_every must be >= 1 and checkpoint_overhead in (0, 1]"
+            )
+        policy = getattr(mutator, "transaction_policy", None)
+        if (
+            checkpoint_path is not None
+            and isinstance(policy, TransactionPolicy)
+            and (policy.batches_per_commit is not None or policy.huge_every)
+        ):
+            raise ValueError(
+                "checkpoint_path commits at every checkpoint; it can't be "
+                "combined with TransactionPolicy batches_per_commit/huge_every"
+            )
+
         self.schema_mgr = schema_mgr
         self.mutator = mutator
         self.column_registry = column_registry
@@ -32,57 +131,704 @@ class SimulationRunner:
         self.evolution_probability = evolution_probability
         self.add_probability = add_probability
         self.protected_columns = protected_columns
+        self.columnar = columnar
+        self.workers = workers
+        self.connection_factory = connection_factory
+        self.pipeline_depth = pipeline_depth
+        self.generator_threads = generator_threads
+        self.mutation_scope = mutation_scope
         self.total_batches = total_records // batch_size
+        self.worker_counters: List[Dict[str, int]] = []
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_overhead = checkpoint_overhead
+        self.evolution = evolution
+        # The evolution step a checkpoint was written just ahead of, so that
+        # resume() can tell whether its ALTER TABLE committed
+        self._evolving: Optional[Dict[str, Any]] = None
+
+        # Seeded runs derive every random choice from the batch number (see
+        # RandomStreams), so a batch's rows, mutations and evolution decision
+        # don't depend on which worker claims it or when.
+        self.seed = seed
+        self.streams = RandomStreams(seed) if seed is not None else None
+
+        # Share the mutator's Metrics by default so one snapshot covers
+        # generation, DML and DDL
+        if metrics is None:
+            metrics = getattr(mutator, "metrics", None)
+        self.metrics = metrics if isinstance(metrics, Metrics) else Metrics()
+        self.report_interval = report_interval
+        self._progress_lock = threading.Lock()
+        self._events: List[str] = []
+        self._batches_done = 0
+        self._rows_done = 0
+        self._started = self._last_report = time.perf_counter()
+        self._last_report_rows = 0
+
+        # Paced mode: insert batches follow load_profile (batch_size is then
+        # chosen per batch) and update/delete counts come from their own
+        # token buckets instead of fixed fractions of each batch.
+        self.load_scheduler = (
+            LoadScheduler(load_profile, max_batch_size=batch_size)
+            if load_profile else None
+        )
+        self.update_bucket = (
+            TokenBucket(update_profile, burst_seconds=1.0) if update_profile else None
+        )
+        self.delete_bucket = (
+            TokenBucket(delete_profile, burst_seconds=1.0) if delete_profile else None
+        )
+        self._claim_lock = threading.Lock()
+        # Every engine writing for this run; their open transactions are
+        # committed before DDL so ALTER TABLE never waits on an idle one
+        self._engines: List[MutationEngine] = [mutator]
+        self._engines_lock = threading.Lock()
+        self._batches_claimed = 0
+        self._rows_claimed = 0
+
+        # Committed progress: every batch up to _committed_through, plus any
+        # later ones committed out of order by parallel or pipelined writers.
+        # Batches written since the last commit wait in _written.
+        self._committed_through = 0
+        self._committed_ahead: Set[int] = set()
+        self._rows_committed = 0
+        self._written: List[Tuple[int, int]] = []
+        # Counters of the run a resume() continues
+        self._counters_base: Dict[str, int] = {}
+        self._checkpoint_at = 0.0
+        self._checkpoint_cost = 0.0
+        self._checkpoint_batches = 0
 
     def run(self):
-        for batch_num in range(1, self.total_batches + 1):
-            batch = self._generate_batch()
-            inserted_ids = self.mutator.insert_batch(batch)
-
-            self._maybe_mutate(inserted_ids)
-
-            if (
-                self.enable_schema_evolution 
-                and batch_num % self.evolution_interval == 0
-                ):
-                self._maybe_evolve_schema()
-
-    def _generate_batch(self) -> List[dict]:
-        return [
-            {
-                col: col_def.generate() 
-                for col, col_def in self.schema_mgr.columns.items()
-            }
-            for _ in range(self.batch_size)
-        ]
-
-    def _maybe_mutate(self, ids: List[str]):
-        if not ids:
+        """Run the simulation from the first batch."""
+        self._committed_through = self._rows_committed = 0
+        self._committed_ahead = set()
+        self._written = []
+        self._counters_base = {}
+        self._run()
+
+    def resume(self):
+        """
+        Continue from the checkpoint at checkpoint_path, with a runner, schema
+        manager and mutator built as for the original run. Batches the
+        checkpoint covers are not written again and the rest are, so a
+        seeded run ends with the same rows as an uninterrupted one.
+
+        Schema changes are checkpointed both before and after their ALTER
+        TABLE. Resuming from the first, the table's columns
+        (SchemaManager.reconcile) show whether the change committed; if not,
+        it is made again.
+        """
+        if self.checkpoint_path is None:
+            raise ValueError("resume() needs a checkpoint_path")
+        state = read_checkpoint(self.checkpoint_path)
+        self.setstate(state)
+        if state.get("evolving") is not None:
+            self._finish_evolution(state["evolving"])
+        self._run()
+
+    def _run(self):
+        self._started = self._last_report = time.perf_counter()
+        self._batches_claimed = self._committed_through
+        self._rows_claimed = self._rows_committed
+        self._engines = [self.mutator]
+        if self.checkpoint_path is not None:
+            self.mutator.defer_commits = True
+            self._checkpoint_at = time.perf_counter()
+            self._checkpoint_cost = 0.0
+            self._checkpoint_batches = self._batches_done
+        if self.load_scheduler is not None:
+            self.load_scheduler.start()
+        for bucket in (self.update_bucket, self.delete_bucket):
+            if bucket is not None:
+                bucket.reset()
+        # Whatever the mode, the mutator and its generator follow schema
+        # changes: updates, inserts, sinks and statement caches all need to
+        if hasattr(self.schema_mgr, "subscribe"):
+            self.mutator.track_schema(self.schema_mgr)
+
+        if self.pipeline_depth:
+            self._run_pipelined()
+        elif self.workers > 1:
+            self._run_parallel()
+        else:
+            self._run_serial()
+        self._report_progress(0, force=True)
+
+    def _run_serial(self):
+        # Uncontended; shares the commit/evolve/checkpoint path with workers
+        gate = SchemaGate()
+        while (claim := self._claim_batch()) is not None:
+            batch_num, size = claim
+            streams = self._batch_streams(batch_num)
+            inserted_ids = self._write_batch(self.mutator, size, streams)
+            self._maybe_mutate(
+                inserted_ids, rng=self._stream(streams, "mutation")
+            )
+            self._batch_written(batch_num, size)
+            self._finish_batch(gate, batch_num, streams, inserted_ids)
+        self._commit_on_exit(gate, self.mutator)
+
+    def _run_parallel(self):
+        """
+        Run the simulation on `workers` threads, each with its own connection
+        from connection_factory, or sharing the mutator's connection pool.
+
+        Workers claim batches from a shared counter, so total_records is
+        split between them. Schema evolution goes through a SchemaGate: it
+        waits for in-flight batches to commit and holds new ones back, so DDL
+        never races with DML.
+        """
+        gate = SchemaGate()
+
+        def work() -> Dict[str, int]:
+            with self._worker_engine(gate) as engine:
+                while (claim := self._claim_batch()) is not None:
+                    batch_num, size = claim
+                    streams = self._batch_streams(batch_num)
+                    with gate.dml():
+                        inserted_ids = self._write_batch(engine, size, streams)
+                        self._maybe_mutate(
+                            inserted_ids,
+                            engine,
+                            rng=self._stream(streams, "mutation")
+                        )
+                        self._batch_written(batch_num, size)
+                    self._finish_batch(gate, batch_num, streams, inserted_ids)
+                return engine.get_counters()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(work) for _ in range(self.workers)]
+            self.worker_counters = [future.result() for future in futures]
+
+    def _run_pipelined(self):
+        """
+        Overlap generation and writes: generator threads claim and build
+        batches into a bounded queue, `workers` writers drain it.
+
+        Queue occupancy is sampled into the "pipeline_queue" gauge, and the
+        time each side spends blocked is timed as "queue_put_wait" (writers
+        are the bottleneck) and "queue_get_wait" (generation is). A batch
+        generated before a schema change is regenerated by its writer.
+        """
+        ready: queue.Queue = queue.Queue(maxsize=self.pipeline_depth)
+        gate = SchemaGate()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                while not stop.is_set() and (claim := self._claim_batch()):
+                    batch_num, size = claim
+                    streams = self._batch_streams(batch_num)
+                    version = self._schema_version()
+                    batch = self._next_batch(size, streams)
+                    with self.metrics.timer("queue_put_wait"):
+                        ready.put((batch_num, size, streams, version, batch))
+                    self.metrics.observe("pipeline_queue", ready.qsize())
+            except BaseException:
+                stop.set()
+                raise
+
+        def write() -> Optional[Dict[str, int]]:
+            failure = None
+            with ExitStack() as stack:
+                engine = self.mutator
+                try:
+                    if self.workers > 1:
+                        engine = stack.enter_context(self._worker_engine(gate))
+                except BaseException as exc:
+                    failure = exc
+                    stop.set()
+
+                while True:
+                    with self.metrics.timer("queue_get_wait"):
+                        item = ready.get()
+                    if item is None:
+                        break
+                    self.metrics.observe("pipeline_queue", ready.qsize())
+                    if stop.is_set():
+                        # Keep draining so generators never block on a
+                        # failed writer
+                        continue
+                    try:
+                        self._write_queued(gate, engine, item)
+                    except BaseException as exc:
+                        failure = exc
+                        stop.set()
+
+                if failure is not None:
+                    raise failure
+                if self.workers > 1:
+                    return engine.get_counters()
+                self._commit_on_exit(gate, engine)
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=self.generator_threads + self.workers
+        ) as pool:
+            writers = [pool.submit(write) for _ in range(self.workers)]
+            producers = [
+                pool.submit(produce) for _ in range(self.generator_threads)
+            ]
+            errors = [future.exception() for future in producers]
+            for _ in writers:
+                ready.put(None)
+            counters = [future.result() for future in writers]
+
+        for error in errors:
+            if error is not None:
+                raise error
+        if self.workers > 1:
+            self.worker_counters = counters
+
+    def _write_queued(self, gate: SchemaGate, engine: MutationEngine, item):
+        batch_num, size, streams, version, batch = item
+        with gate.dml():
+            if version != self._schema_version():
+                batch = self._next_batch(size, streams)
+            inserted_ids = self._insert(engine, batch, size)
+            self._maybe_mutate(
+                inserted_ids, engine, rng=self._stream(streams, "mutation")
+            )
+            self._batch_written(batch_num, size)
+        self._finish_batch(gate, batch_num, streams, inserted_ids)
+
+    def _finish_batch(
+        self,
+        gate: SchemaGate,
+        batch_num: int,
+        streams: Optional[RandomStreams],
+        inserted_ids: List[str]
+    ):
+        self._report_progress(len(inserted_ids))
+        interval = (
+            self.evolution.evolution_interval if self.evolution is not None
+            else self.evolution_interval
+        )
+        evolve = self.enable_schema_evolution and batch_num % interval == 0
+        rng = self._stream(streams, "evolution")
+        if self.checkpoint_path is None:
+            if evolve:
+                with gate.ddl():
+                    self._commit_engines()
+                    self._maybe_evolve_schema(batch_num, rng)
             return
 
-        update_count = int(len(ids) * 0.2)
-        delete_count = int(len(ids) * 0.1)
+        # Every commit is paired with a checkpoint here, so only commit for
+        # DDL that will actually run
+        action = self._evolution_action(batch_num, rng) if evolve else None
+        if action is not None or self._checkpoint_due():
+            with gate.ddl():
+                if action is not None:
+                    # Checkpoint ahead of the DDL too, marking the step in
+                    # flight: a crash before the next one can't lose it
+                    self._evolving = {"batch": batch_num, "action": action}
+                    self._checkpoint(force=True)
+                    self._evolve(action, rng)
+                    self._evolving = None
+                self._checkpoint(force=action is not None)
+
+    def _commit_engines(self):
+        # Callers hold gate.ddl(): writers are all outside gate.dml(), so
+        # their engines can be committed from this thread
+        with self._engines_lock:
+            engines = list(self._engines)
+        for engine in engines:
+            engine.commit()
 
-        update_ids = random.sample(ids, k=update_count) if update_count else []
-        
-        if delete_count:
-            eligible = [i for i in ids if i not in update_ids]
-            delete_ids = random.sample(eligible, k=delete_count)
+    def _commit_on_exit(self, gate: SchemaGate, engine: MutationEngine):
+        """A writer is done: commit its engine, or checkpoint everything."""
+        if self.checkpoint_path is None:
+            with gate.dml():
+                engine.commit()
         else:
-            delete_ids = []
+            with gate.ddl():
+                self._checkpoint(force=True)
 
-        self.mutator._update_records(update_ids)
-        self.mutator._delete_records(delete_ids)
+    def _batch_written(self, batch_num: int, size: int):
+        """Record a fully written batch; called inside gate.dml()."""
+        if self.checkpoint_path is not None:
+            with self._progress_lock:
+                self._written.append((batch_num, size))
 
-    def _maybe_evolve_schema(self):
-        if random.random() > self.evolution_probability:
+    def _checkpoint_due(self) -> bool:
+        if self.checkpoint_path is None:
+            return False
+        with self._progress_lock:
+            batches = self._batches_done - self._checkpoint_batches
+        if batches < self.checkpoint_every:
+            return False
+        elapsed = time.perf_counter() - self._checkpoint_at
+        return elapsed >= self._checkpoint_cost / self.checkpoint_overhead
+
+    def _checkpoint(self, force: bool = False):
+        """
+        Commit every engine, mark the batches written so far committed and
+        write the checkpoint. Callers hold gate.ddl(), so no batch is
+        half-written.
+        """
+        if not force and not self._checkpoint_due():
             return
+        started = time.perf_counter()
+        with self.metrics.timer("checkpoint") as sample:
+            self._commit_engines()
+            with self._progress_lock:
+                written, self._written = self._written, []
+                batches_done = self._batches_done
+            for batch_num, size in written:
+                self._committed_ahead.add(batch_num)
+                self._rows_committed += size
+            while self._committed_through + 1 in self._committed_ahead:
+                self._committed_through += 1
+                self._committed_ahead.discard(self._committed_through)
+            sample.rows = len(written)
+            sample.bytes_sent = write_checkpoint(self.checkpoint_path, self.getstate())
+        self._checkpoint_at = time.perf_counter()
+        self._checkpoint_cost = self._checkpoint_at - started
+        self._checkpoint_batches = batches_done
+
+    def getstate(self) -> Dict[str, Any]:
+        """
+        Committed progress, counters and the schema, live-key and rng state
+        a checkpoint holds; see resume().
+        """
+        live_keys = self.mutator.live_keys
+        with self._engines_lock:
+            engines = list(self._engines)
+        return {
+            "total_records": self.total_records,
+            "batch_size": self.batch_size,
+            "seed": self.seed,
+            "committed_through": self._committed_through,
+            "committed_ahead": sorted(self._committed_ahead),
+            "rows_committed": self._rows_committed,
+            "counters": self._sum_counters(e.get_counters() for e in engines),
+            "schema": self.schema_mgr.getstate(),
+            "live_keys": live_keys.getstate() if live_keys is not None else None,
+            "rngs": {name: rng.getstate() for name, rng in self._rngs().items()},
+            "evolution": (
+                self.evolution.getstate() if self.evolution is not None else None
+            ),
+            "evolving": self._evolving,
+        }
+
+    def setstate(self, state: Dict[str, Any]):
+        for key in ("total_records", "batch_size", "seed"):
+            if state[key] != getattr(self, key):
+                raise ValueError(
+                    f"The checkpoint was taken with {key}={state[key]!r}, "
+                    f"not {getattr(self, key)!r}"
+                )
+        live_keys = self.mutator.live_keys
+        if state["live_keys"] is not None and live_keys is None:
+            raise ValueError(
+                "The checkpoint holds live keys; resume with "
+                "MutationEngine(track_keys=True)"
+            )
+
+        self._committed_through = state["committed_through"]
+        self._committed_ahead = set(state["committed_ahead"])
+        self._rows_committed = state["rows_committed"]
+        self._written = []
+        self._counters_base = dict(state["counters"])
+        self._batches_done = self._committed_through + len(self._committed_ahead)
+        self._rows_done = self._last_report_rows = self._rows_committed
+        self.schema_mgr.setstate(state["schema"], self.column_registry)
+        if state["live_keys"] is not None:
+            live_keys.setstate(state["live_keys"])
+        rngs = self._rngs()
+        for name, rng_state in state["rngs"].items():
+            if name in rngs:
+                rngs[name].setstate(rng_state)
+        if self.evolution is not None and state.get("evolution") is not None:
+            self.evolution.setstate(state["evolution"])
+
+    def _finish_evolution(self, evolving: Dict[str, Any]):
+        """
+        The checkpoint was written just ahead of an evolution step's ALTER
+        TABLE. Keep the step if the table shows it committed, otherwise run
+        it again, drawing as the crashed run did.
+        """
+        changes = self.schema_mgr.reconcile()
+        if changes:
+            for action, column in changes:
+                if self.evolution is not None:
+                    self.evolution.record(action, column)
+                self._record_change(action, column)
+        else:
+            rng = self._stream(self._batch_streams(evolving["batch"]), "evolution")
+            if rng is not None and self.evolution is None:
+                # Replays the add/drop draw, leaving rng where the DDL used it
+                self._evolution_action(evolving["batch"], rng)
+            self._evolve(evolving["action"], rng)
+        self._checkpoint(force=True)
+
+    def _rngs(self) -> Dict[str, random.Random]:
+        """
+        Stateful rngs outside the per-batch streams, which seeded runs
+        rederive from the batch number instead.
+        """
+        rngs = {
+            "mutator": getattr(self.mutator, "rng", None),
+            "schema": getattr(self.schema_mgr, "rng", None),
+        }
+        return {
+            name: rng for name, rng in rngs.items()
+            if isinstance(rng, random.Random)
+        }
+
+    @contextmanager
+    def _worker_engine(self, gate: SchemaGate) -> Iterator[MutationEngine]:
+        """
+        A clone of the mutator on the worker's own connection, following the
+        schema manager while the worker runs, its open transaction committed
+        on the way out.
+        """
+        # A pooled mutator is shared as-is: workers check out per batch
+        if self.connection_factory is not None:
+            conn = self.connection_factory()
+        else:
+            conn = self.mutator.conn
+        engine = self.mutator.clone(conn)
+        # Sinks, prepared statements and the indexed-column cache all key
+        # off the engine's schema_version
+        tracks = hasattr(self.schema_mgr, "subscribe")
+        if tracks:
+            engine.track_schema(self.schema_mgr)
+        with self._engines_lock:
+            self._engines.append(engine)
+        try:
+            yield engine
+            self._commit_on_exit(gate, engine)
+        finally:
+            if tracks:
+                engine.untrack_schema(self.schema_mgr)
+            if self.connection_factory is not None:
+                conn.close()
+
+    def _schema_version(self):
+        return getattr(self.schema_mgr, "schema_version", None)
+
+    def get_counters(self) -> Dict[str, int]:
+        """Counters summed across all workers (or the single mutator)."""
+        if not self.worker_counters and not self._counters_base:
+            return self.mutator.get_counters()
+        return self._sum_counters(
+            self.worker_counters or [self.mutator.get_counters()]
+        )
+
+    def _sum_counters(self, counters: Iterable[Dict[str, int]]) -> Dict[str, int]:
+        # Counters restored by resume() are the starting point
+        totals = dict(self._counters_base)
+        for worker in counters:
+            for key, value in worker.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def _claim_batch(self) -> Optional[Tuple[int, int]]:
+        """Claim the next (batch number, batch size), or None when done."""
+        with self._claim_lock:
+            batch_num = self._batches_claimed + 1
+            # After resume(), batches committed out of order are not redone
+            while batch_num in self._committed_ahead:
+                batch_num += 1
+            if self.load_scheduler is None:
+                if batch_num > self.total_batches:
+                    return None
+                size = self.batch_size
+            else:
+                remaining = self.total_records - self._rows_claimed
+                if remaining <= 0:
+                    return None
+                size = min(self.load_scheduler.next_batch_size(), remaining)
+
+            self._batches_claimed = batch_num
+            self._rows_claimed += size
+            return batch_num, size
+
+    def _batch_streams(self, batch_num: int) -> Optional[RandomStreams]:
+        if self.streams is None:
+            return None
+        return self.streams.spawn("batch", batch_num)
+
+    @staticmethod
+    def _stream(streams: Optional[RandomStreams], name: str):
+        return streams.stream(name) if streams is not None else None
+
+    def _write_batch(
+        self,
+        mutator: MutationEngine,
+        size: int,
+        streams: Optional[RandomStreams] = None
+    ) -> List[str]:
+        return self._insert(mutator, self._next_batch(size, streams), size)
+
+    def _insert(self, mutator: MutationEngine, batch, size: int) -> List[str]:
+        if self.load_scheduler is not None:
+            self.load_scheduler.wait(size)
+        inserted_ids = mutator.insert_batch(batch)
+        if self.load_scheduler is not None:
+            self.load_scheduler.record(len(inserted_ids))
+        return inserted_ids
+
+    def _next_batch(
+        self, size: Optional[int] = None, streams: Optional[RandomStreams] = None
+    ):
+        size = size or self.batch_size
+        with self.metrics.timer("generate") as sample:
+            batch = (
+                self._generate_columns(size, streams) if self.columnar
+                else self._generate_batch(size, streams)
+            )
+            sample.rows = size
+        return batch
+
+    def load_report(self) -> Dict[str, Dict[str, float]]:
+        """Achieved vs requested rates for every paced operation."""
+        report = {}
+        if self.load_scheduler is not None:
+            report["insert"] = self.load_scheduler.report()
+        for operation, bucket in (
+            ("update", self.update_bucket), ("delete", self.delete_bucket)
+        ):
+            if bucket is not None:
+                elapsed = max(bucket.elapsed(), 1e-9)
+                report[operation] = {
+                    "elapsed_s": elapsed,
+                    "achieved_rows": bucket.granted,
+                    "achieved_rate": bucket.granted / elapsed,
+                    "current_target_rate": bucket.current_rate(),
+                }
+        return report
+
+    def _report_progress(self, rows: int, force: bool = False):
+        """
+        Print a rolling throughput line at most every report_interval seconds.
+        """
+        with self._progress_lock:
+            if rows:
+                self._batches_done += 1
+                self._rows_done += rows
+
+            now = time.perf_counter()
+            window = now - self._last_report
+            if not force and window < self.report_interval:
+                return
+
+            window_rate = (self._rows_done - self._last_report_rows) / max(window, 1e-9)
+            average_rate = self._rows_done / max(now - self._started, 1e-9)
+            batches = f"{self._batches_done}/{self.total_batches}"
+            target = ""
+            if self.load_scheduler is not None:
+                # Batch sizes vary with the profile, so there is no fixed total
+                batches = str(self._batches_done)
+                target = (
+                    f" target {self.load_scheduler.bucket.current_rate():,.0f}"
+                )
+            events = f" | {', '.join(self._events)}" if self._events else ""
+            print(
+                f"[{batches} batches] "
+                f"{self._rows_done:,} rows | {window_rate:,.0f} rows/s "
+                f"(avg {average_rate:,.0f}{target}){events}"
+            )
+
+            self._last_report = now
+            self._last_report_rows = self._rows_done
+            self._events.clear()
+
+    def _record_change(self, action: str, column: str):
+        prefix = "+" if action.startswith("add") else "-" if action == "drop" else "~"
+        self._record_event(f"{prefix}{column}")
+
+    def _record_event(self, event: str):
+        with self._progress_lock:
+            self._events.append(event)
+
+    def _generate_batch(
+        self, size: Optional[int] = None, streams: Optional[RandomStreams] = None
+    ) -> List[dict]:
+        return RowBatch.from_columns(self._generate_columns(size, streams)).to_dicts()
+
+    def _generate_columns(
+        self, size: Optional[int] = None, streams: Optional[RandomStreams] = None
+    ) -> Dict[str, Sequence[Any]]:
+        size = size or self.batch_size
+        # One immutable view, so a concurrent schema change can't land mid-batch
+        view = self.schema_mgr.view
+        return {
+            col: col_def.generate_many(size, self._stream_for_column(streams, col))
+            for col, col_def in view.active.items()
+        }
+
+    @staticmethod
+    def _stream_for_column(streams: Optional[RandomStreams], column: str):
+        return streams.stream("column", column) if streams is not None else None
+
+    def _maybe_mutate(
+        self,
+        ids: List[str],
+        mutator: Optional[MutationEngine] = None,
+        rng: Optional[random.Random] = None
+    ):
+        if not ids:
+            return
+        mutator = mutator or self.mutator
+        sampler = rng or random
+
+        if self.update_bucket is not None:
+            update_count = self.update_bucket.take(len(ids))
+        else:
+            update_count = int(len(ids) * 0.2)
+        if self.delete_bucket is not None:
+            delete_count = self.delete_bucket.take(len(ids) - update_count)
+        else:
+            delete_count = int(len(ids) * 0.1)
+
+        if self.mutation_scope == "history":
+            # Deleted keys leave the index first, so updates never target them
+            delete_ids = mutator.live_keys.take(delete_count, rng)
+            update_ids = mutator.live_keys.sample(update_count, rng)
+        else:
+            # One draw split in two keeps updates and deletes disjoint
+            picked = sampler.sample(ids, k=update_count + delete_count)
+            update_ids = picked[:update_count]
+            delete_ids = picked[update_count:]
+
+        mutator.total_updates += mutator._update_records(update_ids, rng)
+        mutator.total_deletes += mutator._delete_records(delete_ids)
+
+    def _maybe_evolve_schema(
+        self, batch_num: int, rng: Optional[random.Random] = None
+    ):
+        action = self._evolution_action(batch_num, rng)
+        if action is not None:
+            self._evolve(action, rng)
+
+    def _evolution_action(
+        self, batch_num: int, rng: Optional[random.Random] = None
+    ) -> Optional[str]:
+        """"add", "drop", "controller" or None (no evolution this time)."""
+        if self.evolution is not None:
+            return "controller" if self.evolution.should_evolve(batch_num) else None
+        decide = rng or random
+        if decide.random() > self.evolution_probability:
+            return None
+        return "add" if decide.random() < self.add_probability else "drop"
 
-        if random.random() < self.add_probability:
-            added = self.schema_mgr.add_column(self.column_registry)
+    def _evolve(self, action: str, rng: Optional[random.Random] = None):
+        if action == "controller":
+            logged = len(self.evolution.evolution_log)
+            self.evolution.evolve_now()
+            for entry in self.evolution.evolution_log[logged:]:
+                self._record_change(entry["action"], entry["column"])
+        elif action == "add":
+            added = self.schema_mgr.add_column(self.column_registry, rng=rng)
             if added:
-                print(f"🟢 Added column: {added}")
+                self._record_event(f"+{added}")
         else:
-            dropped = self.schema_mgr.drop_column(self.protected_columns or set())
+            dropped = self.schema_mgr.drop_column(
+                self.protected_columns or set(), rng=rng
+            )
             if dropped:
-                print(f"🔴 Dropped column: {dropped}")
\ No newline at end of file
+                self._record_event(f"-{dropped}")
\ No newline at end of file
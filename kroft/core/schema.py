@@ -1,7 +1,65 @@
+import copy
+import json
 import random
-from typing import Dict, List, Optional, Set
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from psycopg2 import errors
 
 from kroft.core.column import ColumnDefinition
+from kroft.core.connection import DDL_CONNECTION_KEY, checkout, release
+from kroft.core.ddl import (
+    TYPE_CHANGES,
+    DDLPolicy,
+    base_type,
+    default_is_volatile,
+    type_change_rewrites,
+)
+from kroft.core.metrics import Metrics
+from kroft.core.wal import current_lsn, wal_bytes
+
+# Actions apply_action() understands. Those after "drop" go beyond
+# reserved/protected bookkeeping and are what CDC connectors struggle with.
+EVOLUTION_ACTIONS = (
+    "add",
+    "add_with_default",
+    "add_with_volatile_default",
+    "drop",
+    "alter_type",
+    "rename",
+    "set_default",
+)
+
+ColumnDefault = Union[str, Callable[[ColumnDefinition], str], None]
+
+
+class SchemaView:
+    """
+    A SchemaManager's columns as of one schema version, precomputed so hot
+    paths (batch generation, updates, evolution decisions) never rescan the
+    column registry. Views are rebuilt once per version, never mutated, and
+    fix the column order for that version.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        columns: Dict[str, ColumnDefinition],
+        active_columns: Dict[str, ColumnDefinition]
+    ):
+        self.version = version
+        self.active: Dict[str, ColumnDefinition] = dict(active_columns)
+        self.active_names: Tuple[str, ...] = tuple(self.active)
+        # Reserved columns that have not been added yet
+        self.reserved_available: Tuple[str, ...] = tuple(
+            name for name, col in columns.items()
+            if col.reserved and name not in self.active
+        )
+        self.droppable: Tuple[str, ...] = tuple(
+            name for name, col in self.active.items() if not col.protected
+        )
+        # Added reserved columns are real columns now, so they can be updated
+        self.modifiable = self.droppable
 
 
 class SchemaManager:
@@ -10,9 +68,35 @@ class SchemaManager:
         conn,
         schema: str,
         table_name: str,
-        columns: Dict[str, ColumnDefinition]
+        columns: Dict[str, ColumnDefinition],
+        ddl_conn=None,
+        metrics: Optional[Metrics] = None,
+        rng: Optional[random.Random] = None,
+        ddl_policy: Optional[DDLPolicy] = None,
+        measure_ddl: bool = False
     ):
+        """
+        Args:
+            conn: A psycopg2 connection or connection pool.
+            ddl_conn: Optional dedicated connection for DDL. With a pool and no
+                ddl_conn, one pooled connection is reserved for DDL so ALTER
+                TABLE never queues behind a DML transaction on the same session.
+            metrics: Optional Metrics instance that DDL timings are recorded to.
+            rng: Optional random.Random used to pick columns to add or drop,
+                so evolution can be replayed from a seed.
+            ddl_policy: lock_timeout and retry settings for ALTER TABLE.
+            measure_ddl: Also record, per ALTER TABLE, the WAL bytes written
+                (which include concurrent writers' WAL) and whether the
+                table was actually rewritten (its relfilenode changed).
+        """
         self.conn = conn
+        self.ddl_conn = ddl_conn
+        self.metrics = metrics or Metrics()
+        self.rng = rng
+        self.ddl_policy = ddl_policy or DDLPolicy()
+        self.measure_ddl = measure_ddl
+        # One entry per ALTER TABLE: lock wait vs execution time, attempts
+        self.ddl_log: List[Dict] = []
         self.schema = schema
         self.table_name = table_name
         self.columns = columns
@@ -24,6 +108,8 @@ class SchemaManager:
 
         self.schema_version = 1
         self.schema_history: List[Set[str]] = [set(self.active_columns.keys())]
+        self._subscribers: List[Callable[["SchemaManager"], None]] = []
+        self.view = SchemaView(self.schema_version, columns, self.active_columns)
 
     def create_table(self):
         ddl_statements = [
@@ -37,9 +123,7 @@ class SchemaManager:
         );
         """
 
-        with self.conn.cursor() as cur:
-            cur.execute(ddl.strip())
-            self.conn.commit()
+        self._execute_ddl(ddl.strip())
 
     def get_create_table_sql(self) -> str:
         ddl_statements = [col.ddl() for col in self.active_columns.values()]
@@ -53,58 +137,292 @@ class SchemaManager:
 
     def drop_table(self):
         ddl = f"DROP TABLE IF EXISTS {self.schema}.{self.table_name};"
-        with self.conn.cursor() as cur:
-            cur.execute(ddl)
-            self.conn.commit()
+        self._execute_ddl(ddl)
 
     def get_active_columns(self) -> Dict[str, ColumnDefinition]:
         return self.active_columns
 
-    def add_column(self) -> Optional[str]:
+    def add_column(
+        self,
+        registry: Optional[Dict[str, ColumnDefinition]] = None,
+        rng: Optional[random.Random] = None,
+        default: ColumnDefault = None
+    ) -> Optional[str]:
         """
         Promote a reserved column from registry to active schema and evolve the DB.
+
+        Args:
+            registry: Column definitions to choose from instead of self.columns;
+                the chosen one is registered with this manager.
+            rng: Overrides the manager's rng for this choice.
+            default: Optional DEFAULT expression, or a function building one
+                from the chosen column.
         """
-        available = [
-            name for name, col in self.columns.items()
-            if col.reserved and name not in self.active_columns
-        ]
-        if not available:
-            return None
+        added, _ = self.alter_columns(
+            add=1, registry=registry, rng=rng, default=default
+        )
+        return added[0] if added else None
 
-        chosen_key = random.choice(available)
-        col_def = self.columns[chosen_key]
-        ddl = f"ALTER TABLE {self.schema}.{self.table_name} ADD COLUMN {col_def.ddl()};"
+    def drop_column(
+        self,
+        protected: Optional[Iterable[str]] = None,
+        rng: Optional[random.Random] = None,
+        column: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Drop a random column that is not protected from the physical table 
+        and update active schema.
 
-        with self.conn.cursor() as cur:
-            cur.execute(ddl)
-            self.conn.commit()
+        Args:
+            protected: Extra column names that must not be dropped.
+            rng: Overrides the manager's rng for this choice.
+            column: Drop this column instead of a random one.
+        """
+        if column is not None:
+            _, dropped = self.alter_columns(drop_columns=[column])
+        else:
+            _, dropped = self.alter_columns(drop=1, protected=protected, rng=rng)
+        return dropped[0] if dropped else None
+
+    def alter_columns(
+        self,
+        add: int = 0,
+        drop: int = 0,
+        registry: Optional[Dict[str, ColumnDefinition]] = None,
+        protected: Optional[Iterable[str]] = None,
+        rng: Optional[random.Random] = None,
+        default: ColumnDefault = None,
+        drop_columns: Optional[Iterable[str]] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Add up to `add` reserved columns and drop up to `drop` unprotected
+        ones in a single ALTER TABLE, so the table is locked once.
+        `drop_columns` names the columns to drop instead.
+
+        Returns the (added, dropped) column names.
+        """
+        rng = rng or self.rng or random
+        available = self.action_candidates("add", registry)
+        registry = self.columns if registry is None else registry
+        added = _pick(rng, available, add)
+        if drop_columns is not None:
+            dropped = list(drop_columns)
+        else:
+            candidates = self.action_candidates("drop", protected=protected)
+            dropped = _pick(rng, candidates, drop)
+        if not added and not dropped:
+            return [], []
+
+        actions, kinds = [], []
+        rewrite = False
+        for name in added:
+            expression = default(registry[name]) if callable(default) else default
+            if expression is None:
+                actions.append(f"ADD COLUMN {registry[name].ddl()}")
+                kinds.append("add")
+            else:
+                actions.append(
+                    f"ADD COLUMN {registry[name].ddl()} DEFAULT {expression}"
+                )
+                kinds.append("add_with_default")
+                rewrite = rewrite or default_is_volatile(expression)
+        actions += [f"DROP COLUMN {name}" for name in dropped]
+        kinds += ["drop"] * len(dropped)
+        self._execute_alter(", ".join(actions), kinds, rewrite)
 
-        self.active_columns[chosen_key] = col_def
+        for name in added:
+            self.register_column(name, registry[name])
+            self.active_columns[name] = registry[name]
+        for name in dropped:
+            del self.active_columns[name]
         self._bump_version()
-        return chosen_key
+        return added, dropped
 
-    def drop_column(self) -> Optional[str]:
+    def alter_column_type(
+        self,
+        column: Optional[str] = None,
+        new_type: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> Optional[str]:
         """
-        Drop a random column that is not protected from the physical table 
-        and update active schema.
+        ALTER COLUMN ... TYPE, by default widening a random unprotected column
+        along TYPE_CHANGES. Returns the column name.
         """
-        candidates = [
-            name for name, col in self.active_columns.items()
-            if not col.protected
-        ]
-        if not candidates:
-            return None
+        rng = rng or self.rng or random
+        if column is None:
+            candidates = self.action_candidates("alter_type")
+            if not candidates:
+                return None
+            column = rng.choice(candidates)
+        col_def = self.active_columns[column]
+        if new_type is None:
+            new_type = rng.choice(TYPE_CHANGES[base_type(col_def.sql_type)])
 
-        chosen_key = random.choice(candidates)
-        ddl = f"ALTER TABLE {self.schema}.{self.table_name} DROP COLUMN {chosen_key};"
+        self._execute_alter(
+            f"ALTER COLUMN {column} TYPE {new_type} USING {column}::{new_type}",
+            ["alter_type"],
+            type_change_rewrites(col_def.sql_type, new_type)
+        )
+        self._redefine(column, column, new_type)
+        self._bump_version()
+        return column
 
-        with self.conn.cursor() as cur:
-            cur.execute(ddl)
-            self.conn.commit()
+    def rename_column(
+        self,
+        column: Optional[str] = None,
+        new_name: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> Optional[str]:
+        """RENAME COLUMN (a catalog-only change). Returns the new name."""
+        rng = rng or self.rng or random
+        if column is None:
+            candidates = self.action_candidates("rename")
+            if not candidates:
+                return None
+            column = rng.choice(candidates)
+        if new_name is None:
+            new_name = f"{column}_v{self.schema_version + 1}"
+            while new_name in self.columns:
+                new_name += "_"
 
-        del self.active_columns[chosen_key]
+        self._execute_alter(f"RENAME COLUMN {column} TO {new_name}", ["rename"])
+        self._redefine(column, new_name, self.active_columns[column].sql_type)
         self._bump_version()
-        return chosen_key
+        return new_name
+
+    def set_column_default(
+        self,
+        column: Optional[str] = None,
+        default: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> Optional[str]:
+        """
+        ALTER COLUMN ... SET DEFAULT, by default to a freshly generated
+        value. Only affects future inserts, so it never rewrites the table.
+        """
+        rng = rng or self.rng or random
+        if column is None:
+            candidates = self.action_candidates("set_default")
+            if not candidates:
+                return None
+            column = rng.choice(candidates)
+        col_def = self.active_columns[column]
+        if default is None:
+            default = sql_literal(col_def.generate(), col_def.sql_type)
+
+        self._execute_alter(
+            f"ALTER COLUMN {column} SET DEFAULT {default}", ["set_default"]
+        )
+        self._bump_version()
+        return column
+
+    def action_candidates(
+        self,
+        action: str,
+        registry: Optional[Dict[str, ColumnDefinition]] = None,
+        protected: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Columns an evolution action could currently be applied to."""
+        if action not in EVOLUTION_ACTIONS:
+            raise ValueError(
+                f"Unknown evolution action '{action}', "
+                f"expected one of {EVOLUTION_ACTIONS}"
+            )
+        if action.startswith("add"):
+            if registry is None:
+                return list(self.view.reserved_available)
+            return [
+                name for name, col in registry.items()
+                if col.reserved and name not in self.active_columns
+            ]
+
+        candidates = list(self.view.droppable)
+        if protected:
+            protected = set(protected)
+            candidates = [name for name in candidates if name not in protected]
+        if action == "alter_type":
+            candidates = [
+                name for name in candidates
+                if base_type(self.active_columns[name].sql_type) in TYPE_CHANGES
+            ]
+        return candidates
+
+    def apply_action(
+        self,
+        action: str,
+        registry: Optional[Dict[str, ColumnDefinition]] = None,
+        protected: Optional[Iterable[str]] = None,
+        rng: Optional[random.Random] = None
+    ) -> Optional[str]:
+        """
+        Apply one of EVOLUTION_ACTIONS to a random eligible column and return
+        that column's (new) name, or None if nothing was eligible.
+        """
+        if action == "add":
+            return self.add_column(registry, rng)
+        if action == "add_with_default":
+            return self.add_column(
+                registry,
+                rng,
+                default=lambda col: sql_literal(col.generate(), col.sql_type)
+            )
+        if action == "add_with_volatile_default":
+            # random() makes the default volatile, forcing a table rewrite
+            return self.add_column(
+                registry,
+                rng,
+                default=lambda col: (
+                    "CASE WHEN random() >= 0 THEN "
+                    f"{sql_literal(col.generate(), col.sql_type)} END"
+                )
+            )
+
+        candidates = self.action_candidates(action, registry, protected)
+        if not candidates:
+            return None
+        column = (rng or self.rng or random).choice(candidates)
+        if action == "drop":
+            return self.drop_column(column=column)
+        if action == "alter_type":
+            return self.alter_column_type(column, rng=rng)
+        if action == "rename":
+            return self.rename_column(column, rng=rng)
+        return self.set_column_default(column, rng=rng)
+
+    def reconcile(self) -> List[Tuple[str, str]]:
+        """
+        Bring the tracked schema in line with the table's actual columns, e.g.
+        after a crash between an ALTER TABLE commit and the checkpoint that
+        would have recorded it. Returns the ("add" | "drop" | "rename", column)
+        changes found; a rename pairs a vanished column with an unregistered
+        new one. Type and default changes can't be seen this way.
+        """
+        with self._ddl_connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = %s AND table_name = %s "
+                "ORDER BY ordinal_position",
+                (self.schema, self.table_name)
+            )
+            actual = [row[0] for row in cur.fetchall()]
+            conn.commit()
+
+        missing = [name for name in self.active_columns if name not in actual]
+        unknown = [name for name in actual if name not in self.columns]
+        changes: List[Tuple[str, str]] = []
+        for old, new in zip(missing, unknown):
+            self._redefine(old, new, self.active_columns[old].sql_type)
+            changes.append(("rename", new))
+        for name in missing[len(unknown):]:
+            del self.active_columns[name]
+            changes.append(("drop", name))
+        for name in actual:
+            if name in self.columns and name not in self.active_columns:
+                self.active_columns[name] = self.columns[name]
+                changes.append(("add", name))
+        if changes:
+            self._bump_version()
+        return changes
 
     def register_column(self, name: str, col_def: ColumnDefinition) -> bool:
         """
@@ -113,8 +431,221 @@ class SchemaManager:
         if name in self.columns:
             return False
         self.columns[name] = col_def
+        self._refresh_view()
         return True
 
+    def _execute_ddl(self, ddl: str):
+        with (
+            self.metrics.timer("ddl") as sample,
+            self._ddl_connection() as conn,
+            conn.cursor() as cur,
+        ):
+            cur.execute(ddl)
+            conn.commit()
+            sample.statements = 1
+            sample.bytes_sent = len(ddl)
+
+    def _execute_alter(
+        self,
+        actions: str,
+        kinds: Iterable[str] = (),
+        predicted_rewrite: bool = False
+    ):
+        """
+        Run ALTER TABLE under the DDL policy, timing the wait for the table's
+        ACCESS EXCLUSIVE lock (an explicit LOCK TABLE) apart from the ALTER.
+
+        `kinds` and `predicted_rewrite` classify the actions for ddl_log;
+        with measure_ddl the actual rewrite and WAL volume are logged too.
+        """
+        table = f"{self.schema}.{self.table_name}"
+        ddl = f"ALTER TABLE {table} {actions};"
+        policy = self.ddl_policy
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_started = time.perf_counter()
+            try:
+                with (
+                    self.metrics.timer("ddl") as sample,
+                    self._ddl_connection() as conn,
+                    conn.cursor() as cur,
+                ):
+                    if policy.lock_timeout is not None:
+                        timeout_ms = max(int(policy.lock_timeout * 1000), 1)
+                        cur.execute(f"SET LOCAL lock_timeout = '{timeout_ms}ms'")
+                    started = time.perf_counter()
+                    cur.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+                    locked = time.perf_counter()
+                    if self.measure_ddl:
+                        filenode, start_lsn = self._table_state(cur)
+                    cur.execute(ddl)
+                    if self.measure_ddl:
+                        # Read before COMMIT so the session isn't left in a
+                        # new transaction; misses only the commit record
+                        new_filenode, end_lsn = self._table_state(cur)
+                    conn.commit()
+                    finished = time.perf_counter()
+                    sample.statements = 1
+                    sample.bytes_sent = len(ddl)
+                break
+            except errors.LockNotAvailable:
+                conn.rollback()
+                self.metrics.record(
+                    "ddl_lock_timeout", time.perf_counter() - attempt_started
+                )
+                if attempt > policy.max_retries:
+                    raise
+                time.sleep(policy.delay(attempt))
+
+        self.metrics.record("ddl_lock_wait", locked - started)
+        self.metrics.record("ddl_execute", finished - locked)
+        entry = {
+            "ddl": ddl,
+            "actions": list(kinds),
+            "predicted_rewrite": predicted_rewrite,
+            "lock_wait_s": locked - started,
+            "execute_s": finished - locked,
+            "attempts": attempt,
+        }
+        if self.measure_ddl:
+            entry["rewrote"] = new_filenode != filenode
+            entry["wal_bytes"] = wal_bytes(start_lsn, end_lsn)
+            self.metrics.record(
+                "ddl_rewrite" if entry["rewrote"] else "ddl_catalog_only",
+                finished - locked,
+                bytes_sent=entry["wal_bytes"]
+            )
+        self.ddl_log.append(entry)
+
+    def _table_state(self, cur) -> Tuple[Any, int]:
+        """The table's relfilenode and the current WAL position."""
+        cur.execute(
+            "SELECT pg_relation_filenode(%s::regclass)",
+            (f"{self.schema}.{self.table_name}",)
+        )
+        filenode = cur.fetchone()[0]
+        return filenode, current_lsn(cur)
+
+    def _ddl_connection(self):
+        if self.ddl_conn is not None:
+            return checkout(self.ddl_conn)
+        return checkout(self.conn, key=DDL_CONNECTION_KEY)
+
+    def close(self):
+        """Return the reserved DDL connection to the pool, if any."""
+        if self.ddl_conn is None:
+            release(self.conn, DDL_CONNECTION_KEY)
+
+    def subscribe(self, callback: Callable[["SchemaManager"], None]):
+        """
+        Register a callback invoked with this manager after every schema change.
+        Registering the same callback again is a no-op.
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[["SchemaManager"], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def getstate(self) -> Dict[str, Any]:
+        """The evolved schema, for a checkpoint (see setstate)."""
+        return {
+            "columns": [(name, col.sql_type) for name, col in self.columns.items()],
+            "active": list(self.active_columns),
+            "schema_version": self.schema_version,
+            "schema_history": [sorted(names) for names in self.schema_history],
+        }
+
+    def setstate(
+        self,
+        state: Dict[str, Any],
+        registry: Optional[Dict[str, ColumnDefinition]] = None
+    ):
+        """
+        Restore getstate() output onto a manager built from the same column
+        definitions, whose table already has that schema. Columns are matched
+        by position, so renamed and retyped ones are found again; columns
+        registered since construction are looked up by name in `registry`.
+        Subscribers are notified as for any schema change.
+        """
+        definitions = list(self.columns.values())
+        columns: Dict[str, ColumnDefinition] = {}
+        for position, (name, sql_type) in enumerate(state["columns"]):
+            if position < len(definitions):
+                col_def = definitions[position]
+            elif registry is not None and name in registry:
+                col_def = registry[name]
+            else:
+                raise ValueError(f"Checkpointed column '{name}' is not registered")
+            if (col_def.name, col_def.sql_type) != (name, sql_type):
+                col_def = copy.copy(col_def)
+                col_def.name = name
+                col_def.sql_type = sql_type
+            columns[name] = col_def
+
+        # In place, so generators sharing these dicts see the restored schema
+        self.columns.clear()
+        self.columns.update(columns)
+        self.active_columns.clear()
+        self.active_columns.update((name, columns[name]) for name in state["active"])
+        self.schema_version = state["schema_version"]
+        self.schema_history = [set(names) for names in state["schema_history"]]
+        self._refresh_view()
+        self._notify()
+
+    def _redefine(self, column: str, name: str, sql_type: str):
+        """
+        Swap a column's definition for a renamed/retyped copy. Definitions
+        may be shared with the column registry and other tables' managers,
+        so they are never changed in place.
+        """
+        col_def = copy.copy(self.active_columns[column])
+        col_def.name = name
+        col_def.sql_type = sql_type
+        # The dicts in place, so generators sharing them follow the change
+        for mapping in (self.columns, self.active_columns):
+            if column in mapping:
+                items = [
+                    (name, col_def) if key == column else (key, value)
+                    for key, value in mapping.items()
+                ]
+                mapping.clear()
+                mapping.update(items)
+
+    def _refresh_view(self):
+        self.view = SchemaView(self.schema_version, self.columns, self.active_columns)
+
     def _bump_version(self):
         self.schema_version += 1
-        self.schema_history.append(set(self.active_columns.keys()))
\ No newline at end of file
+        self.schema_history.append(set(self.active_columns.keys()))
+        self._refresh_view()
+        self._notify()
+
+    def _notify(self):
+        # A copy, as workers unsubscribe concurrently when they finish
+        for callback in list(self._subscribers):
+            callback(self)
+
+
+def sql_literal(value: Any, sql_type: str) -> str:
+    """Render a generated value as a typed SQL literal for DEFAULT clauses."""
+    if value is None:
+        return f"NULL::{sql_type}"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return f"{value}::{sql_type}"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    text = str(value).replace("'", "''")
+    return f"'{text}'::{sql_type}"
+
+
+def _pick(rng, names: List[str], k: int) -> List[str]:
+    if not names or k <= 0:
+        return []
+    if k == 1:
+        return [rng.choice(names)]
+    return rng.sample(names, min(k, len(names)))
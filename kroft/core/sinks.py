@@ -0,0 +1,316 @@
+import csv
+import json
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence
+
+SINK_OPS = ("insert", "update", "delete")
+# Metadata columns leading every change event
+EVENT_FIELDS = ("seq", "op", "schema_version")
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+_ARROW_TYPES = {
+    "SMALLINT": "int16",
+    "INT": "int32",
+    "INTEGER": "int32",
+    "BIGINT": "int64",
+    "REAL": "float32",
+    "FLOAT": "float64",
+    "DOUBLE PRECISION": "float64",
+    "BOOLEAN": "bool_",
+}
+
+
+class ChangeSink(ABC):
+    """
+    A destination for the change events a MutationEngine produces, in
+    addition to (or, with emit_sql=False, instead of) its SQL.
+
+    Every row written is one event and gets the next value of a
+    monotonically increasing sequence, an LSN stand-in that is unique and
+    ordered across all engines sharing the sink. Inserts carry every
+    column; updates carry the primary key and the changed column; deletes
+    only the primary key. `table_schema` (column -> SQL type, in table
+    order) describes the full row for sinks that need fixed columns.
+    """
+
+    def __init__(self):
+        self.sequence = 0
+        self._lock = threading.Lock()
+
+    def write(
+        self,
+        op: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        schema_version: int,
+        table_schema: Optional[Dict[str, str]] = None
+    ):
+        if op not in SINK_OPS:
+            raise ValueError(f"Unknown op '{op}', expected one of {SINK_OPS}")
+        if not rows:
+            return
+        with self._lock:
+            first = self.sequence + 1
+            self.sequence += len(rows)
+            self._write(
+                op, list(columns), rows, schema_version, table_schema, first
+            )
+
+    @abstractmethod
+    def _write(
+        self,
+        op: str,
+        columns: List[str],
+        rows: Sequence[Sequence[Any]],
+        schema_version: int,
+        table_schema: Optional[Dict[str, str]],
+        first_seq: int
+    ):
+        """Write one batch; rows are numbered from first_seq, lock held."""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonLinesSink(ChangeSink):
+    """
+    Newline-delimited JSON, one event per line:
+    {"seq": 1, "op": "insert", "schema_version": 1, "row": {...}}.
+    A batch is serialised in one go and written as a single buffered append.
+    """
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__()
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8", buffering=buffer_size)
+
+    def _write(self, op, columns, rows, schema_version, table_schema, first_seq):
+        dumps = json.dumps
+        lines = [
+            dumps(
+                {
+                    "seq": seq,
+                    "op": op,
+                    "schema_version": schema_version,
+                    "row": dict(zip(columns, row)),
+                },
+                default=str,
+            )
+            for seq, row in enumerate(rows, first_seq)
+        ]
+        lines.append("")
+        self._file.write("\n".join(lines))
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class _VersionedFileSink(ChangeSink):
+    """A sink with fixed columns per file, so one file per schema version."""
+
+    def __init__(self, path: str):
+        if "{version}" not in path:
+            raise ValueError(
+                f"{type(self).__name__} writes one file per schema version; "
+                f"path needs a {{version}} placeholder, got '{path}'"
+            )
+        super().__init__()
+        self.path = path
+
+    @staticmethod
+    def _header(columns: List[str], table_schema: Optional[Dict[str, str]]):
+        return list(table_schema) if table_schema else columns
+
+
+class CsvSink(_VersionedFileSink):
+    """
+    CSV with a header of EVENT_FIELDS plus the table's columns, one file
+    per schema version (e.g. path="changes_v{version}.csv"). Columns an
+    event does not carry are left empty. Existing files are appended to,
+    under the header they already have.
+    """
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(path)
+        self.buffer_size = buffer_size
+        self._files: Dict[int, Any] = {}
+        self._writers: Dict[int, Any] = {}
+        self._headers: Dict[int, List[str]] = {}
+
+    def _write(self, op, columns, rows, schema_version, table_schema, first_seq):
+        writer = self._writers.get(schema_version)
+        if writer is None:
+            path = self.path.format(version=schema_version)
+            header = _csv_header(path)
+            f = open(
+                path,
+                "a",
+                newline="",
+                encoding="utf-8",
+                buffering=self.buffer_size,
+            )
+            writer = csv.writer(f)
+            if header is None:
+                header = self._header(columns, table_schema)
+                writer.writerow(list(EVENT_FIELDS) + header)
+            self._files[schema_version] = f
+            self._writers[schema_version] = writer
+            self._headers[schema_version] = header
+
+        header = self._headers[schema_version]
+        if columns == header:
+            writer.writerows(
+                [seq, op, schema_version, *row]
+                for seq, row in enumerate(rows, first_seq)
+            )
+            return
+        index = {column: position for position, column in enumerate(header)}
+        # Columns the header doesn't know (added after the file was opened)
+        # are dropped rather than shifting every later field
+        positions = [
+            (index[column], i) for i, column in enumerate(columns)
+            if column in index
+        ]
+        for seq, row in enumerate(rows, first_seq):
+            line: List[Any] = [""] * len(header)
+            for position, i in positions:
+                line[position] = row[i]
+            writer.writerow([seq, op, schema_version, *line])
+
+    def flush(self):
+        with self._lock:
+            for f in self._files.values():
+                f.flush()
+
+    def close(self):
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+            self._writers.clear()
+
+
+def _csv_header(path: str) -> Optional[List[str]]:
+    """The table columns in an existing CSV file's header, if it has one."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            first = next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+    return first[len(EVENT_FIELDS):] if first else None
+
+
+class ParquetSink(_VersionedFileSink):
+    """
+    Parquet, one file per schema version, streamed as row groups of
+    `row_group_size` events. Integer, float and boolean columns keep their
+    type; everything else is written as strings (JSON for dicts/lists).
+    Needs pyarrow.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 100_000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as exc:
+            raise ImportError("ParquetSink needs pyarrow: pip install pyarrow") from exc
+        super().__init__(path)
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.row_group_size = row_group_size
+        self._writers: Dict[int, Any] = {}
+        self._schemas: Dict[int, Any] = {}
+        self._buffers: Dict[int, Dict[str, List[Any]]] = {}
+
+    def _write(self, op, columns, rows, schema_version, table_schema, first_seq):
+        buffer = self._buffers.get(schema_version)
+        if buffer is None:
+            buffer = self._open(schema_version, columns, table_schema)
+
+        buffer["seq"].extend(range(first_seq, first_seq + len(rows)))
+        buffer["op"].extend([op] * len(rows))
+        buffer["schema_version"].extend([schema_version] * len(rows))
+        arrow_schema = self._schemas[schema_version]
+        for index, name in enumerate(arrow_schema.names[len(EVENT_FIELDS):]):
+            if name not in columns:
+                buffer[name].extend([None] * len(rows))
+                continue
+            position = columns.index(name)
+            values = [row[position] for row in rows]
+            if arrow_schema.field(len(EVENT_FIELDS) + index).type == self._pa.string():
+                values = [_as_text(value) for value in values]
+            buffer[name].extend(values)
+
+        if len(buffer["seq"]) >= self.row_group_size:
+            self._flush_version(schema_version)
+
+    def _open(self, schema_version, columns, table_schema):
+        pa = self._pa
+        sql_types = table_schema or {column: "TEXT" for column in columns}
+        fields = [
+            pa.field("seq", pa.int64()),
+            pa.field("op", pa.string()),
+            pa.field("schema_version", pa.int32()),
+        ]
+        for name, sql_type in sql_types.items():
+            arrow_type = _ARROW_TYPES.get(sql_type.split("(")[0].strip().upper())
+            fields.append(
+                pa.field(name, getattr(pa, arrow_type)() if arrow_type else pa.string())
+            )
+        arrow_schema = pa.schema(fields)
+        self._schemas[schema_version] = arrow_schema
+        self._writers[schema_version] = self._pq.ParquetWriter(
+            self.path.format(version=schema_version), arrow_schema
+        )
+        buffer = self._buffers[schema_version] = {
+            name: [] for name in arrow_schema.names
+        }
+        return buffer
+
+    def _flush_version(self, schema_version: int):
+        buffer = self._buffers[schema_version]
+        if not buffer["seq"]:
+            return
+        table = self._pa.Table.from_pydict(
+            buffer, schema=self._schemas[schema_version]
+        )
+        self._writers[schema_version].write_table(table)
+        for values in buffer.values():
+            values.clear()
+
+    def flush(self):
+        with self._lock:
+            for schema_version in self._buffers:
+                self._flush_version(schema_version)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+            self._buffers.clear()
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
@@ -0,0 +1,41 @@
+from typing import Optional
+
+
+class TransactionPolicy:
+    """
+    How MutationEngine groups its statements into transactions.
+
+    The default commits after every insert, update and delete, as kroft
+    always has. With batches_per_commit=K a transaction stays open across K
+    insert batches and every update/delete issued in between, so the change
+    stream carries mixed multi-statement transactions. Every huge_every-th
+    transaction instead spans huge_batches batches, to exercise downstream
+    transaction buffering. synchronous_commit=False runs each transaction
+    with `SET LOCAL synchronous_commit = off`.
+    """
+
+    def __init__(
+        self,
+        batches_per_commit: Optional[int] = None,
+        huge_every: int = 0,
+        huge_batches: int = 1_000,
+        synchronous_commit: bool = True
+    ):
+        if batches_per_commit is not None and batches_per_commit < 1:
+            raise ValueError("batches_per_commit must be at least 1")
+        if huge_every < 0 or huge_batches < 1:
+            raise ValueError("huge_every must be >= 0 and huge_batches >= 1")
+
+        self.batches_per_commit = batches_per_commit
+        self.huge_every = huge_every
+        self.huge_batches = huge_batches
+        self.synchronous_commit = synchronous_commit
+
+    def batches_for(self, transaction_number: int) -> Optional[int]:
+        """
+        Insert batches the 1-based transaction_number-th transaction spans,
+        or None to commit after every operation.
+        """
+        if self.huge_every and transaction_number % self.huge_every == 0:
+            return self.huge_batches
+        return self.batches_per_commit
@@ -0,0 +1,211 @@
+import random
+import threading
+from typing import Any, Callable, List, Optional, Sequence
+
+from kroft.core.rng import required_positional_args
+
+POOL_MODES = ("ring", "sample", "unique")
+
+
+class ValuePool:
+    """
+    Pre-generated values for a column whose generator is expensive.
+
+    Modes:
+        ring: `size` values served in rotation. A draw given an rng serves
+            the run starting at a position drawn from it, so what a batch
+            gets doesn't depend on what other workers drew before it.
+        sample: `size` values drawn at random.
+        unique: every value is served at most once. Served values are
+            replaced with fresh ones, so uniqueness is exactly as good as
+            the generator's own (e.g. uuid4 keys stay unique).
+
+    `size` is the cardinality of ring/sample pools and the buffer depth of
+    unique pools. With `refill_after` set, a ring/sample pool replaces its
+    values with fresh ones after serving that many, so cardinality grows
+    over a long run; by default the set is fixed.
+
+    `fill(n, rng)` receives the drawing caller's rng, like a column's
+    batch_generator; a one-argument `fill(n)` is called without it. With
+    background=True the filling happens on a daemon thread, which has no
+    caller rng; until it catches up, draws generate the shortfall inline
+    instead of blocking.
+    """
+
+    def __init__(
+        self,
+        fill: Callable[..., Sequence[Any]],
+        size: int = 10_000,
+        mode: str = "ring",
+        background: bool = False,
+        low_watermark: float = 0.5,
+        refill_after: Optional[int] = None
+    ):
+        if mode not in POOL_MODES:
+            raise ValueError(
+                f"Unknown pool mode '{mode}', expected one of {POOL_MODES}"
+            )
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        if refill_after is not None and refill_after < 1:
+            raise ValueError("refill_after must be at least 1")
+
+        self.fill = fill
+        self._fill_takes_rng = required_positional_args(fill) >= 2
+        self.size = size
+        self.mode = mode
+        self.background = background
+        self.low_watermark = low_watermark
+        self.refill_after = refill_after
+
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self._values: List[Any] = []
+        self._cursor = 0
+        self._served = 0
+        self._filled = False
+        self._stale = False
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def draw(self, n: int, rng: Optional[random.Random] = None) -> List[Any]:
+        if n <= 0:
+            return []
+        if self.mode == "unique":
+            return self._take(n, rng)
+
+        if not self._filled:
+            if self.background:
+                self._request_fill()
+                self._count(0, n)
+                return list(self._generate(n, rng))
+            self._fill_once(rng)
+
+        values = self._values
+        self._count(n, 0)
+        self._note_served(n, rng)
+        if self.mode == "sample":
+            return (rng or random).choices(values, k=n)
+
+        if rng is not None:
+            start = rng.randrange(len(values))
+        else:
+            with self._lock:
+                start = self._cursor
+                self._cursor = (start + n) % len(values)
+        served = values[start:start + n]
+        while len(served) < n:
+            served.extend(values[:n - len(served)])
+        return served
+
+    def _generate(self, n: int, rng: Optional[random.Random] = None) -> Sequence[Any]:
+        if self._fill_takes_rng:
+            return self.fill(n, rng or random)
+        return self.fill(n)
+
+    def _note_served(self, n: int, rng: Optional[random.Random]):
+        """Count served values and refill a ring/sample pool when it is due."""
+        if self.refill_after is None:
+            return
+        with self._lock:
+            self._served += n
+            due = self._served >= self.refill_after
+            if due:
+                self._served = 0
+                self._stale = True
+        if not due:
+            return
+        if self.background:
+            self._request_fill()
+        else:
+            self._refill(rng)
+
+    def _refill(self, rng: Optional[random.Random] = None):
+        # Draws in flight keep the list they already hold; swapping is atomic
+        values = list(self._generate(self.size, rng))
+        with self._lock:
+            self._values = values
+            self._cursor = 0
+            self._stale = False
+            self.refills += 1
+
+    def _take(self, n: int, rng: Optional[random.Random] = None) -> List[Any]:
+        with self._lock:
+            taken = self._values[self._cursor:self._cursor + n]
+            self._cursor += len(taken)
+            # Drop the consumed prefix once it outgrows the live buffer
+            if self._cursor > self.size:
+                del self._values[:self._cursor]
+                self._cursor = 0
+            remaining = len(self._values) - self._cursor
+
+        shortfall = n - len(taken)
+        if shortfall:
+            taken.extend(self._generate(shortfall, rng))
+        self._count(n - shortfall, shortfall)
+
+        if remaining < self.size * self.low_watermark:
+            if self.background:
+                self._request_fill()
+            else:
+                self._top_up(rng)
+        return taken
+
+    def _top_up(self, rng: Optional[random.Random] = None):
+        with self._lock:
+            missing = self.size - (len(self._values) - self._cursor)
+        if missing <= 0:
+            return
+        fresh = list(self._generate(missing, rng))
+        with self._lock:
+            self._values.extend(fresh)
+
+    def _fill_once(self, rng: Optional[random.Random] = None):
+        values = list(self._generate(self.size, rng))
+        with self._lock:
+            if not self._filled:
+                self._values = values
+                self._filled = True
+
+    def _count(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def _request_fill(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+        self._wanted.set()
+
+    def _run(self):
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            if self._closed:
+                return
+            if self.mode == "unique":
+                self._top_up()
+            elif not self._filled:
+                self._fill_once()
+            elif self._stale:
+                self._refill()
+
+    def prefill(self):
+        """Fill the pool now, on the calling thread."""
+        if self.mode == "unique":
+            self._top_up()
+        else:
+            self._fill_once()
+
+    def close(self):
+        """Stop the background filler, if one was started."""
+        self._closed = True
+        self._wanted.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,15 @@
+def parse_lsn(lsn: str) -> int:
+    """A pg_lsn such as '16/B374D848' as a byte position."""
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+def current_lsn(cur) -> int:
+    """The server's current WAL insert position, read through `cur`."""
+    cur.execute("SELECT pg_current_wal_lsn()")
+    return parse_lsn(str(cur.fetchone()[0]))
+
+
+def wal_bytes(start: int, end: int) -> int:
+    """WAL generated between two positions, like pg_wal_lsn_diff(end, start)."""
+    return max(end - start, 0)
@@ -0,0 +1,105 @@
+import json
+import random
+from typing import Any, Iterable, List, Optional, Set
+
+from kroft.core.column import ColumnDefinition
+
+PAYLOAD_KINDS = ("text", "jsonb")
+
+
+class WorkloadShape:
+    """
+    Controls the physical shape of MutationEngine's changes.
+
+    update_columns: Only these columns are updated, e.g. wide payload
+        columns to push TOASTed values through replication.
+    hot_updates: Never update indexed columns, so updates can be HOT
+        (heap-only tuple). HOT also needs free space on the page, so pair
+        it with a table fillfactor below 100, and keep the engine's
+        update_column unindexed. Indexed columns are read from pg_index
+        once per schema version unless `indexed_columns` names them.
+    wal_sample_every: Every Nth operation, read pg_current_wal_lsn()
+        before and after it to attribute WAL bytes to inserts, updates and
+        deletes (see MutationEngine.wal_report()). 0 disables sampling.
+        The server-wide LSN also advances for other sessions' writes, so
+        attribution is exact only with a single writer.
+    """
+
+    def __init__(
+        self,
+        update_columns: Optional[Iterable[str]] = None,
+        hot_updates: bool = False,
+        indexed_columns: Optional[Iterable[str]] = None,
+        wal_sample_every: int = 0
+    ):
+        if wal_sample_every < 0:
+            raise ValueError("wal_sample_every must be >= 0")
+
+        self.update_columns: Optional[Set[str]] = (
+            set(update_columns) if update_columns is not None else None
+        )
+        self.hot_updates = hot_updates
+        self.indexed_columns: Optional[Set[str]] = (
+            set(indexed_columns) if indexed_columns is not None else None
+        )
+        self.wal_sample_every = wal_sample_every
+
+    def update_targets(
+        self, modifiable: List[str], indexed: Optional[Set[str]] = None
+    ) -> List[str]:
+        """The modifiable columns this shape allows updates to touch."""
+        targets = modifiable
+        if self.update_columns is not None:
+            targets = [name for name in targets if name in self.update_columns]
+        if self.hot_updates and indexed:
+            targets = [name for name in targets if name not in indexed]
+        return targets
+
+
+def payload_value(
+    size: int,
+    rng: Optional[random.Random] = None,
+    kind: str = "text",
+    compressible: bool = False
+) -> Any:
+    """
+    A string of `size` characters for a TEXT column, or a JSON document of
+    about that size for a JSONB column. Random hex digits defeat Postgres'
+    pglz compression, so values above ~2 kB are TOASTed out of line at
+    full size; compressible=True repeats one short pattern instead.
+    """
+    if kind not in PAYLOAD_KINDS:
+        raise ValueError(
+            f"Unknown payload kind '{kind}', expected one of {PAYLOAD_KINDS}"
+        )
+    rng = rng or random
+    if compressible:
+        pattern = format(rng.getrandbits(64), "016x")
+        text = (pattern * (size // 16 + 1))[:size]
+    else:
+        text = format(rng.getrandbits(size * 4), "x").zfill(size)[:size]
+    if kind == "jsonb":
+        return json.dumps({"payload": text})
+    return text
+
+
+def payload_column(
+    name: str,
+    size: int,
+    kind: str = "text",
+    compressible: bool = False,
+    **kwargs
+) -> ColumnDefinition:
+    """A TEXT or JSONB ColumnDefinition generating `size`-byte payloads."""
+    if size < 0:
+        raise ValueError("payload size must be >= 0")
+    if kind not in PAYLOAD_KINDS:
+        raise ValueError(
+            f"Unknown payload kind '{kind}', expected one of {PAYLOAD_KINDS}"
+        )
+    return ColumnDefinition(
+        name,
+        "JSONB" if kind == "jsonb" else "TEXT",
+        lambda rng: payload_value(size, rng, kind, compressible),
+        **kwargs
+    )
@@ -0,0 +1,84 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from kroft.core.async_mutator import AsyncMutationEngine
+from kroft.core.batch import BatchGenerator
+from kroft.core.column import ColumnDefinition
+
+
+def make_pool():
+    conn = MagicMock()
+    conn.executemany = AsyncMock()
+    conn.execute = AsyncMock()
+    conn.copy_records_to_table = AsyncMock()
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = conn
+    return pool, conn
+
+
+def test_async_insert_batch_uses_executemany_and_tracks_count():
+    pool, conn = make_pool()
+    engine = AsyncMutationEngine(pool, "public", "products")
+
+    rows = [{"id": "abc", "name": "Hat"}, {"id": "def", "name": "Shirt"}]
+    inserted_ids = asyncio.run(engine.insert_batch(rows))
+
+    query, values = conn.executemany.call_args[0]
+    assert query == (
+        'INSERT INTO "public"."products" ("id", "name") VALUES ($1, $2)'
+    )
+    assert values == [("abc", "Hat"), ("def", "Shirt")]
+    assert inserted_ids == ["abc", "def"]
+    assert engine.total_inserts == 2
+
+
+def test_async_insert_batch_copy_strategy():
+    pool, conn = make_pool()
+    engine = AsyncMutationEngine(pool, "public", "products", insert_strategy="copy")
+
+    asyncio.run(engine.insert_batch({"id": ["a", "b"], "name": ["x", "y"]}))
+
+    conn.copy_records_to_table.assert_awaited_once_with(
+        "products",
+        records=[("a", "x"), ("b", "y")],
+        columns=["id", "name"],
+        schema_name="public",
+    )
+
+
+@patch("kroft.core.async_mutator.random")
+def test_async_update_groups_rows_by_random_column(mock_random):
+    mock_random.choice.side_effect = ["price", "quantity", "price"]
+    pool, conn = make_pool()
+    schema = {
+        "id": ColumnDefinition("id", "UUID", lambda: "id"),
+        "price": ColumnDefinition("price", "FLOAT", lambda: 9.5),
+        "quantity": ColumnDefinition("quantity", "INT", lambda: 3),
+    }
+    engine = AsyncMutationEngine(
+        pool, "public", "sales", update_column="updated_at",
+        generator=BatchGenerator(schema),
+    )
+
+    updated = asyncio.run(engine._update_records(["r1", "r2", "r3"]))
+
+    assert updated == 3
+    price_call, quantity_call = conn.executemany.call_args_list
+    assert '"price" = $1, "updated_at" = now()' in price_call[0][0]
+    assert price_call[0][1] == [(9.5, "r1"), (9.5, "r3")]
+    assert quantity_call[0][1] == [(3, "r2")]
+
+
+def test_async_delete_casts_uuid_keys():
+    pool, conn = make_pool()
+    schema = {"id": ColumnDefinition("id", "UUID", lambda: "id")}
+    engine = AsyncMutationEngine(
+        pool, "public", "sales", generator=BatchGenerator(schema)
+    )
+
+    deleted = asyncio.run(engine._delete_records(["a", "b"]))
+
+    query, ids = conn.execute.call_args[0]
+    assert query.endswith('"id" = ANY($1::uuid[])')
+    assert ids == ["a", "b"]
+    assert deleted == 2
@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from kroft.core.async_mutator import AsyncMutationEngine
+from kroft.core.async_runner import AsyncSimulationRunner
+from kroft.core.batch import BatchGenerator
+from kroft.core.column import ColumnDefinition
+from kroft.core.schema import SchemaManager
+from tests.core.test_async_mutator import make_pool
+
+
+def make_runner(**kwargs):
+    schema_mgr = MagicMock()
+    schema_mgr.get_active_columns.return_value = {
+        "id": ColumnDefinition("id", "INT", lambda: 1),
+    }
+    mutator = MagicMock()
+    mutator.insert_batch = AsyncMock(return_value=[1])
+    mutator.maybe_mutate_batch = AsyncMock(return_value=(0, 0))
+    return AsyncSimulationRunner(schema_mgr, mutator, **kwargs), mutator
+
+
+def test_async_runner_bounds_in_flight_batches():
+    runner, mutator = make_runner(total_records=20, batch_size=2, concurrency=3)
+    in_flight = 0
+    peak = 0
+
+    async def insert(batch):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return batch["id"]
+
+    mutator.insert_batch.side_effect = insert
+
+    asyncio.run(runner.run())
+
+    assert mutator.insert_batch.await_count == 10
+    assert peak == 3
+    assert mutator.maybe_mutate_batch.await_count == 10
+
+
+def test_async_runner_evolves_schema_between_batches():
+    evolution = MagicMock()
+    evolution.evolution_interval = 2
+    evolution.evolve.return_value = "[v2] Added column: age"
+
+    runner, _ = make_runner(
+        total_records=8, batch_size=2, concurrency=2, evolution=evolution
+    )
+    asyncio.run(runner.run())
+
+    assert [c[0][0] for c in evolution.evolve.call_args_list] == [2, 4]
+    assert runner.evolution_messages == ["[v2] Added column: age"] * 2
+
+
+def test_async_runner_surfaces_batch_failures():
+    runner, mutator = make_runner(total_records=10, batch_size=2, concurrency=2)
+    mutator.insert_batch.side_effect = RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(runner.run())
+
+
+def test_async_runner_keeps_the_engine_on_the_current_schema():
+    columns = {
+        "id": ColumnDefinition("id", "INT", lambda: 1, protected=True),
+        "price": ColumnDefinition("price", "FLOAT", lambda: 1.5),
+        "name": ColumnDefinition("name", "TEXT", lambda: "Hat"),
+    }
+    manager = SchemaManager(MagicMock(), "public", "sales", columns)
+    pool, conn = make_pool()
+    engine = AsyncMutationEngine(
+        pool, "public", "sales", generator=BatchGenerator(columns)
+    )
+    evolution = MagicMock()
+    evolution.evolution_interval = 2
+    evolution.evolve.side_effect = lambda batch_num: manager.drop_column(
+        column="price"
+    )
+
+    runner = AsyncSimulationRunner(
+        manager, engine, total_records=6, batch_size=2, concurrency=1,
+        evolution=evolution,
+    )
+    asyncio.run(runner.run())
+
+    assert engine.generator.get_modifiable_columns(exclude=["id"]) == ["name"]
+    queries = [c[0][0] for c in conn.executemany.call_args_list]
+    assert '"price"' not in [q for q in queries if q.startswith("INSERT")][-1]
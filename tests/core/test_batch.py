@@ -1,6 +1,8 @@
+from unittest.mock import MagicMock
+
 import pytest
 
-from kroft.core.batch import BatchGenerator
+from kroft.core.batch import BatchGenerator, RowBatch
 from kroft.core.column import ColumnDefinition
 
 
@@ -96,3 +98,62 @@ def test_modifiable_columns_respect_reserved_protected_and_exclude():
 
     # "id" is reserved, "updated_at" is protected, "internal_flag" is excluded
     assert set(modifiable) == {"price", "quantity"}
+
+
+def test_generate_columns_mixes_batch_and_scalar_generators():
+    schema = {
+        "id": ColumnDefinition(
+            "id", "INT", lambda: -1, batch_generator=lambda n: list(range(n))
+        ),
+        "name": ColumnDefinition("name", "TEXT", lambda: "John"),
+    }
+
+    generator = BatchGenerator(schema)
+    columns = generator.generate_columns(3)
+
+    assert columns == {"id": [0, 1, 2], "name": ["John", "John", "John"]}
+    assert generator.generate_batch(2) == [
+        {"id": 0, "name": "John"},
+        {"id": 1, "name": "John"},
+    ]
+
+
+def test_generator_tracking_a_manager_follows_schema_changes():
+    from kroft.core.schema import SchemaManager
+
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "1", protected=True),
+        "price": ColumnDefinition("price", "FLOAT", lambda: 1.5),
+        "qty": ColumnDefinition("qty", "INT", lambda: 2, reserved=True),
+    }
+    manager = SchemaManager(MagicMock(), "public", "sales", columns)
+    generator = BatchGenerator(columns)
+    generator.track_schema(manager)
+
+    assert list(generator.generate_columns(2)) == ["id", "price"]
+    first = generator.get_modifiable_columns(exclude=["id"])
+    assert first == ["price"]
+    assert generator.get_modifiable_columns(exclude=["id"]) is first
+
+    manager.add_column()
+
+    assert generator.schema_version == 2
+    assert list(generator.generate_columns(2)) == ["id", "price", "qty"]
+    # Once added, a reserved column is an ordinary updatable column
+    assert generator.get_modifiable_columns(exclude=["id"]) == ["price", "qty"]
+
+
+def test_generate_rows_returns_tuples_in_schema_order():
+    schema = {
+        "id": ColumnDefinition("id", "INT", lambda: 1),
+        "name": ColumnDefinition("name", "TEXT", lambda: "x"),
+    }
+
+    batch = BatchGenerator(schema).generate_rows(2)
+
+    assert isinstance(batch, RowBatch)
+    assert batch.columns == ("id", "name")
+    assert batch.rows == [(1, "x"), (1, "x")]
+    assert len(batch) == 2
+    assert batch.column("name") == ["x", "x"]
+    assert batch.to_dicts()[0] == {"id": 1, "name": "x"}
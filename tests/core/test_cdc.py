@@ -0,0 +1,108 @@
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from kroft.core.batch import BatchGenerator
+from kroft.core.cdc import DebeziumEmitter, RowStore
+from kroft.core.column import ColumnDefinition
+from kroft.core.mutator import MutationEngine
+from kroft.core.schema import SchemaManager
+
+
+def events(stream):
+    return [json.loads(line) for line in stream.getvalue().decode().splitlines()]
+
+
+def test_row_store_spills_past_its_cap_and_reads_back(tmp_path):
+    store = RowStore(max_bytes=2_000, spill_dir=str(tmp_path))
+    for key in range(100):
+        store.put(key, {"id": key, "name": f"row-{key}"})
+
+    assert store.spilled > 0
+    assert store.memory_bytes <= 2_000
+    assert len(store) == 100
+    assert store.get(0) == {"id": 0, "name": "row-0"}
+    assert store.pop(1) == {"id": 1, "name": "row-1"}
+    assert store.get(1) is None
+    assert len(store) == 99
+
+    store.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_row_store_rejects_a_non_positive_cap():
+    with pytest.raises(ValueError):
+        RowStore(max_bytes=0)
+
+
+def test_emitter_writes_debezium_envelopes_with_before_images():
+    stream = io.BytesIO()
+    emitter = DebeziumEmitter(stream, "public", "sales", close_stream=False)
+
+    emitter.write("insert", ["id", "qty"], [(1, 5), (2, 6)], 1)
+    emitter.write("update", ["id", "qty"], [(1, 9)], 1)
+    emitter.write("delete", ["id"], [(2,)], 1)
+
+    insert, _, update, delete = events(stream)
+    assert insert["op"] == "c" and insert["before"] is None
+    assert insert["after"] == {"id": 1, "qty": 5}
+    assert update["op"] == "u"
+    assert update["before"] == {"id": 1, "qty": 5}
+    assert update["after"] == {"id": 1, "qty": 9}
+    assert delete["op"] == "d"
+    assert delete["before"] == {"id": 2, "qty": 6} and delete["after"] is None
+    assert [e["source"]["lsn"] for e in (insert, update, delete)] == [1, 3, 4]
+    assert delete["source"]["table"] == "sales"
+
+
+def test_engine_and_schema_changes_feed_the_emitter():
+    stream = io.BytesIO()
+    columns = {
+        "id": ColumnDefinition("id", "INT", lambda: 1, constraints="PRIMARY KEY"),
+        "qty": ColumnDefinition("qty", "INT", lambda: 2),
+        "note": ColumnDefinition("note", "TEXT", lambda: "x", reserved=True),
+    }
+    manager = SchemaManager(MagicMock(), "public", "sales", columns)
+    emitter = DebeziumEmitter(stream, "public", "sales", close_stream=False)
+    emitter.track_schema(manager)
+    engine = MutationEngine(
+        None, "public", "sales",
+        generator=BatchGenerator(columns), sinks=[emitter], emit_sql=False
+    )
+    engine.track_schema(manager)
+
+    engine.insert_batch({"id": [1], "qty": [2]})
+    manager.add_column()
+
+    insert, change = events(stream)
+    assert insert["source"]["schema_version"] == 1
+    assert "ADD COLUMN note TEXT" in change["ddl"]
+    table = change["tableChanges"][0]["table"]
+    assert [c["name"] for c in table["columns"]] == ["id", "qty", "note"]
+    assert table["columns"][0]["optional"] is False
+    assert change["source"]["schema_version"] == 2
+
+
+def test_update_images_leave_out_dropped_columns():
+    stream = io.BytesIO()
+    columns = {
+        "id": ColumnDefinition("id", "INT", lambda: 1, constraints="PRIMARY KEY"),
+        "qty": ColumnDefinition("qty", "INT", lambda: 2),
+        "note": ColumnDefinition("note", "TEXT", lambda: "x"),
+    }
+    manager = SchemaManager(MagicMock(), "public", "sales", columns)
+    emitter = DebeziumEmitter(stream, "public", "sales", close_stream=False)
+    emitter.track_schema(manager)
+
+    emitter.write("insert", ["id", "qty", "note"], [(1, 2, "x"), (2, 3, "y")], 1)
+    manager.drop_column(column="note")
+    emitter.write("update", ["id", "qty"], [(1, 7)], 2)
+    emitter.write("update", ["id", "qty"], [(2, 8)], 2, {"id": "INT", "qty": "INT"})
+
+    first, second = [e for e in events(stream) if e.get("op") == "u"]
+    assert first["before"] == {"id": 1, "qty": 2, "note": "x"}
+    assert first["after"] == {"id": 1, "qty": 7}
+    assert second["after"] == {"id": 2, "qty": 8}
+    assert emitter.rows.get(1) == {"id": 1, "qty": 7}
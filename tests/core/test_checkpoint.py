@@ -0,0 +1,276 @@
+import os
+import pickle
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from kroft.core.checkpoint import read_checkpoint, write_checkpoint
+from kroft.core.column import ColumnDefinition
+from kroft.core.evolution import EvolutionController
+from kroft.core.keys import LiveKeyIndex
+from kroft.core.mutator import MutationEngine
+from kroft.core.runner import SimulationRunner
+from kroft.core.schema import SchemaManager
+from kroft.core.transactions import TransactionPolicy
+
+
+def test_checkpoints_are_replaced_atomically(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    assert write_checkpoint(path, {"batch": 1}) > 0
+    write_checkpoint(path, {"batch": 2})
+
+    assert read_checkpoint(path)["batch"] == 2
+    assert os.listdir(tmp_path) == ["run.ckpt"]
+
+    with open(path, "wb") as f:
+        pickle.dump({"batch": 3}, f)
+    with pytest.raises(ValueError):
+        read_checkpoint(path)
+
+
+def columns():
+    return {
+        "id": ColumnDefinition(
+            "id", "BIGINT", lambda rng: rng.getrandbits(48),
+            constraints="PRIMARY KEY", protected=True
+        ),
+        "qty": ColumnDefinition("qty", "INT", lambda: 2),
+        "price": ColumnDefinition("price", "REAL", lambda: 1.5),
+        "note": ColumnDefinition("note", "TEXT", lambda: "x", reserved=True),
+        "tag": ColumnDefinition("tag", "TEXT", lambda: "y", reserved=True),
+    }
+
+
+def test_schema_state_survives_renames_and_type_changes():
+    manager = SchemaManager(MagicMock(), "public", "sales", columns())
+    manager.add_column(rng=random.Random(1))
+    manager.rename_column("qty", "quantity")
+    manager.alter_column_type("price", "DOUBLE PRECISION")
+
+    restored = SchemaManager(MagicMock(), "public", "sales", columns())
+    seen = []
+    restored.subscribe(lambda m: seen.append(m.schema_version))
+    restored.setstate(pickle.loads(pickle.dumps(manager.getstate())))
+
+    assert list(restored.active_columns) == list(manager.active_columns)
+    assert restored.columns["quantity"].name == "quantity"
+    assert restored.columns["price"].sql_type == "DOUBLE PRECISION"
+    assert restored.schema_history == manager.schema_history
+    assert restored.view.reserved_available == manager.view.reserved_available
+    assert seen == [manager.schema_version] == [4]
+
+
+def test_live_keys_and_controller_state_round_trip():
+    keys = LiveKeyIndex("int", track_positions=True)
+    keys.add(range(10))
+    keys.take(3, random.Random(1))
+    restored = LiveKeyIndex("int", track_positions=True)
+    restored.setstate(keys.getstate())
+    assert restored.sample(7, random.Random(2)) == keys.sample(7, random.Random(2))
+    restored.discard([keys.sample(1, random.Random(3))[0]])
+    assert len(restored) == 6
+    with pytest.raises(ValueError):
+        LiveKeyIndex("uuid").setstate(keys.getstate())
+
+    manager = SchemaManager(MagicMock(), "public", "sales", columns())
+    controller = EvolutionController(
+        manager, evolution_interval=1, evolution_probability=1.0,
+        rng=random.Random(4)
+    )
+    controller.evolve(1)
+    resumed = EvolutionController(manager, rng=random.Random(0))
+    resumed.setstate(controller.getstate())
+    assert resumed.summary()["evolution_log"] == controller.evolution_log
+    assert resumed.rng.random() == controller.rng.random()
+
+
+def test_deferred_engines_commit_only_when_told():
+    conn = MagicMock()
+    engine = MutationEngine(conn, "public", "sales", generator=MagicMock())
+    engine.defer_commits = True
+    engine._delete_records([1])
+    engine._delete_records([2])
+    assert conn.commit.call_count == 0
+    engine.commit()
+    assert conn.commit.call_count == 1
+
+
+class FakeTable:
+    """Rows a crashed run's uncommitted transaction would lose."""
+
+    def __init__(self):
+        self.committed = []
+        self.pending = []
+
+
+def simulation(table, path=None, fail_at=None, evolution_seed=None):
+    schema_mgr = SchemaManager(MagicMock(), "public", "sales", columns())
+    evolution = None
+    if evolution_seed is not None:
+        evolution = EvolutionController(
+            schema_mgr, evolution_interval=4, evolution_probability=0.7,
+            rng=random.Random(evolution_seed)
+        )
+    mutator = MagicMock()
+    mutator.rng = None
+    mutator.transaction_policy = TransactionPolicy()
+    mutator.live_keys = LiveKeyIndex("int")
+    inserts = []
+
+    def insert(batch):
+        if len(inserts) + 1 == fail_at:
+            raise RuntimeError("server closed the connection")
+        ids = [row["id"] for row in batch]
+        inserts.append(ids)
+        table.pending.extend(ids)
+        mutator.live_keys.add(ids)
+        return ids
+
+    def commit():
+        table.committed.extend(table.pending)
+        table.pending.clear()
+
+    mutator.insert_batch.side_effect = insert
+    mutator.commit.side_effect = commit
+    mutator._update_records.return_value = 0
+    mutator._delete_records.return_value = 0
+    mutator.get_counters.side_effect = lambda: {
+        "total_inserts": sum(map(len, inserts))
+    }
+    return SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry=schema_mgr.columns,
+        total_records=200,
+        batch_size=10,
+        evolution_interval=4,
+        evolution_probability=1.0,
+        add_probability=0.8,
+        seed=42,
+        checkpoint_path=path,
+        checkpoint_every=3,
+        checkpoint_overhead=1.0,
+        report_interval=60,
+        evolution=evolution,
+    )
+
+
+def test_resume_continues_after_a_crash_without_duplicate_keys(tmp_path):
+    expected = FakeTable()
+    uninterrupted = simulation(expected)
+    uninterrupted.run()
+
+    path = str(tmp_path / "run.ckpt")
+    table = FakeTable()
+    with pytest.raises(RuntimeError):
+        simulation(table, path, fail_at=15).run()
+    # The crash rolls back the open transaction
+    table.pending.clear()
+    assert 0 < len(table.committed) < 140
+
+    resumed = simulation(table, path)
+    resumed.resume()
+
+    assert len(set(table.committed)) == len(table.committed) == 200
+    assert sorted(table.committed) == sorted(expected.committed)
+    assert resumed.schema_mgr.getstate() == uninterrupted.schema_mgr.getstate()
+    assert len(resumed.mutator.live_keys) == 200
+    assert resumed.get_counters()["total_inserts"] == 200
+    assert read_checkpoint(path)["committed_through"] == 20
+    # Evolution points 16 and 20 and the end of the run always checkpoint
+    assert resumed.metrics.operations["checkpoint"].count >= 3
+
+
+def crash_in_first_evolution(table, path, committed, evolution_seed=None):
+    """Crash as the first ALTER TABLE commits (or fails); the table's columns."""
+    runner = simulation(table, path, evolution_seed=evolution_seed)
+    manager = runner.schema_mgr
+    alter_columns = manager.alter_columns
+
+    def alter_then_crash(*args, **kwargs):
+        if committed:
+            alter_columns(*args, **kwargs)
+        raise RuntimeError("server closed the connection")
+
+    manager.alter_columns = alter_then_crash
+    with pytest.raises(RuntimeError):
+        runner.run()
+    table.pending.clear()
+    assert read_checkpoint(path)["evolving"] is not None
+    return list(manager.active_columns)
+
+
+@pytest.mark.parametrize("committed", [True, False])
+def test_resume_keeps_an_evolution_step_interrupted_by_a_crash(tmp_path, committed):
+    expected = FakeTable()
+    uninterrupted = simulation(expected)
+    uninterrupted.run()
+
+    path = str(tmp_path / "run.ckpt")
+    table = FakeTable()
+    table_columns = crash_in_first_evolution(table, path, committed)
+
+    resumed = simulation(table, path)
+    cursor = resumed.schema_mgr.conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [(name,) for name in table_columns]
+    resumed.resume()
+
+    assert resumed.schema_mgr.getstate() == uninterrupted.schema_mgr.getstate()
+    assert sorted(table.committed) == sorted(expected.committed)
+    assert read_checkpoint(path)["evolving"] is None
+
+
+def test_controller_state_is_checkpointed_and_resumed(tmp_path):
+    uninterrupted = simulation(FakeTable(), evolution_seed=6)
+    uninterrupted.run()
+    assert uninterrupted.evolution.evolution_log
+
+    path = str(tmp_path / "run.ckpt")
+    table = FakeTable()
+    table_columns = crash_in_first_evolution(
+        table, path, committed=False, evolution_seed=6
+    )
+
+    resumed = simulation(table, path, evolution_seed=0)
+    cursor = resumed.schema_mgr.conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [(name,) for name in table_columns]
+    resumed.resume()
+
+    assert resumed.evolution.getstate() == uninterrupted.evolution.getstate()
+    assert resumed.schema_mgr.getstate() == uninterrupted.schema_mgr.getstate()
+    assert len(set(table.committed)) == len(table.committed) == 200
+
+
+def test_reconcile_adopts_columns_the_table_already_has():
+    manager = SchemaManager(MagicMock(), "public", "sales", columns())
+    cursor = manager.conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [("id",), ("quantity",), ("price",), ("note",)]
+
+    changes = manager.reconcile()
+
+    assert changes == [("rename", "quantity"), ("add", "note")]
+    assert list(manager.active_columns) == ["id", "quantity", "price", "note"]
+    assert manager.columns["quantity"].sql_type == "INT"
+    assert manager.schema_version == 2
+    assert manager.reconcile() == []
+
+
+def test_batches_committed_out_of_order_are_not_claimed_again():
+    runner = SimulationRunner(
+        MagicMock(), MagicMock(), {},
+        total_records=60, batch_size=10, checkpoint_path="unused"
+    )
+    runner._committed_through = 2
+    runner._committed_ahead = {4, 6}
+    runner._batches_claimed = 2
+
+    claims = iter(runner._claim_batch, None)
+    assert [batch_num for batch_num, _ in claims] == [3, 5]
+
+
+def test_checkpointing_rejects_policies_that_commit_on_their_own():
+    mutator = MagicMock()
+    mutator.transaction_policy = TransactionPolicy(batches_per_commit=5)
+    with pytest.raises(ValueError):
+        SimulationRunner(MagicMock(), mutator, {}, checkpoint_path="run.ckpt")
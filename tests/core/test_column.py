@@ -1,3 +1,4 @@
+import random
 import re
 
 from kroft.core.column import ColumnDefinition
@@ -48,4 +49,48 @@ def test_column_definition_with_reserved_and_protected():
     )
 
     assert col.reserved is True
-    assert col.protected is True
\ No newline at end of file
+    assert col.protected is True
+
+def test_generate_many_falls_back_to_scalar_generator():
+    col = ColumnDefinition("qty", "INT", generator=lambda: 3)
+    assert col.generate_many(4) == [3, 3, 3, 3]
+
+
+def test_generate_many_prefers_batch_generator():
+    calls = []
+
+    def batch(n):
+        calls.append(n)
+        return list(range(n))
+
+    col = ColumnDefinition("qty", "INT", lambda: -1, batch_generator=batch)
+    assert col.generate_many(3) == [0, 1, 2]
+    assert calls == [3]
+
+
+def test_generators_can_take_an_rng_stream():
+    col = ColumnDefinition("score", "INT", lambda rng: rng.randint(0, 1000))
+
+    first = col.generate_many(5, random.Random(9))
+    second = col.generate_many(5, random.Random(9))
+
+    assert first == second
+    assert col.generate(random.Random(9)) == first[0]
+
+
+def test_batch_generator_receives_rng_when_it_takes_one():
+    col = ColumnDefinition(
+        "score",
+        "INT",
+        lambda: 0,
+        batch_generator=lambda n, rng: [rng.random() for _ in range(n)],
+    )
+
+    assert col.generate_many(3, random.Random(1)) == col.generate_many(
+        3, random.Random(1)
+    )
+
+
+def test_column_definition_has_no_instance_dict():
+    col = ColumnDefinition("price", "FLOAT", lambda: 1.0)
+    assert not hasattr(col, "__dict__")
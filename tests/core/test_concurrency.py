@@ -0,0 +1,48 @@
+import threading
+import time
+
+from kroft.core.concurrency import SchemaGate
+
+
+def test_schema_gate_ddl_waits_for_in_flight_dml():
+    gate = SchemaGate()
+    events = []
+    dml_started = threading.Event()
+
+    def dml():
+        with gate.dml():
+            dml_started.set()
+            time.sleep(0.05)
+            events.append("dml-done")
+
+    def ddl():
+        dml_started.wait()
+        with gate.ddl():
+            events.append("ddl")
+
+    threads = [threading.Thread(target=dml), threading.Thread(target=ddl)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert events == ["dml-done", "ddl"]
+
+
+def test_schema_gate_allows_concurrent_dml():
+    gate = SchemaGate()
+    inside = []
+    barrier = threading.Barrier(3, timeout=1)
+
+    def dml():
+        with gate.dml():
+            inside.append(1)
+            barrier.wait()
+
+    threads = [threading.Thread(target=dml) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(inside) == 3
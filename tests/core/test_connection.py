@@ -0,0 +1,111 @@
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg2.pool import AbstractConnectionPool
+
+from kroft.core.column import ColumnDefinition
+from kroft.core.connection import DDL_CONNECTION_KEY, checkout, is_pool
+from kroft.core.mutator import MutationEngine
+from kroft.core.schema import SchemaManager
+from kroft.core.transactions import TransactionPolicy
+
+
+class FakePool(AbstractConnectionPool):
+    def __init__(self):
+        super().__init__(0, 4)
+        self.checked_out = {}
+
+    def getconn(self, key=None):
+        conn = self.checked_out.get(key) if key else None
+        if conn is None:
+            conn = MagicMock(name=f"conn-{key}")
+            if key:
+                self.checked_out[key] = conn
+        self.last = conn
+        return conn
+
+    def putconn(self, conn, key=None, close=False):
+        self.returned = getattr(self, "returned", []) + [conn]
+
+
+def test_checkout_passes_raw_connections_through():
+    conn = MagicMock()
+    with checkout(conn) as checked_out:
+        assert checked_out is conn
+    assert not is_pool(conn)
+
+
+def test_checkout_returns_pooled_connection_and_rolls_back_on_error():
+    pool = FakePool()
+
+    with checkout(pool) as conn:
+        pass
+    assert pool.returned == [conn]
+
+    with pytest.raises(RuntimeError):
+        with checkout(pool) as failed:
+            raise RuntimeError("boom")
+    failed.rollback.assert_called_once()
+    assert pool.returned[-1] is failed
+
+
+def test_schema_manager_routes_ddl_through_reserved_pool_connection():
+    pool = FakePool()
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "id", protected=True),
+        "age": ColumnDefinition("age", "INT", lambda: 1, reserved=True),
+    }
+    manager = SchemaManager(pool, "public", "users", columns)
+
+    manager.create_table()
+    manager.add_column()
+
+    ddl_conn = pool.checked_out[DDL_CONNECTION_KEY]
+    assert ddl_conn.commit.call_count == 2
+    assert not hasattr(pool, "returned")
+
+
+def test_mutation_engine_checks_out_a_connection_per_batch():
+    pool = FakePool()
+    engine = MutationEngine(pool, "public", "users", insert_strategy="copy")
+
+    engine.insert_batch([{"id": "a"}])
+    engine.insert_batch([{"id": "b"}])
+
+    assert len(pool.returned) == 2
+    for conn in pool.returned:
+        conn.commit.assert_called_once()
+
+
+def test_open_transaction_holds_one_pooled_connection_across_batches():
+    pool = FakePool()
+    engine = MutationEngine(
+        pool, "public", "users", insert_strategy="copy",
+        transaction_policy=TransactionPolicy(batches_per_commit=2),
+    )
+
+    engine.insert_batch([{"id": "a"}])
+    assert not hasattr(pool, "returned")
+    engine.insert_batch([{"id": "b"}])
+
+    assert len(pool.returned) == 1
+    pool.returned[0].commit.assert_called_once()
+
+
+def test_failed_operation_rolls_back_and_releases_the_transaction():
+    pool = FakePool()
+    engine = MutationEngine(
+        pool, "public", "users", insert_strategy="copy",
+        transaction_policy=TransactionPolicy(batches_per_commit=5),
+    )
+    engine.insert_batch([{"id": "a"}])
+    pool.last.cursor.return_value.__enter__.return_value.copy_expert.side_effect = (
+        RuntimeError("boom")
+    )
+
+    with pytest.raises(RuntimeError):
+        engine.insert_batch([{"id": "b"}])
+
+    assert pool.returned == [pool.last]
+    pool.last.rollback.assert_called_once()
+    pool.last.commit.assert_not_called()
@@ -0,0 +1,74 @@
+import struct
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from kroft.core.copy_format import (
+    BINARY_HEADER,
+    BINARY_TRAILER,
+    encode_binary,
+    encode_text,
+    to_text,
+)
+
+
+def test_to_text_serializes_nulls_booleans_and_timestamps():
+    assert to_text(None, "TEXT") == "\\N"
+    assert to_text(True, "BOOLEAN") == "t"
+    assert to_text(False, "BOOLEAN") == "f"
+    assert to_text("now()", "TIMESTAMP") == "now"
+    assert to_text(datetime(2025, 1, 2, 3, 4, 5), "TIMESTAMP") == "2025-01-02 03:04:05"
+
+
+def test_to_text_escapes_copy_delimiters():
+    assert to_text("a\tb\nc\\d", "TEXT") == "a\\tb\\nc\\\\d"
+
+
+def test_encode_text_writes_one_line_per_row():
+    buf = encode_text([["abc", 1, None], ["def", 2, True]], ["UUID", "INT", "BOOLEAN"])
+    assert buf.getvalue() == "abc\t1\t\\N\ndef\t2\tt\n"
+
+
+def test_encode_binary_frames_rows_with_header_and_trailer():
+    row_id = uuid.uuid4()
+    buf = encode_binary(
+        [[str(row_id), 7, None, False]], ["UUID", "INT", "TEXT", "BOOL"]
+    )
+    data = buf.getvalue()
+
+    assert data.startswith(BINARY_HEADER)
+    assert data.endswith(BINARY_TRAILER)
+
+    body = data[len(BINARY_HEADER):-len(BINARY_TRAILER)]
+    assert struct.unpack(">h", body[:2])[0] == 4
+    assert body[2:6] == struct.pack(">i", 16)
+    assert body[6:22] == row_id.bytes
+    assert body[22:30] == struct.pack(">ii", 4, 7)
+    assert body[30:34] == struct.pack(">i", -1)
+    assert body[34:] == struct.pack(">i", 1) + b"\x00"
+
+
+def test_encode_binary_timestamp_is_micros_since_pg_epoch():
+    buf = encode_binary([[datetime(2000, 1, 2)]], ["TIMESTAMP"])
+    body = buf.getvalue()[len(BINARY_HEADER):-len(BINARY_TRAILER)]
+    assert body[2:] == struct.pack(">i", 8) + struct.pack(">q", 86_400_000_000)
+
+
+def test_encode_binary_numeric_uses_base_10000_digits():
+    def field(value):
+        body = encode_binary([[value]], ["NUMERIC(12, 4)"]).getvalue()
+        return body[len(BINARY_HEADER) + 6:-len(BINARY_TRAILER)]
+
+    assert field(Decimal("-12345.678")) == struct.pack(
+        ">hhHh3h", 3, 1, 0x4000, 3, 1, 2345, 6780
+    )
+    assert field(0.00001) == struct.pack(">hhHhh", 1, -2, 0, 5, 1000)
+    assert field(0) == struct.pack(">hhHh", 0, 0, 0, 0)
+    assert field(Decimal("NaN")) == struct.pack(">hhHh", 0, 0, 0xC000, 0)
+
+
+def test_encode_binary_rejects_unsupported_types():
+    with pytest.raises(ValueError):
+        encode_binary([[1]], ["INTERVAL"])
@@ -1,5 +1,8 @@
+import random
 from unittest.mock import MagicMock
 
+import pytest
+
 from kroft.core.column import ColumnDefinition
 from kroft.core.evolution import EvolutionController
 from kroft.core.schema import SchemaManager
@@ -56,4 +59,143 @@ def test_schema_evolver_skips_batches_and_limits_evolution(monkeypatch):
     # Summary check
     assert evolver.summary()["adds"] == 2
     assert evolver.summary()["drops"] == 1
-    assert evolver.summary()["schema_version"] == 4
\ No newline at end of file
+    assert evolver.summary()["schema_version"] == 4
+
+def test_combined_evolution_issues_one_alter_table():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+        "name": ColumnDefinition("name", "TEXT", lambda: "John"),
+        "age": ColumnDefinition("age", "INT", lambda: 30, reserved=True),
+        "email": ColumnDefinition("email", "TEXT", lambda: "a@b", reserved=True),
+    }
+    manager = SchemaManager(conn, "public", "users", columns)
+    evolver = EvolutionController(
+        manager,
+        evolution_interval=1,
+        evolution_probability=1.0,
+        add_probability=0.5,
+        actions_per_evolution=3,
+        rng=random.Random(4),
+    )
+
+    message = evolver.evolve(1)
+
+    alters = [
+        c[0][0] for c in cursor.execute.call_args_list
+        if c[0][0].startswith("ALTER TABLE")
+    ]
+    assert len(alters) == 1
+    assert manager.schema_version == 2
+    assert evolver.num_additions + evolver.num_drops == 3
+    assert message.startswith("[v2] ")
+
+
+def test_weighted_actions_include_renames_and_type_changes():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+        "name": ColumnDefinition("name", "VARCHAR(10)", lambda: "John"),
+        "age": ColumnDefinition("age", "INT", lambda: 30),
+    }
+    manager = SchemaManager(conn, "public", "users", columns)
+    evolver = EvolutionController(
+        manager,
+        evolution_interval=1,
+        evolution_probability=1.0,
+        action_weights={"rename": 1.0, "alter_type": 1.0, "add": 5.0},
+        rng=random.Random(1),
+    )
+
+    messages = [evolver.evolve(batch) for batch in range(1, 5)]
+
+    # Nothing is reserved, so "add" is never feasible
+    actions = {entry["action"] for entry in evolver.evolution_log}
+    assert actions <= {"rename", "alter_type"}
+    assert all(m.startswith(f"[v{i + 2}] ") for i, m in enumerate(messages))
+    assert evolver.num_additions == 0
+
+
+def test_failed_adds_and_drops_do_not_fall_through_to_apply_action():
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+        "name": ColumnDefinition("name", "TEXT", lambda: "John"),
+        "age": ColumnDefinition("age", "INT", lambda: 30, reserved=True),
+    }
+    manager = SchemaManager(MagicMock(), "public", "users", columns)
+    manager.add_column = MagicMock(return_value=None)
+    manager.drop_column = MagicMock(return_value=None)
+    manager.apply_action = MagicMock()
+    evolver = EvolutionController(
+        manager, evolution_interval=1, evolution_probability=1.0,
+        rng=random.Random(2)
+    )
+
+    assert [evolver.evolve(batch) for batch in range(1, 9)] == [None] * 8
+    assert manager.add_column.called and manager.drop_column.called
+    manager.apply_action.assert_not_called()
+    assert evolver.num_additions == evolver.num_drops == 0
+
+
+def test_weighted_drops_name_the_column_they_drop():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+        "name": ColumnDefinition("name", "TEXT", lambda: "John"),
+        "age": ColumnDefinition("age", "INT", lambda: 30),
+    }
+    manager = SchemaManager(conn, "public", "users", columns)
+    evolver = EvolutionController(
+        manager, evolution_interval=1, evolution_probability=1.0,
+        action_weights={"drop": 1.0}, rng=random.Random(5)
+    )
+
+    message = evolver.evolve(1)
+
+    dropped = evolver.evolution_log[0]["column"]
+    assert message == f"[v2] Dropped column: {dropped}"
+    assert f"DROP COLUMN {dropped};" in cursor.execute.call_args_list[-1][0][0]
+    assert list(manager.active_columns) == [
+        name for name in ("id", "name", "age") if name != dropped
+    ]
+    assert evolver.num_drops == 1
+
+
+def test_combined_evolution_follows_action_weights():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+        "name": ColumnDefinition("name", "TEXT", lambda: "John"),
+        "age": ColumnDefinition("age", "INT", lambda: 30),
+        "email": ColumnDefinition("email", "TEXT", lambda: "a@b", reserved=True),
+    }
+    manager = SchemaManager(conn, "public", "users", columns)
+    evolver = EvolutionController(
+        manager,
+        evolution_interval=1,
+        evolution_probability=1.0,
+        actions_per_evolution=3,
+        action_weights={"rename": 1.0},
+        rng=random.Random(3),
+    )
+
+    message = evolver.evolve(1)
+
+    assert [entry["action"] for entry in evolver.evolution_log] == ["rename"] * 3
+    assert message.count("Renamed column: ") == 3
+    assert "email" not in manager.active_columns
+    assert evolver.num_additions == evolver.num_drops == 0
+
+
+def test_unknown_action_weight_is_rejected():
+    manager = SchemaManager(MagicMock(), "public", "users", {})
+    with pytest.raises(ValueError):
+        EvolutionController(manager, action_weights={"truncate": 1.0})
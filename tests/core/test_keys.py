@@ -0,0 +1,73 @@
+import random
+import time
+import uuid
+
+import pytest
+
+from kroft.core.keys import LiveKeyIndex, key_type_for
+
+
+def test_uuid_keys_are_packed_and_round_trip():
+    keys = [str(uuid.uuid4()) for _ in range(100)]
+    index = LiveKeyIndex("uuid")
+    index.add(keys)
+
+    assert len(index) == 100
+    assert index.nbytes() == 1600
+    assert set(index.sample(100)) == set(keys)
+
+
+def test_take_removes_keys_so_they_are_never_sampled_again():
+    index = LiveKeyIndex("int")
+    index.add(range(1000))
+
+    taken = index.take(300, random.Random(1))
+    remaining = index.sample(1000)
+
+    assert len(set(taken)) == 300
+    assert len(index) == 700
+    assert set(remaining) == set(range(1000)) - set(taken)
+
+
+def test_discard_requires_position_tracking():
+    index = LiveKeyIndex("text")
+    index.add(["a", "b", "c"])
+    with pytest.raises(ValueError):
+        index.discard(["a"])
+
+    tracked = LiveKeyIndex("text", track_positions=True)
+    tracked.add(["a", "b", "c"])
+    tracked.discard(["a", "missing"])
+    tracked.discard(["c"])
+    assert tracked.sample(3) == ["b"]
+
+
+def test_skewed_sampling_favours_recent_keys():
+    index = LiveKeyIndex("int", skew=1.2)
+    index.add(range(10_000))
+    rng = random.Random(7)
+
+    picks = [key for _ in range(200) for key in index.sample(5, rng)]
+
+    recent = sum(1 for key in picks if key >= 9_000)
+    assert recent > len(picks) // 2
+
+
+def test_steeply_skewed_samples_of_a_large_index_stay_fast():
+    index = LiveKeyIndex("int", skew=3.0)
+    index.add(range(1_000_000))
+    rng = random.Random(3)
+
+    started = time.perf_counter()
+    picks = index.sample(5_000, rng)
+    assert time.perf_counter() - started < 1.0
+
+    assert len(set(picks)) == 5_000
+    # The hottest keys are still in, the rest is topped up uniformly
+    assert 999_999 in picks
+
+
+def test_key_type_for_maps_sql_types():
+    assert key_type_for("UUID") == "uuid"
+    assert key_type_for("bigint") == "int"
+    assert key_type_for("VARCHAR(36)") == "text"
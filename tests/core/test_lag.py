@@ -0,0 +1,124 @@
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from kroft.core.batch import BatchGenerator
+from kroft.core.column import ColumnDefinition
+from kroft.core.lag import FileTailConsumer, LagConsumer, LagTracker, SlotConsumer
+from kroft.core.metrics import Metrics
+from kroft.core.mutator import MutationEngine
+from kroft.core.sinks import JsonLinesSink
+
+
+def test_tracker_reports_lag_percentiles_per_window():
+    metrics = Metrics()
+    tracker = LagTracker(window=1.0, metrics=metrics)
+    stamps = tracker.stamp(3)
+    emitted = int(stamps[0].split(":")[1])
+
+    assert [s.split(":")[0] for s in stamps] == ["1", "2", "3"]
+    assert tracker.observe(stamps[0], emitted + 2_000_000) == 0.002
+    tracker.observe(stamps[1], emitted + 50_000_000)
+    assert tracker.observe("garbage") is None
+
+    report = tracker.report()
+    assert report["issued"] == 3
+    assert report["matched"] == 2
+    assert report["pending"] == 1
+    assert 1.9 < report["p50_ms"] < 2.2
+    assert 45 < report["p99_ms"] <= 50
+    assert sum(w["matched"] for w in report["windows"]) == 2
+    assert metrics.operations["replication_lag"].count == 2
+
+
+def engine(conn, tracker, **kwargs):
+    generator = BatchGenerator({
+        "id": ColumnDefinition("id", "INT", lambda: 1, protected=True),
+        "qty": ColumnDefinition("qty", "INT", lambda: 2),
+        tracker.column: tracker.column_definition(),
+    })
+    return MutationEngine(
+        conn, "public", "sales",
+        generator=generator, lag_tracker=tracker, rng=random.Random(2), **kwargs
+    )
+
+
+def test_file_tail_matches_stamped_inserts_and_updates(tmp_path):
+    path = str(tmp_path / "changes.jsonl")
+    tracker = LagTracker()
+    sink = JsonLinesSink(path)
+    mutator = engine(None, tracker, sinks=[sink], emit_sql=False)
+    consumer = FileTailConsumer(path, tracker)
+
+    ids = mutator.insert_batch({"id": [1, 2, 3], "qty": [1, 1, 1]})
+    mutator._update_records(ids[:2])
+    mutator._delete_records(ids[2:])
+    sink.flush()
+
+    assert consumer.poll() == 5
+    assert consumer.poll() == 0
+    assert tracker.report()["pending"] == 0
+
+
+def test_updates_set_the_stamp_column():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    tracker = LagTracker()
+
+    engine(conn, tracker)._update_records([7])
+
+    query, params = cursor.execute.call_args[0]
+    assert "Identifier('kroft_lag_stamp')" in str(query)
+    assert params[0] == 2 and params[2] == 7
+    assert params[1].startswith("1:")
+
+
+def test_slot_consumer_reads_stamps_from_test_decoding_output():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    cursor.fetchone.return_value = None
+    tracker = LagTracker()
+    old, new = tracker.stamp(2)
+
+    consumer = SlotConsumer(conn, tracker)
+    cursor.fetchall.return_value = [
+        ("BEGIN 100",),
+        (f"table public.sales: INSERT: id[integer]:1 kroft_lag_stamp[text]:'{new}'",),
+        (
+            "table public.sales: UPDATE: old-key: id[integer]:1 "
+            f"kroft_lag_stamp[text]:'{old}' new-tuple: id[integer]:1 "
+            f"kroft_lag_stamp[text]:'{new}'",
+        ),
+        ("table public.sales: DELETE: id[integer]:2",),
+        ("COMMIT 100",),
+    ]
+
+    assert consumer.poll() == 2
+    created = [c for c in cursor.execute.call_args_list if "create" in str(c)]
+    assert created
+
+
+def test_background_consumer_drains_on_stop(tmp_path):
+    path = str(tmp_path / "changes.jsonl")
+    tracker = LagTracker()
+    consumer = FileTailConsumer(path, tracker, interval=0.01).start()
+    with JsonLinesSink(path) as sink:
+        engine(None, tracker, sinks=[sink], emit_sql=False).insert_batch(
+            {"id": [1, 2], "qty": [1, 1]}
+        )
+    time.sleep(0.02)
+    consumer.stop()
+
+    assert tracker.report()["matched"] == 2
+
+
+def test_consumers_must_implement_poll():
+    class NoPoll(LagConsumer):
+        pass
+
+    with pytest.raises(TypeError):
+        NoPoll(LagTracker())
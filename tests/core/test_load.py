@@ -0,0 +1,105 @@
+import pytest
+
+from kroft.core.load import (
+    BurstProfile,
+    ConstantProfile,
+    LoadProfile,
+    LoadScheduler,
+    RampProfile,
+    SineProfile,
+    StepProfile,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0.0)
+
+
+def test_profiles_compute_expected_rates():
+    assert ConstantProfile(500).rate(12) == 500
+
+    ramp = RampProfile(100, 20_100, duration=600)
+    assert ramp.rate(0) == 100
+    assert ramp.rate(300) == pytest.approx(10_100)
+    assert ramp.rate(900) == 20_100
+
+    steps = StepProfile([(10, 100), (10, 500)])
+    assert [steps.rate(t) for t in (0, 9.9, 10, 25)] == [100, 100, 500, 500]
+
+    sine = SineProfile(mean=1000, amplitude=500, period=60)
+    assert sine.rate(15) == pytest.approx(1500)
+    assert sine.rate(45) == pytest.approx(500)
+
+    burst = BurstProfile(base_rate=100, burst_rate=5000, interval=60, burst_duration=5)
+    assert [burst.rate(t) for t in (1, 30, 61)] == [5000, 100, 5000]
+
+
+def test_profiles_must_implement_rate():
+    class NoRate(LoadProfile):
+        pass
+
+    with pytest.raises(TypeError):
+        LoadProfile()
+    with pytest.raises(TypeError):
+        NoRate()
+
+
+def test_token_bucket_reservations_space_out_callers():
+    clock = FakeClock()
+    bucket = TokenBucket(ConstantProfile(100), burst_seconds=1.0, clock=clock)
+
+    assert bucket.reserve(50) == pytest.approx(0.5)
+    assert bucket.reserve(50) == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert bucket.reserve(1) == pytest.approx(0.01)
+
+
+def test_token_bucket_caps_burst_and_handles_zero_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(ConstantProfile(100), burst_seconds=0.5, clock=clock)
+    clock.now += 60
+    assert bucket.take(1000) == 50
+
+    idle = TokenBucket(ConstantProfile(0), clock=clock)
+    assert idle.reserve(10) is None
+    assert idle.take(10) == 0
+
+
+def test_scheduler_adapts_batch_size_to_target_rate():
+    scheduler = LoadScheduler(
+        RampProfile(100, 100_000, duration=1e9),
+        batch_interval=0.1,
+        min_batch_size=20,
+        max_batch_size=5_000,
+    )
+    assert scheduler.next_batch_size() == 20
+
+    scheduler = LoadScheduler(ConstantProfile(1_000_000), max_batch_size=5_000)
+    assert scheduler.next_batch_size() == 5_000
+
+
+def test_scheduler_reports_achieved_against_requested():
+    clock = FakeClock()
+    scheduler = LoadScheduler(
+        ConstantProfile(2_000), batch_interval=0.01, clock=clock, sleep=clock.sleep
+    )
+    scheduler.start()
+    for _ in range(5):
+        size = scheduler.next_batch_size()
+        scheduler.wait(size)
+        scheduler.record(size)
+
+    report = scheduler.report()
+    assert report["achieved_rows"] == 100
+    assert report["elapsed_s"] == pytest.approx(0.05)
+    assert report["achieved_rate"] == pytest.approx(2_000)
+    assert report["ratio"] == pytest.approx(1.0)
@@ -0,0 +1,83 @@
+import json
+import urllib.request
+
+import pytest
+
+from kroft.core.metrics import JsonLinesExporter, Metrics, serve_prometheus
+
+
+def test_record_tracks_totals_and_percentiles():
+    metrics = Metrics()
+    for ms in range(1, 101):
+        metrics.record("insert", ms / 1000, rows=10, bytes_sent=100, statements=1)
+
+    snapshot = metrics.snapshot()["operations"]["insert"]
+
+    assert snapshot["count"] == 100
+    assert snapshot["rows"] == 1000
+    assert snapshot["bytes_sent"] == 10_000
+    assert snapshot["statements_per_batch"] == 1
+    assert snapshot["p50_ms"] == pytest.approx(50, rel=0.1)
+    assert snapshot["p99_ms"] == pytest.approx(99, rel=0.1)
+    assert snapshot["max_ms"] == pytest.approx(100)
+
+
+def test_timer_records_sample_fields():
+    metrics = Metrics()
+    with metrics.timer("update") as sample:
+        sample.rows = 5
+        sample.statements = 2
+
+    stats = metrics.operations["update"]
+    assert (stats.count, stats.rows, stats.statements) == (1, 5, 2)
+    assert stats.seconds > 0
+
+
+def test_prometheus_text_has_histogram_and_counters():
+    metrics = Metrics()
+    metrics.record("delete", 0.002, rows=3, statements=1)
+
+    text = metrics.to_prometheus()
+
+    assert 'kroft_operation_seconds_bucket{op="delete",le="0.001"} 0' in text
+    assert 'kroft_operation_seconds_bucket{op="delete",le="0.0025"} 1' in text
+    assert 'kroft_operation_seconds_count{op="delete"} 1' in text
+    assert 'kroft_rows_total{op="delete"} 3' in text
+
+
+def test_json_lines_exporter_writes_snapshot_on_stop(tmp_path):
+    metrics = Metrics()
+    metrics.record("insert", 0.01, rows=1)
+    path = tmp_path / "metrics.jsonl"
+
+    with JsonLinesExporter(metrics, str(path), interval=60):
+        pass
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["operations"]["insert"]["rows"] == 1
+
+
+def test_serve_prometheus_exposes_metrics_endpoint():
+    metrics = Metrics()
+    metrics.record("ddl", 0.1, statements=1)
+    server = serve_prometheus(metrics, port=0, addr="127.0.0.1")
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+            body = resp.read().decode()
+    finally:
+        server.shutdown()
+
+    assert 'kroft_statements_total{op="ddl"} 1' in body
+
+
+def test_gauges_track_last_mean_and_max():
+    metrics = Metrics()
+    for depth in (0, 4, 2):
+        metrics.observe("pipeline_queue", depth)
+
+    assert metrics.snapshot()["gauges"]["pipeline_queue"] == {
+        "last": 2, "mean": 2.0, "max": 4
+    }
+    assert 'kroft_gauge{name="pipeline_queue"} 2' in metrics.to_prometheus()
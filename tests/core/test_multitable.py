@@ -0,0 +1,156 @@
+import itertools
+import random
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from kroft.core.batch import BatchGenerator
+from kroft.core.column import ColumnDefinition
+from kroft.core.multitable import MultiTableSimulation, TableSpec
+from kroft.core.mutator import MutationEngine
+from kroft.core.schema import SchemaManager
+from kroft.core.transactions import TransactionPolicy
+
+
+def make_table(name, columns, weight=1.0, foreign_keys=None, **kwargs):
+    conn = MagicMock()
+    schema_mgr = SchemaManager(conn, "public", name, columns)
+    mutator = MutationEngine(
+        conn, "public", name,
+        generator=BatchGenerator(columns),
+        insert_strategy="copy",
+        track_keys=True,
+    )
+    return TableSpec(
+        schema_mgr, mutator, weight=weight, foreign_keys=foreign_keys, **kwargs
+    )
+
+
+def int_ids():
+    counter = itertools.count(1)
+    return ColumnDefinition("id", "BIGINT", lambda: next(counter))
+
+
+def test_child_rows_reference_live_parent_keys():
+    customers = make_table(
+        "customers",
+        {"id": int_ids(), "name": ColumnDefinition("name", "TEXT", lambda: "Ada")},
+        delete_fraction=0.0,
+    )
+    orders = make_table(
+        "orders",
+        {
+            "id": int_ids(),
+            "customer_id": ColumnDefinition(
+                "customer_id", "BIGINT", lambda: None, protected=True
+            ),
+        },
+        weight=3.0,
+        foreign_keys={"customer_id": customers},
+    )
+    written = []
+    insert = orders.mutator.insert_batch
+    orders.mutator.insert_batch = lambda batch: (
+        written.extend(batch["customer_id"]) or insert(batch)
+    )
+
+    simulation = MultiTableSimulation(
+        [customers, orders], total_batches=40, batch_size=10, workers=4, seed=3
+    )
+    simulation.run()
+
+    summary = simulation.summary()
+    assert summary["public.customers"]["batches"] >= 1
+    assert summary["public.orders"]["batches"] > summary["public.customers"]["batches"]
+    assert sum(table["batches"] for table in summary.values()) == 40
+    customer_ids = set(customers.mutator.live_keys.sample(10_000))
+    assert written and set(written) <= customer_ids
+
+
+def test_weighted_pick_follows_weights():
+    light = make_table("light", {"id": int_ids()}, weight=1.0)
+    heavy = make_table("heavy", {"id": int_ids()}, weight=9.0)
+    simulation = MultiTableSimulation([light, heavy], total_batches=0)
+    rng = random.Random(0)
+
+    picks = [simulation.pick_table(rng) for _ in range(1000)]
+
+    assert 850 < picks.count(heavy) < 950
+
+
+def test_parent_must_track_keys():
+    parent = make_table("parent", {"id": int_ids()})
+    parent.mutator.live_keys = None
+    child = make_table("child", {"id": int_ids()}, foreign_keys={"pid": parent})
+
+    with pytest.raises(ValueError):
+        MultiTableSimulation([parent, child], total_batches=1)
+
+
+def test_parent_deletes_wait_for_child_inserts_using_their_keys():
+    parent = make_table(
+        "parent", {"id": int_ids()}, update_fraction=0.0, delete_fraction=1.0
+    )
+    child = make_table(
+        "child",
+        {
+            "id": int_ids(),
+            "parent_id": ColumnDefinition(
+                "parent_id", "BIGINT", lambda: None, protected=True
+            ),
+        },
+        foreign_keys={"parent_id": parent},
+    )
+    parent.mutator.live_keys.add(range(1, 11))
+    simulation = MultiTableSimulation([parent, child], total_batches=0, batch_size=5)
+
+    events = []
+    inserting = threading.Event()
+    release = threading.Event()
+    insert = child.mutator.insert_batch
+
+    def slow_insert(batch):
+        events.append(("insert", set(batch["parent_id"])))
+        inserting.set()
+        release.wait(5)
+        return insert(batch)
+
+    child.mutator.insert_batch = slow_insert
+    delete = parent.mutator._delete_records
+    parent.mutator._delete_records = lambda ids: (
+        events.append(("delete", set(ids))) or delete(ids)
+    )
+
+    writer = threading.Thread(target=simulation._write_batch, args=(child, None))
+    writer.start()
+    assert inserting.wait(5)
+    deleter = threading.Thread(
+        target=simulation._mutate, args=(parent, list(range(1, 11)), None)
+    )
+    deleter.start()
+    time.sleep(0.05)
+    # The delete is held back while the child's insert is in flight
+    assert [kind for kind, _ in events] == ["insert"]
+
+    release.set()
+    writer.join(5)
+    deleter.join(5)
+    assert [kind for kind, _ in events] == ["insert", "delete"]
+    assert not len(parent.mutator.live_keys)
+
+
+def test_keys_are_published_when_their_transaction_commits():
+    table = make_table("parent", {"id": int_ids()})
+    table.mutator.transaction_policy = TransactionPolicy(batches_per_commit=2)
+
+    table.mutator.insert_batch({"id": [1, 2]})
+    assert not len(table.mutator.live_keys)
+    table.mutator.insert_batch({"id": [3]})
+    assert sorted(table.mutator.live_keys.sample(10)) == [1, 2, 3]
+
+    table.mutator.insert_batch({"id": [4]})
+    table.mutator.rollback()
+    table.mutator.commit()
+    assert len(table.mutator.live_keys) == 3
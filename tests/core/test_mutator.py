@@ -1,8 +1,16 @@
+import random
+import struct
+import uuid
 from unittest.mock import MagicMock, patch
 
+import pytest
+from psycopg2 import sql
+
 from kroft.core.batch import BatchGenerator
 from kroft.core.column import ColumnDefinition
 from kroft.core.mutator import MutationEngine
+from kroft.core.schema import SchemaManager
+from kroft.core.transactions import TransactionPolicy
 
 
 @patch("kroft.core.mutator.execute_values")
@@ -31,7 +39,7 @@ def test_insert_batch_inserts_rows_and_tracks_count(mock_execute_values):
 
 @patch("kroft.core.mutator.random.sample", return_value=["id1"])
 @patch("kroft.core.mutator.random")
-def test_maybe_mutate_batch_calls_update_or_delete(mock_random, mock_sample):
+def test_maybe_mutate_batch_calls_update_or_delete(mock_random, mock_sample, capsys):
     mock_random.random.return_value = 0.1
     mock_random.choice.side_effect = ["update", "name"]  # operation, column
 
@@ -60,6 +68,9 @@ def test_maybe_mutate_batch_calls_update_or_delete(mock_random, mock_sample):
     assert updated > 0
     assert deleted == 0
     assert engine.total_updates == updated
+    # The mutation loop reports through Metrics, never stdout
+    assert capsys.readouterr().out == ""
+    assert engine.metrics.snapshot()["operations"]["update"]["rows"] == updated
 
 
 def test_update_records_with_and_without_update_column():
@@ -165,3 +176,354 @@ def test_update_skips_protected_and_reserved_columns(mock_random):
     assert updated == 1
     assert deleted == 0
 
+
+
+def test_insert_batch_copy_strategy_streams_rows_and_returns_ids():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    schema = {
+        "id": ColumnDefinition("id", "UUID", lambda: "id"),
+        "active": ColumnDefinition("active", "BOOLEAN", lambda: True),
+    }
+    engine = MutationEngine(
+        conn,
+        schema="public",
+        table_name="users",
+        generator=BatchGenerator(schema),
+        insert_strategy="copy",
+    )
+
+    rows = [{"id": "a", "active": True}, {"id": "b", "active": None}]
+    inserted_ids = engine.insert_batch(rows)
+
+    cursor.copy_expert.assert_called_once()
+    payload = cursor.copy_expert.call_args[0][1]
+    assert payload.getvalue() == "a\tt\nb\t\\N\n"
+    assert inserted_ids == ["a", "b"]
+    assert engine.total_inserts == 2
+    conn.commit.assert_called_once()
+
+
+def test_binary_copy_inserts_columns_retyped_to_numeric():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "id", protected=True),
+        "qty": ColumnDefinition("qty", "INT", lambda: 3),
+    }
+    manager = SchemaManager(conn, "public", "sales", columns)
+    engine = MutationEngine(
+        conn, "public", "sales",
+        generator=BatchGenerator(columns),
+        insert_strategy="copy_binary",
+    )
+    engine.track_schema(manager)
+
+    manager.alter_column_type("qty", "NUMERIC")
+    engine.insert_batch([{"id": str(uuid.uuid4()), "qty": 12345.5}])
+
+    payload = cursor.copy_expert.call_args[0][1].getvalue()
+    # Digits 1|2345.5000: weight 1, positive, display scale 1
+    numeric = struct.pack(">hhHh3h", 3, 1, 0, 1, 1, 2345, 5000)
+    assert struct.pack(">i", len(numeric)) + numeric in payload
+
+
+def test_mutation_engine_rejects_unknown_insert_strategy():
+    with pytest.raises(ValueError):
+        MutationEngine(MagicMock(), "public", "users", insert_strategy="bulk")
+
+
+@patch("kroft.core.mutator.execute_values")
+@patch("kroft.core.mutator.random")
+def test_batched_update_issues_one_statement_per_column(
+    mock_random, mock_execute_values
+):
+    mock_random.choice.side_effect = ["price", "quantity", "price", "price"]
+
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    schema = {
+        "id": ColumnDefinition("id", "UUID", lambda: "id"),
+        "price": ColumnDefinition("price", "FLOAT", lambda: 9.5),
+        "quantity": ColumnDefinition("quantity", "INT", lambda: 3),
+    }
+    engine = MutationEngine(
+        conn,
+        "public",
+        "sales",
+        update_column="updated_at",
+        generator=BatchGenerator(schema),
+        update_mode="batched",
+    )
+
+    updated = engine._update_records(["r1", "r2", "r3", "r4"])
+
+    assert updated == 4
+    assert mock_execute_values.call_count == 2
+    cursor.execute.assert_not_called()
+
+    price_call, quantity_call = mock_execute_values.call_args_list
+    assert price_call[0][2] == [("r1", 9.5), ("r3", 9.5), ("r4", 9.5)]
+    assert price_call[1]["page_size"] == 3
+    assert quantity_call[0][2] == [("r2", 3)]
+
+    assert engine.last_update_statements == 2
+    assert engine.get_counters()["update_statements"] == 2
+
+
+def sql_strings(composable):
+    """The literal SQL fragments of a psycopg2 composed query, in order."""
+    if isinstance(composable, sql.Composed):
+        return [s for part in composable.seq for s in sql_strings(part)]
+    return [composable.string] if isinstance(composable, sql.SQL) else []
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_batched_update_casts_serial_keys_to_their_integer_type(mock_execute_values):
+    conn = MagicMock()
+    schema = {
+        "id": ColumnDefinition("id", "BIGSERIAL", lambda: 1, constraints="PRIMARY KEY"),
+        "rank": ColumnDefinition("rank", "SERIAL", lambda: 2),
+    }
+    engine = MutationEngine(
+        conn, "public", "sales",
+        generator=BatchGenerator(schema),
+        update_mode="batched",
+    )
+
+    engine._update_records_batched([1, 2], ["rank"])
+
+    fragments = sql_strings(mock_execute_values.call_args[0][1])
+    assert "BIGINT" in fragments and "INTEGER" in fragments
+    assert not any("SERIAL" in fragment for fragment in fragments)
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_insert_batch_accepts_columnar_batches(mock_execute_values):
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    engine = MutationEngine(conn, schema="public", table_name="products")
+
+    inserted_ids = engine.insert_batch({"id": ["abc", "def"], "name": ["Hat", "Cap"]})
+
+    values = mock_execute_values.call_args[0][2]
+    assert values == [("abc", "Hat"), ("def", "Cap")]
+    assert inserted_ids == ["abc", "def"]
+    assert engine.total_inserts == 2
+    assert engine.insert_batch({}) == []
+
+
+class NumpyLikeArray:
+    """Iterates as NumPy arrays do: to scalars that are not plain ints."""
+
+    class Scalar(int):
+        pass
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def __iter__(self):
+        return (self.Scalar(value) for value in self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def tolist(self):
+        return list(self.values)
+
+
+def numpy_column(n):
+    try:
+        import numpy
+    except ImportError:
+        return NumpyLikeArray(range(n))
+    return numpy.arange(n)
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_row_dicts_from_numpy_batch_generators_hold_python_values(
+    mock_execute_values
+):
+    conn = MagicMock()
+    engine = MutationEngine(conn, schema="public", table_name="products")
+    generator = BatchGenerator({
+        "id": ColumnDefinition("id", "TEXT", lambda: "abc"),
+        "qty": ColumnDefinition(
+            "qty", "INTEGER", lambda: 0, batch_generator=numpy_column
+        ),
+    })
+
+    rows = generator.generate_batch(3)
+    engine.insert_batch(rows)
+
+    values = mock_execute_values.call_args[0][2]
+    assert [row[1] for row in values] == [0, 1, 2]
+    assert all(type(row[1]) is int for row in values)
+    assert all(type(row["qty"]) is int for row in rows)
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_insert_batch_writes_row_batches_without_copying(mock_execute_values):
+    conn = MagicMock()
+    engine = MutationEngine(conn, schema="public", table_name="products")
+    generator = BatchGenerator({
+        "id": ColumnDefinition("id", "TEXT", lambda: "abc"),
+        "name": ColumnDefinition("name", "TEXT", lambda: "Hat"),
+    })
+    batch = generator.generate_rows(3)
+
+    assert engine.insert_batch(batch) == ["abc"] * 3
+    assert mock_execute_values.call_args[0][2] is batch.rows
+
+
+def test_prepared_statements_are_cached_per_column_and_schema_version():
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    columns = {
+        "id": ColumnDefinition("id", "UUID", lambda: "id", protected=True),
+        "name": ColumnDefinition("name", "TEXT", lambda: "john"),
+        "age": ColumnDefinition("age", "INT", lambda: 30, reserved=True),
+    }
+    manager = SchemaManager(conn, "public", "users", columns)
+    engine = MutationEngine(
+        conn,
+        "public",
+        "users",
+        generator=BatchGenerator(manager.get_active_columns()),
+        use_prepared_statements=True,
+    )
+    engine.track_schema(manager)
+
+    engine._update_records(["id1", "id2", "id3"])
+    engine._delete_records(["id1"])
+    engine._delete_records(["id2"])
+
+    counters = engine.get_counters()
+    assert counters["prepared_misses"] == 2
+    assert counters["prepared_hits"] == 3
+
+    executed = [str(c[0][0]) for c in cursor.execute.call_args_list]
+    assert sum("PREPARE" in q for q in executed) == 2
+
+    # Adding a column bumps the schema version and invalidates the cache
+    manager.add_column()
+    assert engine.schema_version == 2
+    cursor.execute.reset_mock()
+
+    engine._delete_records(["id3"])
+
+    executed = [str(c[0][0]) for c in cursor.execute.call_args_list]
+    assert any("DEALLOCATE" in q for q in executed)
+    assert sum("PREPARE" in q for q in executed) == 1
+    assert engine.get_counters()["prepared_misses"] == 3
+
+
+def test_clone_binds_same_configuration_to_new_connection():
+    engine = MutationEngine(
+        MagicMock(),
+        "public",
+        "users",
+        update_column="updated_at",
+        update_mode="batched",
+    )
+    engine.total_inserts = 10
+
+    other_conn = MagicMock()
+    clone = engine.clone(other_conn)
+
+    assert clone.conn is other_conn
+    assert clone.update_column == "updated_at"
+    assert clone.update_mode == "batched"
+    assert clone.total_inserts == 0
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_operations_are_recorded_in_metrics(mock_execute_values):
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.query = b"INSERT ..."
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    schema = {"id": ColumnDefinition("id", "UUID", lambda: "id")}
+    engine = MutationEngine(
+        conn, "public", "users", generator=BatchGenerator(schema)
+    )
+
+    engine.insert_batch([{"id": str(i)} for i in range(250)])
+    engine._delete_records(["1", "2"])
+
+    operations = engine.metrics.snapshot()["operations"]
+    assert operations["insert"]["rows"] == 250
+    assert operations["insert"]["statements"] == 3
+    assert operations["insert"]["bytes_sent"] == 30
+    assert operations["delete"]["rows"] == 2
+    assert operations["delete"]["statements"] == 1
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_tracked_keys_let_deletes_target_earlier_batches(mock_execute_values):
+    conn = MagicMock()
+    generator = MagicMock()
+    generator.schema = {"id": ColumnDefinition("id", "INT", lambda: 1)}
+    engine = MutationEngine(
+        conn, "public", "sales", generator=generator, track_keys=True
+    )
+    engine._delete_records = MagicMock(side_effect=len)
+    rng = MagicMock(wraps=random.Random(3))
+    rng.random.return_value = 0.0
+    rng.choice.return_value = "delete"
+
+    engine.insert_batch([{"id": i} for i in range(8)])
+    engine.insert_batch([{"id": i} for i in range(8, 12)])
+    engine.maybe_mutate_batch([8, 9, 10, 11], rng)
+
+    deleted = engine._delete_records.call_args[0][0]
+    assert engine.live_keys.key_type == "int"
+    assert len(engine.live_keys) == 11
+    assert set(engine.live_keys.sample(20)).isdisjoint(deleted)
+    assert engine.clone(MagicMock()).live_keys is engine.live_keys
+
+
+@patch("kroft.core.mutator.execute_values")
+def test_transaction_policy_groups_batches_and_mutations(mock_execute_values):
+    conn = MagicMock()
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    generator = MagicMock()
+    generator.schema = {"id": ColumnDefinition("id", "UUID", lambda: "x")}
+    engine = MutationEngine(
+        conn, "public", "sales", generator=generator,
+        transaction_policy=TransactionPolicy(
+            batches_per_commit=2, synchronous_commit=False
+        ),
+    )
+
+    engine.insert_batch([{"id": "a"}])
+    engine._delete_records(["a"])
+    assert conn.commit.call_count == 0
+
+    engine.insert_batch([{"id": "b"}])
+    assert conn.commit.call_count == 1
+    cursor.execute.assert_any_call("SET LOCAL synchronous_commit = off")
+
+    engine.insert_batch([{"id": "c"}])
+    engine.commit()
+    assert engine.get_counters()["transactions"] == 2
+
+
+def test_transaction_policy_schedules_huge_transactions():
+    policy = TransactionPolicy(batches_per_commit=3, huge_every=4, huge_batches=50)
+
+    assert [policy.batches_for(n) for n in range(1, 9)] == [3, 3, 3, 50, 3, 3, 3, 50]
+    assert TransactionPolicy().batches_for(1) is None
+    with pytest.raises(ValueError):
+        TransactionPolicy(batches_per_commit=0)
@@ -0,0 +1,47 @@
+import random
+
+from kroft.core.rng import RandomStreams, required_positional_args
+
+
+def test_streams_are_reproducible_from_seed():
+    a = RandomStreams(42).stream("column", "price")
+    b = RandomStreams(42).stream("column", "price")
+
+    assert [a.random() for _ in range(5)] == [b.random() for _ in range(5)]
+
+
+def test_streams_do_not_depend_on_creation_order():
+    first = RandomStreams(7)
+    first.stream("column", "name").random()
+    value = first.stream("column", "price").random()
+
+    assert RandomStreams(7).stream("column", "price").random() == value
+
+
+def test_spawned_trees_are_independent():
+    root = RandomStreams(1)
+    one = root.spawn("batch", 1).stream("mutation").random()
+    two = root.spawn("batch", 2).stream("mutation").random()
+
+    assert one != two
+    assert root.spawn("batch", 1).stream("mutation").random() == one
+    assert RandomStreams(2).spawn("batch", 1).stream("mutation").random() != one
+
+
+def test_state_round_trip_resumes_streams():
+    streams = RandomStreams(3)
+    streams.stream("evolution").random()
+    state = streams.getstate()
+    expected = streams.stream("evolution").random()
+
+    restored = RandomStreams(3)
+    restored.setstate(state)
+
+    assert restored.stream("evolution").random() == expected
+
+
+def test_required_positional_args():
+    assert required_positional_args(lambda: 1) == 0
+    assert required_positional_args(lambda rng: 1) == 1
+    assert required_positional_args(lambda n, rng=None: 1) == 1
+    assert required_positional_args(random.Random(0).random) == 0
@@ -1,7 +1,17 @@
+import threading
+import uuid
 from unittest.mock import MagicMock
 
+import pytest
+
+from kroft.core.batch import BatchGenerator
 from kroft.core.column import ColumnDefinition
+from kroft.core.load import ConstantProfile, LoadScheduler, TokenBucket
+from kroft.core.mutator import MutationEngine
 from kroft.core.runner import SimulationRunner
+from kroft.core.schema import SchemaManager
+from kroft.core.sinks import ChangeSink
+from tests.core.test_load import FakeClock
 
 
 def test_simulation_runner_generates_batches_and_mutates():
@@ -9,7 +19,7 @@ def test_simulation_runner_generates_batches_and_mutates():
     mutator = MagicMock()
 
     # Simulate 2 active columns
-    schema_mgr.columns = {
+    schema_mgr.view.active = {
         "id": ColumnDefinition("id", "UUID", lambda: "abc"),
         "name": ColumnDefinition("name", "TEXT", lambda: "John")
     }
@@ -38,7 +48,7 @@ def test_simulation_runner_triggers_schema_evolution():
     schema_mgr = MagicMock()
     mutator = MagicMock()
 
-    schema_mgr.columns = {
+    schema_mgr.view.active = {
         "id": ColumnDefinition("id", "UUID", lambda: "abc"),
         "name": ColumnDefinition("name", "TEXT", lambda: "John")
     }
@@ -68,7 +78,7 @@ def test_simulation_runner_triggers_schema_evolution():
 def test_simulation_runner_skips_when_zero_records():
     schema_mgr = MagicMock()
     mutator = MagicMock()
-    schema_mgr.columns = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
 
     runner = SimulationRunner(
         schema_mgr=schema_mgr,
@@ -88,7 +98,7 @@ def test_simulation_runner_skips_when_zero_records():
 def test_simulation_runner_handles_empty_insert_batch():
     schema_mgr = MagicMock()
     mutator = MagicMock()
-    schema_mgr.columns = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
     mutator.insert_batch.return_value = []  # Simulate empty insert
 
     runner = SimulationRunner(
@@ -107,7 +117,7 @@ def test_simulation_runner_handles_empty_insert_batch():
 def test_simulation_runner_does_not_drop_protected_columns():
     schema_mgr = MagicMock()
     mutator = MagicMock()
-    schema_mgr.columns = {
+    schema_mgr.view.active = {
         "id": ColumnDefinition("id", "UUID", lambda: "abc"),
         "created_at": ColumnDefinition("created_at", "TIMESTAMP", lambda: "now"),
         "customer": ColumnDefinition("customer", "TEXT", lambda: "Alice")
@@ -135,4 +145,417 @@ def test_simulation_runner_does_not_drop_protected_columns():
     for call in args:
         protected = call[0][0]
         assert "id" in protected
-        assert "created_at" in protected
\ No newline at end of file
+        assert "created_at" in protected
+
+def test_simulation_runner_columnar_mode_passes_column_arrays():
+    schema_mgr = MagicMock()
+    mutator = MagicMock()
+    schema_mgr.view.active = {
+        "id": ColumnDefinition(
+            "id", "INT", lambda: -1, batch_generator=lambda n: list(range(n))
+        ),
+        "name": ColumnDefinition("name", "TEXT", lambda: "John"),
+    }
+    mutator.insert_batch.return_value = [0, 1, 2]
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=3,
+        batch_size=3,
+        enable_schema_evolution=False,
+        columnar=True,
+    )
+
+    runner.run()
+
+    mutator.insert_batch.assert_called_once_with(
+        {"id": [0, 1, 2], "name": ["John", "John", "John"]}
+    )
+
+
+def test_simulation_runner_parallel_workers_split_batches_and_aggregate():
+    schema_mgr = MagicMock()
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    mutator = MagicMock()
+    connections = []
+    engines = []
+
+    def connect():
+        conn = MagicMock()
+        connections.append(conn)
+        return conn
+
+    def clone(conn):
+        engine = MagicMock()
+        engine.use_prepared_statements = False
+        engine.insert_batch.return_value = []
+        engine.get_counters.side_effect = lambda: {
+            "total_inserts": engine.insert_batch.call_count
+        }
+        engines.append(engine)
+        return engine
+
+    mutator.clone.side_effect = clone
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=40,
+        batch_size=5,
+        enable_schema_evolution=True,
+        evolution_interval=2,
+        evolution_probability=1.0,
+        add_probability=1.0,
+        workers=3,
+        connection_factory=connect,
+    )
+
+    runner.run()
+
+    assert len(connections) == 3
+    assert all(conn.close.called for conn in connections)
+    assert sum(e.insert_batch.call_count for e in engines) == 8
+    assert runner.get_counters() == {"total_inserts": 8}
+    assert schema_mgr.add_column.call_count == 4
+    mutator.insert_batch.assert_not_called()
+
+
+def test_simulation_runner_parallel_requires_connection_factory():
+    with pytest.raises(ValueError):
+        SimulationRunner(
+            schema_mgr=MagicMock(),
+            mutator=MagicMock(),
+            column_registry={},
+            workers=2,
+        )
+
+
+def test_simulation_runner_prints_rolling_throughput_line(capsys):
+    schema_mgr = MagicMock()
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    mutator = MagicMock()
+    mutator.insert_batch.return_value = ["a", "b"]
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=4,
+        batch_size=2,
+        enable_schema_evolution=True,
+        evolution_interval=1,
+        evolution_probability=1.0,
+        add_probability=1.0,
+        report_interval=3600,
+    )
+    schema_mgr.add_column.return_value = "discount"
+
+    runner.run()
+
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith("[2/2 batches] 4 rows |")
+    assert "rows/s" in lines[0]
+    assert lines[0].endswith("+discount, +discount")
+    assert runner.metrics.snapshot()["operations"]["generate"]["count"] == 2
+
+
+def test_simulation_runner_paces_batches_with_load_profile():
+    schema_mgr = MagicMock()
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "INT", lambda: 1)}
+    mutator = MagicMock()
+    mutator.insert_batch.side_effect = lambda rows: [r["id"] for r in rows]
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=230,
+        batch_size=100,
+        enable_schema_evolution=False,
+        load_profile=ConstantProfile(5_000),
+        update_profile=ConstantProfile(0),
+        report_interval=3600,
+    )
+    # Pace on a fake clock so the test checks the pacing, not machine speed
+    clock = FakeClock()
+    runner.load_scheduler = LoadScheduler(
+        ConstantProfile(5_000), max_batch_size=100, clock=clock, sleep=clock.sleep
+    )
+    runner.update_bucket = TokenBucket(
+        ConstantProfile(0), burst_seconds=1.0, clock=clock
+    )
+
+    runner.run()
+
+    sizes = [len(c[0][0]) for c in mutator.insert_batch.call_args_list]
+    assert sum(sizes) == 230
+    assert max(sizes) <= 100
+    for call in mutator._update_records.call_args_list:
+        assert call[0][0] == []
+
+    report = runner.load_report()
+    assert report["insert"]["achieved_rows"] == 230
+    assert report["insert"]["elapsed_s"] == pytest.approx(230 / 5_000)
+    assert report["insert"]["achieved_rate"] == pytest.approx(5_000)
+    assert report["update"]["achieved_rows"] == 0
+
+
+def test_seeded_parallel_run_reproduces_the_same_data():
+    def run_once():
+        schema_mgr = MagicMock()
+        schema_mgr.view.active = {
+            "id": ColumnDefinition("id", "INT", lambda rng: rng.randint(0, 10**9)),
+            "score": ColumnDefinition("score", "FLOAT", lambda rng: rng.random()),
+        }
+        mutator = MagicMock()
+        inserted = []
+        updated = []
+
+        def clone(conn):
+            engine = MagicMock()
+            engine.use_prepared_statements = False
+
+            def insert(batch):
+                inserted.append(tuple(batch[0].items()))
+                return [row["id"] for row in batch]
+
+            engine.insert_batch.side_effect = insert
+            engine._update_records.side_effect = lambda ids, rng: (
+                updated.append(tuple(ids)) or len(ids)
+            )
+            engine._delete_records.return_value = 0
+            engine.get_counters.return_value = {}
+            return engine
+
+        mutator.clone.side_effect = clone
+        SimulationRunner(
+            schema_mgr=schema_mgr,
+            mutator=mutator,
+            column_registry={},
+            total_records=200,
+            batch_size=10,
+            enable_schema_evolution=False,
+            workers=4,
+            connection_factory=MagicMock,
+            seed=1234,
+        ).run()
+        return sorted(inserted), sorted(updated)
+
+    assert run_once() == run_once()
+
+
+def test_pipelined_runner_writes_every_generated_batch():
+    schema_mgr = MagicMock()
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    mutator = MagicMock()
+    mutator.insert_batch.side_effect = lambda batch: [row["id"] for row in batch]
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=50,
+        batch_size=5,
+        enable_schema_evolution=True,
+        evolution_interval=5,
+        evolution_probability=1.0,
+        add_probability=1.0,
+        pipeline_depth=2,
+        generator_threads=2,
+    )
+
+    runner.run()
+
+    assert mutator.insert_batch.call_count == 10
+    assert schema_mgr.add_column.call_count == 2
+    snapshot = runner.metrics.snapshot()
+    assert snapshot["gauges"]["pipeline_queue"]["max"] <= 2
+    assert snapshot["operations"]["queue_get_wait"]["count"] == 11
+    assert snapshot["operations"]["queue_put_wait"]["count"] == 10
+
+
+def test_pipelined_runner_surfaces_writer_failures():
+    schema_mgr = MagicMock()
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    mutator = MagicMock()
+    mutator.insert_batch.side_effect = RuntimeError("connection lost")
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=100,
+        batch_size=5,
+        enable_schema_evolution=False,
+        pipeline_depth=1,
+    )
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        runner.run()
+    assert mutator.insert_batch.call_count == 1
+
+
+def test_history_scope_mutates_keys_from_the_live_index():
+    schema_mgr = MagicMock()
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    mutator = MagicMock()
+    mutator.insert_batch.side_effect = lambda batch: list(range(len(batch)))
+    mutator.live_keys.take.return_value = ["old-1"]
+    mutator.live_keys.sample.return_value = ["old-2", "old-3"]
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=10,
+        batch_size=10,
+        enable_schema_evolution=False,
+        mutation_scope="history",
+    )
+    runner.run()
+
+    mutator.live_keys.take.assert_called_once_with(1, None)
+    mutator.live_keys.sample.assert_called_once_with(2, None)
+    assert mutator._update_records.call_args[0][0] == ["old-2", "old-3"]
+    mutator._delete_records.assert_called_once_with(["old-1"])
+
+
+def test_history_scope_requires_tracked_keys():
+    mutator = MagicMock()
+    mutator.live_keys = None
+    with pytest.raises(ValueError):
+        SimulationRunner(MagicMock(), mutator, {}, mutation_scope="history")
+
+
+def test_open_transactions_are_committed_before_schema_evolution():
+    calls = MagicMock()
+    schema_mgr = calls.schema_mgr
+    schema_mgr.view.active = {"id": ColumnDefinition("id", "UUID", lambda: "abc")}
+    mutator = calls.mutator
+    mutator.insert_batch.return_value = []
+
+    SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry={},
+        total_records=2,
+        batch_size=1,
+        evolution_interval=2,
+        evolution_probability=1.0,
+        add_probability=1.0,
+    ).run()
+
+    names = [name for name, _, _ in calls.mock_calls]
+    evolve = names.index("schema_mgr.add_column")
+    assert names[evolve - 1] == "mutator.commit"
+    assert names[-1] == "mutator.commit"
+
+
+class RecordingSink(ChangeSink):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def _write(self, op, columns, rows, schema_version, table_schema, first_seq):
+        self.events.append((op, schema_version, columns))
+
+
+def test_serial_runs_never_update_dropped_columns():
+    columns = {
+        "id": ColumnDefinition(
+            "id", "UUID", lambda: str(uuid.uuid4()), protected=True
+        ),
+        "a": ColumnDefinition("a", "INT", lambda: 1),
+        "b": ColumnDefinition("b", "INT", lambda: 2),
+        "c": ColumnDefinition("c", "INT", lambda: 3),
+    }
+    schema_mgr = SchemaManager(MagicMock(), "public", "sales", columns)
+    sink = RecordingSink()
+    mutator = MutationEngine(
+        None, "public", "sales",
+        generator=BatchGenerator(columns), sinks=[sink], emit_sql=False
+    )
+
+    SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry=columns,
+        total_records=100,
+        batch_size=10,
+        evolution_interval=2,
+        evolution_probability=1.0,
+        add_probability=0.0,
+        seed=3,
+    ).run()
+
+    # a, b and c are dropped one at a time
+    assert schema_mgr.schema_version == 4
+    assert mutator.schema_version == mutator.generator.schema_version == 4
+    updates = [
+        (version, names) for op, version, names in sink.events if op == "update"
+    ]
+    assert {version for version, _ in updates} >= {1, 2, 3}
+    for version, names in updates:
+        active = schema_mgr.schema_history[version - 1]
+        assert set(names) - {"id"} <= active
+
+
+def test_worker_clones_follow_schema_changes():
+    columns = {
+        "id": ColumnDefinition(
+            "id", "UUID", lambda: str(uuid.uuid4()), protected=True
+        ),
+        "qty": ColumnDefinition("qty", "INT", lambda: 1),
+        "note": ColumnDefinition("note", "TEXT", lambda: "x", reserved=True),
+    }
+    schema_mgr = SchemaManager(MagicMock(), "public", "sales", columns)
+    sink = RecordingSink()
+    mutator = MutationEngine(
+        None, "public", "sales",
+        generator=BatchGenerator(columns), sinks=[sink], emit_sql=False
+    )
+    mutator.track_schema(schema_mgr)
+    evolved = threading.Event()
+    schema_mgr.subscribe(lambda manager: evolved.set())
+    subscribers = len(schema_mgr._subscribers)
+
+    runner = SimulationRunner(
+        schema_mgr=schema_mgr,
+        mutator=mutator,
+        column_registry=columns,
+        total_records=40,
+        batch_size=10,
+        evolution_interval=2,
+        evolution_probability=1.0,
+        add_probability=1.0,
+        workers=2,
+        connection_factory=MagicMock,
+    )
+    claim = runner._claim_batch
+
+    def claim_after_evolution():
+        # Hold batches 3 and 4 back until batch 2 has evolved the schema, so
+        # both versions get written whatever the thread timing
+        batch = claim()
+        if batch is not None and batch[0] > 2:
+            assert evolved.wait(5)
+        return batch
+
+    runner._claim_batch = claim_after_evolution
+    runner.run()
+
+    assert schema_mgr.schema_version == 2
+    versions = {version for _, version, _ in sink.events}
+    assert versions == {1, 2}
+    # The reserved column is only generated once it has been added
+    inserts = [
+        (version, names) for op, version, names in sink.events if op == "insert"
+    ]
+    assert {version for version, _ in inserts} == {1, 2}
+    for version, names in inserts:
+        assert ("note" in names) == (version == 2)
+    assert len(schema_mgr._subscribers) == subscribers
@@ -1,8 +1,12 @@
+import random
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+from psycopg2 import errors
 
 from kroft.core.column import ColumnDefinition
-from kroft.core.schema import SchemaManager
+from kroft.core.ddl import DDLPolicy, default_is_volatile, type_change_rewrites
+from kroft.core.schema import SchemaManager, sql_literal
 
 
 class TestSchemaManager(unittest.TestCase):
@@ -69,6 +73,236 @@ class TestSchemaManager(unittest.TestCase):
         executed_sql = self.cursor.execute.call_args[0][0]
         self.assertIn("DROP TABLE IF EXISTS public.sales", executed_sql)
 
+    def test_subscribers_are_notified_on_version_bump(self):
+        seen = []
+        self.schema_mgr.subscribe(lambda mgr: seen.append(mgr.schema_version))
+
+        self.schema_mgr.add_column()
+        self.schema_mgr.drop_column()
+
+        self.assertEqual(seen, [2, 3])
+
+    def test_view_is_rebuilt_per_version(self):
+        view = self.schema_mgr.view
+        self.assertEqual(view.active_names, ("id", "updated_at", "product"))
+        self.assertEqual(view.reserved_available, ("new_col",))
+        self.assertEqual(view.droppable, ("id", "product"))
+
+        self.schema_mgr.add_column()
+
+        self.assertIsNot(self.schema_mgr.view, view)
+        self.assertEqual(self.schema_mgr.view.version, 2)
+        self.assertEqual(self.schema_mgr.view.reserved_available, ())
+        self.assertEqual(view.active_names, ("id", "updated_at", "product"))
+
+    def test_add_column_registers_choice_from_external_registry(self):
+        registry = {
+            "discount": ColumnDefinition(
+                "discount", "FLOAT", lambda: 0.1, reserved=True
+            ),
+        }
+
+        added = self.schema_mgr.add_column(registry)
+
+        self.assertEqual(added, "discount")
+        self.assertIs(self.schema_mgr.columns["discount"], registry["discount"])
+        self.assertIn("discount", self.schema_mgr.get_active_columns())
+
+    def test_drop_column_honours_extra_protected_names(self):
+        dropped = self.schema_mgr.drop_column({"id"})
+        self.assertEqual(dropped, "product")
+
+    def test_seeded_rng_makes_column_choice_reproducible(self):
+        columns = {
+            name: ColumnDefinition(name, "INT", lambda: 1, reserved=True)
+            for name in ("a", "b", "c", "d", "e")
+        }
+        choices = [
+            SchemaManager(
+                self.conn, "public", "sales", dict(columns), rng=random.Random(5)
+            ).add_column()
+            for _ in range(3)
+        ]
+        self.assertEqual(len(set(choices)), 1)
+
+
+class TestOnlineDDL(unittest.TestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cursor = MagicMock()
+        self.conn.cursor.return_value.__enter__.return_value = self.cursor
+        self.columns = {
+            "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+            "product": ColumnDefinition("product", "TEXT", lambda: "hat"),
+            "qty": ColumnDefinition("qty", "INT", lambda: 1),
+            "a": ColumnDefinition("a", "INT", lambda: 1, reserved=True),
+            "b": ColumnDefinition("b", "TEXT", lambda: "x", reserved=True),
+        }
+
+    def manager(self, **kwargs):
+        return SchemaManager(self.conn, "public", "sales", self.columns, **kwargs)
+
+    def test_alter_columns_combines_actions_and_logs_lock_wait(self):
+        manager = self.manager()
+
+        added, dropped = manager.alter_columns(add=2, drop=1)
+
+        ddl = self.cursor.execute.call_args_list[-1][0][0]
+        self.assertEqual(sorted(added), ["a", "b"])
+        self.assertEqual(ddl.count("ADD COLUMN"), 2)
+        self.assertEqual(ddl.count("DROP COLUMN"), 1)
+        self.assertIn(
+            "LOCK TABLE public.sales IN ACCESS EXCLUSIVE MODE",
+            self.cursor.execute.call_args_list[-2][0][0],
+        )
+        self.assertEqual(manager.schema_version, 2)
+        self.assertEqual(set(manager.get_active_columns()) & set(dropped), set())
+        self.assertEqual(manager.ddl_log[0]["attempts"], 1)
+        self.assertIn("lock_wait_s", manager.ddl_log[0])
+
+    @patch("kroft.core.schema.time.sleep")
+    def test_lock_timeouts_are_retried_with_backoff(self, sleep):
+        manager = self.manager(
+            ddl_policy=DDLPolicy(lock_timeout=0.5, max_retries=2, backoff=0.1)
+        )
+        lock_failures = [errors.LockNotAvailable(), errors.LockNotAvailable()]
+
+        def execute(statement):
+            if statement.startswith("LOCK TABLE") and lock_failures:
+                raise lock_failures.pop()
+
+        self.cursor.execute.side_effect = execute
+
+        # A single candidate, so the pick doesn't depend on random state
+        self.assertEqual(manager.add_column({"a": self.columns["a"]}), "a")
+        self.cursor.execute.assert_any_call("SET LOCAL lock_timeout = '500ms'")
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(self.conn.rollback.call_count, 2)
+        self.assertEqual(manager.ddl_log[0]["attempts"], 3)
+
+    def test_lock_timeout_is_raised_once_retries_run_out(self):
+        manager = self.manager(ddl_policy=DDLPolicy(lock_timeout=0.1))
+        self.cursor.execute.side_effect = errors.LockNotAvailable()
+
+        with self.assertRaises(errors.LockNotAvailable):
+            manager.drop_column()
+        self.assertEqual(manager.schema_version, 1)
+
+
+class TestEvolutionActions(unittest.TestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cursor = MagicMock()
+        self.conn.cursor.return_value.__enter__.return_value = self.cursor
+        self.columns = {
+            "id": ColumnDefinition("id", "UUID", lambda: "u", protected=True),
+            "product": ColumnDefinition("product", "VARCHAR(20)", lambda: "it's"),
+            "qty": ColumnDefinition("qty", "INT", lambda: 3),
+            "a": ColumnDefinition("a", "INT", lambda: 1, reserved=True),
+        }
+
+    def manager(self, **kwargs):
+        return SchemaManager(self.conn, "public", "sales", self.columns, **kwargs)
+
+    def last_ddl(self):
+        return self.cursor.execute.call_args_list[-1][0][0]
+
+    def test_rewrite_classification(self):
+        self.assertFalse(type_change_rewrites("VARCHAR(20)", "TEXT"))
+        self.assertFalse(type_change_rewrites("VARCHAR(20)", "VARCHAR(40)"))
+        self.assertTrue(type_change_rewrites("VARCHAR(40)", "VARCHAR(20)"))
+        self.assertTrue(type_change_rewrites("INT", "BIGINT"))
+        self.assertFalse(
+            type_change_rewrites(
+                "TIMESTAMP(3) WITH TIME ZONE", "TIMESTAMP(6) WITH TIME ZONE"
+            )
+        )
+        self.assertTrue(type_change_rewrites("NUMERIC(10, 2)", "NUMERIC(12, 4)"))
+        self.assertTrue(default_is_volatile("CASE WHEN random() >= 0 THEN 1 END"))
+        self.assertFalse(default_is_volatile("'1'::INT"))
+
+    def test_sql_literal_quotes_and_casts(self):
+        self.assertEqual(sql_literal("it's", "TEXT"), "'it''s'::TEXT")
+        self.assertEqual(sql_literal(3, "INT"), "3::INT")
+        self.assertEqual(sql_literal(None, "INT"), "NULL::INT")
+
+    def test_alter_column_type_updates_definition_and_log(self):
+        manager = self.manager()
+
+        self.assertEqual(manager.alter_column_type("qty", "BIGINT"), "qty")
+
+        self.assertIn(
+            "ALTER COLUMN qty TYPE BIGINT USING qty::BIGINT", self.last_ddl()
+        )
+        self.assertEqual(manager.columns["qty"].sql_type, "BIGINT")
+        self.assertEqual(manager.schema_version, 2)
+        self.assertEqual(manager.ddl_log[0]["actions"], ["alter_type"])
+        self.assertTrue(manager.ddl_log[0]["predicted_rewrite"])
+
+    def test_rename_column_keeps_order_and_shared_dicts(self):
+        manager = self.manager()
+
+        new_name = manager.rename_column("product")
+
+        self.assertEqual(new_name, "product_v2")
+        self.assertIn("RENAME COLUMN product TO product_v2", self.last_ddl())
+        self.assertEqual(list(self.columns), ["id", "product_v2", "qty", "a"])
+        self.assertEqual(list(manager.get_active_columns())[1], "product_v2")
+        self.assertEqual(self.columns["product_v2"].name, "product_v2")
+
+    def test_renames_and_type_changes_leave_shared_definitions_alone(self):
+        # Like two tables built from get_registered_columns() copies
+        manager = SchemaManager(self.conn, "public", "sales", dict(self.columns))
+        other = SchemaManager(self.conn, "public", "returns", dict(self.columns))
+
+        manager.alter_column_type("qty", "BIGINT")
+        manager.rename_column("product")
+
+        self.assertEqual(self.columns["qty"].sql_type, "INT")
+        self.assertEqual(self.columns["product"].name, "product")
+        self.assertIn("qty INT", other.get_create_table_sql())
+        self.assertIn("product VARCHAR(20)", other.get_create_table_sql())
+        self.assertEqual(manager.columns["qty"].sql_type, "BIGINT")
+        self.assertEqual(manager.columns["product_v3"].name, "product_v3")
+
+    def test_add_with_default_and_set_default(self):
+        manager = self.manager()
+
+        self.assertEqual(manager.apply_action("add_with_default"), "a")
+        self.assertIn("ADD COLUMN a INT DEFAULT 1::INT", self.last_ddl())
+        self.assertFalse(manager.ddl_log[-1]["predicted_rewrite"])
+
+        manager.set_column_default("product")
+        self.assertIn(
+            "ALTER COLUMN product SET DEFAULT 'it''s'::VARCHAR(20)", self.last_ddl()
+        )
+        self.assertEqual(manager.schema_version, 3)
+
+    def test_volatile_default_is_predicted_to_rewrite(self):
+        manager = self.manager()
+
+        manager.apply_action("add_with_volatile_default")
+
+        self.assertIn("random()", self.last_ddl())
+        self.assertTrue(manager.ddl_log[0]["predicted_rewrite"])
+
+    def test_measure_ddl_records_wal_and_actual_rewrite(self):
+        manager = self.manager(measure_ddl=True)
+        self.cursor.fetchone.side_effect = [
+            (16384,), ("0/1000",), (16390,), ("0/3000",)
+        ]
+
+        manager.alter_column_type("qty", "BIGINT")
+
+        entry = manager.ddl_log[0]
+        self.assertTrue(entry["rewrote"])
+        self.assertEqual(entry["wal_bytes"], 0x2000)
+        self.assertEqual(manager.metrics.operations["ddl_rewrite"].count, 1)
+
+    def test_action_candidates_rejects_unknown_action(self):
+        with self.assertRaises(ValueError):
+            self.manager().action_candidates("truncate")
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,123 @@
+import csv
+import json
+import random
+
+import pytest
+
+from kroft.core.batch import BatchGenerator
+from kroft.core.column import ColumnDefinition
+from kroft.core.mutator import MutationEngine
+from kroft.core.sinks import ChangeSink, CsvSink, JsonLinesSink, ParquetSink
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_jsonl_sink_numbers_events_across_writes(tmp_path):
+    path = tmp_path / "changes.jsonl"
+    with JsonLinesSink(str(path)) as sink:
+        sink.write("insert", ["id", "name"], [(1, "a"), (2, "b")], 1)
+        sink.write("delete", ["id"], [(1,)], 2)
+
+    events = read_jsonl(path)
+    assert [e["seq"] for e in events] == [1, 2, 3]
+    assert events[0] == {
+        "seq": 1, "op": "insert", "schema_version": 1, "row": {"id": 1, "name": "a"}
+    }
+    assert events[2]["op"] == "delete"
+    assert events[2]["schema_version"] == 2
+
+
+def test_csv_sink_writes_one_file_per_version_with_blank_gaps(tmp_path):
+    sink = CsvSink(str(tmp_path / "changes_v{version}.csv"))
+    schema = {"id": "INT", "name": "TEXT", "qty": "INT"}
+
+    sink.write("insert", ["id", "name", "qty"], [(1, "a", 3)], 1, schema)
+    sink.write("update", ["id", "qty"], [(1, 4)], 1, schema)
+    sink.write("insert", ["id", "name"], [(2, "b")], 2, {"id": "INT", "name": "TEXT"})
+    sink.close()
+
+    with open(tmp_path / "changes_v1.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["seq", "op", "schema_version", "id", "name", "qty"]
+    assert rows[1] == ["1", "insert", "1", "1", "a", "3"]
+    assert rows[2] == ["2", "update", "1", "1", "", "4"]
+    assert (tmp_path / "changes_v2.csv").exists()
+
+
+def test_csv_sink_appends_to_existing_files_under_their_header(tmp_path):
+    path = str(tmp_path / "changes_v{version}.csv")
+    with CsvSink(path) as sink:
+        sink.write("insert", ["id", "name"], [(1, "a")], 1)
+    with CsvSink(path) as sink:
+        sink.write("update", ["name", "id"], [("b", 1)], 1)
+
+    with open(tmp_path / "changes_v1.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["seq", "op", "schema_version", "id", "name"],
+        ["1", "insert", "1", "1", "a"],
+        ["1", "update", "1", "1", "b"],
+    ]
+
+
+def test_sinks_must_implement_write():
+    class NoWrite(ChangeSink):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWrite()
+
+
+def test_versioned_sinks_need_a_version_placeholder(tmp_path):
+    with pytest.raises(ValueError):
+        CsvSink(str(tmp_path / "changes.csv"))
+
+
+def test_unknown_op_is_rejected(tmp_path):
+    with JsonLinesSink(str(tmp_path / "c.jsonl")) as sink:
+        with pytest.raises(ValueError):
+            sink.write("upsert", ["id"], [(1,)], 1)
+
+
+def test_parquet_sink_streams_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "changes_v{version}.parquet")
+    with ParquetSink(path, row_group_size=2) as sink:
+        schema = {"id": "INT", "name": "TEXT"}
+        sink.write("insert", ["id", "name"], [(1, "a"), (2, "b"), (3, "c")], 1, schema)
+        sink.write("delete", ["id"], [(1,)], 1, schema)
+
+    table = pq.read_table(path.format(version=1))
+    assert table.column("seq").to_pylist() == [1, 2, 3, 4]
+    assert table.column("name").to_pylist() == ["a", "b", "c", None]
+
+
+def test_engine_without_sql_emits_the_change_stream_only(tmp_path):
+    path = tmp_path / "changes.jsonl"
+    generator = BatchGenerator({
+        "id": ColumnDefinition("id", "INT", lambda: 1, protected=True),
+        "qty": ColumnDefinition("qty", "INT", lambda: 7),
+    })
+    sink = JsonLinesSink(str(path))
+    engine = MutationEngine(
+        None, "public", "sales",
+        generator=generator, sinks=[sink], emit_sql=False, rng=random.Random(1)
+    )
+
+    ids = engine.insert_batch({"id": [1, 2, 3], "qty": [5, 5, 5]})
+    engine._update_records(ids[:2])
+    engine._delete_records(ids[2:])
+    sink.close()
+
+    events = read_jsonl(path)
+    assert [e["op"] for e in events] == ["insert"] * 3 + ["update"] * 2 + ["delete"]
+    assert events[3]["row"] == {"id": 1, "qty": 7}
+    assert [e["seq"] for e in events] == list(range(1, 7))
+
+
+def test_emit_sql_false_requires_a_sink():
+    with pytest.raises(ValueError):
+        MutationEngine(None, "public", "sales", emit_sql=False)
@@ -0,0 +1,148 @@
+import itertools
+import random
+import time
+import uuid
+
+import pytest
+
+from kroft.core.column import ColumnDefinition
+from kroft.core.valuepool import ValuePool
+
+
+def counting_fill():
+    counter = itertools.count()
+    calls = []
+
+    def fill(n):
+        calls.append(n)
+        return [next(counter) for _ in range(n)]
+
+    return fill, calls
+
+
+def test_ring_pool_rotates_through_a_fixed_set():
+    fill, calls = counting_fill()
+    pool = ValuePool(fill, size=4, mode="ring")
+
+    assert pool.draw(3) == [0, 1, 2]
+    assert pool.draw(6) == [3, 0, 1, 2, 3, 0]
+    assert calls == [4]
+    assert pool.hits == 9
+
+
+def test_sample_pool_draws_only_pooled_values():
+    fill, calls = counting_fill()
+    pool = ValuePool(fill, size=5, mode="sample")
+
+    assert set(pool.draw(100)) <= {0, 1, 2, 3, 4}
+    assert calls == [5]
+
+
+def test_unique_pool_never_serves_a_value_twice():
+    fill, _ = counting_fill()
+    pool = ValuePool(fill, size=10, mode="unique")
+
+    served = pool.draw(7) + pool.draw(25) + pool.draw(3)
+
+    assert len(served) == len(set(served)) == 35
+
+
+def test_background_unique_pool_refills_off_thread():
+    fill, calls = counting_fill()
+    pool = ValuePool(fill, size=50, mode="unique", background=True)
+    try:
+        first = pool.draw(10)
+        deadline = time.time() + 2
+        while len(pool._values) < 50 and time.time() < deadline:
+            time.sleep(0.01)
+        second = pool.draw(20)
+    finally:
+        pool.close()
+
+    assert calls == [10, 50]
+    assert len(set(first + second)) == 30
+    assert pool.misses == 10 and pool.hits == 20
+
+
+def test_pools_draw_from_the_callers_rng():
+    def fill(n, rng):
+        return [rng.randrange(10**9) for _ in range(n)]
+
+    ring = ValuePool(fill, size=8, mode="ring")
+    other = ValuePool(fill, size=8, mode="ring")
+    first = ring.draw(3, random.Random(1))
+    other.draw(5, random.Random(1))
+    # What a batch gets depends on its own rng, not on earlier draws
+    assert ring.draw(3, random.Random(2)) == other.draw(3, random.Random(2))
+    assert first == ValuePool(fill, size=8).draw(3, random.Random(1))
+
+    unique = [
+        ValuePool(fill, size=4, mode="unique").draw(10, random.Random(3))
+        for _ in range(2)
+    ]
+    assert unique[0] == unique[1]
+    assert len(set(unique[0])) == 10
+
+
+def test_ring_and_sample_pools_refill_after_serving_enough():
+    for mode in ("ring", "sample"):
+        fill, calls = counting_fill()
+        pool = ValuePool(fill, size=4, mode=mode, refill_after=8)
+
+        first = pool.draw(8)
+        second = pool.draw(8)
+
+        assert calls == [4, 4, 4]
+        assert pool.refills == 2
+        assert set(first) <= {0, 1, 2, 3}
+        assert set(second) <= {4, 5, 6, 7}
+
+    with pytest.raises(ValueError):
+        ValuePool(fill, refill_after=0)
+
+
+def test_invalid_pool_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ValuePool(lambda n: [], mode="shuffle")
+
+
+def test_pooled_primary_key_defaults_to_unique_mode():
+    col = ColumnDefinition(
+        "id", "UUID", lambda: str(uuid.uuid4()), constraints="PRIMARY KEY",
+        pooled=True, pool_size=8,
+    )
+
+    values = col.generate_many(20) + [col.generate()]
+
+    assert col.pool.mode == "unique"
+    assert len(set(values)) == 21
+
+
+def test_pooled_unique_column_rejects_ring_mode():
+    with pytest.raises(ValueError):
+        ColumnDefinition(
+            "email", "TEXT", lambda: "a@b.c", constraints="UNIQUE",
+            pooled=True, pool_mode="ring",
+        )
+
+
+def test_pooled_column_values_follow_the_seed():
+    def values():
+        col = ColumnDefinition(
+            "score", "INT", lambda rng: rng.randint(0, 10**9),
+            pooled=True, pool_size=16,
+        )
+        return col.generate_many(40, random.Random(9))
+
+    assert values() == values()
+
+
+def test_pooled_column_calls_generator_once_per_pool_slot():
+    calls = []
+    col = ColumnDefinition(
+        "name", "TEXT", lambda: calls.append(1) or "Ada", pooled=True, pool_size=3
+    )
+
+    col.generate_many(100)
+
+    assert len(calls) == 3
@@ -0,0 +1,87 @@
+import json
+import random
+import zlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from kroft.core.batch import BatchGenerator
+from kroft.core.column import ColumnDefinition
+from kroft.core.mutator import MutationEngine
+from kroft.core.workload import WorkloadShape, payload_column, payload_value
+
+
+def test_payloads_have_the_requested_size_and_resist_compression():
+    text = payload_value(10_000, random.Random(1))
+    assert len(text) == 10_000
+    assert len(zlib.compress(text.encode())) > 4_000
+    assert payload_value(10_000, random.Random(1)) == text
+
+    repeated = payload_value(10_000, random.Random(1), compressible=True)
+    assert len(zlib.compress(repeated.encode())) < 500
+
+    document = json.loads(payload_value(100, random.Random(1), kind="jsonb"))
+    assert len(document["payload"]) == 100
+
+
+def test_payload_column_builds_wide_columns():
+    col = payload_column("body", 2_048, kind="jsonb")
+    assert col.sql_type == "JSONB"
+    assert len(json.loads(col.generate())["payload"]) == 2_048
+    with pytest.raises(ValueError):
+        payload_column("body", 10, kind="xml")
+
+
+def engine_with(workload, cursor):
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    generator = BatchGenerator({
+        "id": ColumnDefinition("id", "INT", lambda: 1, protected=True),
+        "sku": ColumnDefinition("sku", "TEXT", lambda: "a"),
+        "qty": ColumnDefinition("qty", "INT", lambda: 2),
+        "body": payload_column("body", 16),
+    })
+    return MutationEngine(
+        conn, "public", "sales",
+        generator=generator, workload=workload, rng=random.Random(3)
+    )
+
+
+def test_hot_updates_skip_columns_found_in_pg_index():
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [("id",), ("sku",)]
+    engine = engine_with(WorkloadShape(hot_updates=True), cursor)
+
+    engine._update_records(list(range(20)))
+    engine._update_records(list(range(20)))
+
+    statements = [str(c[0][0]) for c in cursor.execute.call_args_list]
+    assert len([s for s in statements if "pg_index" in s]) == 1
+    assert not [s for s in statements if "Identifier('sku')" in s]
+    assert [s for s in statements if "Identifier('qty')" in s]
+    assert engine._indexed == (1, {"id", "sku"})
+
+
+def test_update_columns_restrict_updates_to_payloads():
+    cursor = MagicMock()
+    engine = engine_with(WorkloadShape(update_columns=["body"]), cursor)
+    engine._update_records(list(range(10)))
+
+    statements = [str(c[0][0]) for c in cursor.execute.call_args_list]
+    assert len(statements) == 10
+    assert all("Identifier('body')" in s for s in statements)
+
+
+def test_wal_is_sampled_per_operation():
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = [("0/1000",), ("0/1800",)]
+    engine = engine_with(WorkloadShape(wal_sample_every=2), cursor)
+
+    engine._delete_records([1, 2])
+    engine._delete_records([3, 4])
+
+    report = engine.wal_report()
+    assert report["delete"] == {
+        "bytes": 0x800, "rows": 2, "samples": 1, "bytes_per_row": 0x400
+    }
+    assert engine.metrics.gauges["wal_bytes_per_row:delete"].last == 0x400
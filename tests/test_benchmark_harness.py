@@ -0,0 +1,38 @@
+from benchmarks.harness import BenchmarkResult, compare, measure, peak_memory
+
+
+def test_measure_runs_setup_before_each_sample():
+    calls = []
+    samples = measure(lambda: calls.append("run"), 3, lambda: calls.append("setup"))
+
+    assert len(samples) == 3
+    assert calls == ["setup", "run"] * 3
+
+
+def test_result_key_is_stable_across_param_order():
+    a = BenchmarkResult("insert", "copy", {"width": 5, "batch_size": 100}, [1.0])
+    b = BenchmarkResult("insert", "copy", {"batch_size": 100, "width": 5}, [2.0])
+    assert a.key == b.key == "insert/copy[batch_size=100,width=5]"
+
+
+def test_compare_flags_only_results_beyond_tolerance():
+    baseline = {"results": [
+        {"key": "insert/copy", "median_s": 1.0},
+        {"key": "insert/values", "median_s": 1.0},
+    ]}
+    current = {"results": [
+        {"key": "insert/copy", "median_s": 1.1},
+        {"key": "insert/values", "median_s": 1.5},
+        {"key": "delete/plain", "median_s": 9.0},
+    ]}
+
+    regressions = compare(current, baseline, tolerance=0.15)
+
+    assert [r["key"] for r in regressions] == ["insert/values"]
+    assert round(regressions[0]["change"], 2) == 0.5
+
+
+def test_peak_memory_reports_allocations_made_by_fn():
+    small = peak_memory(lambda: [0] * 10)
+    large = peak_memory(lambda: [0] * 1_000_000)
+    assert large > 8_000_000 > small